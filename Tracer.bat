@@ -95,6 +95,18 @@ if exist "app.py" (
     )
 )
 
+:: Vendor the front-end Libraries once, so the Application runs without the CDNs;
+:: the Application builds its Bundles from vendor\ at startup
+if not exist "vendor\vendor.lock.json" (
+    echo Vendoring the front-end Libraries into vendor\...
+    "%VENV_PYTHON%" -m utils.asset_pipeline fetch
+    if errorlevel 1 (
+        echo WARNING: Failed to vendor the front-end Libraries
+        echo The Application will load them from the CDNs and needs Internet access
+        echo.
+    )
+)
+
 :: Display startup Information
 echo Starting the Tracer-Dash Application...
 echo Using the Virtual Environment @ .venv
@@ -0,0 +1,25 @@
+# api/__init__.py
+
+"""Flask Routes served by the Dash App's Server"""
+
+from api.assets_api import assets_api
+from api.coverage_api import coverage_api
+from api.debug_api import debug_api
+from api.graph_api import graph_api
+from api.impact_api import impact_api
+from api.metrics_api import metrics_api
+from api.snapshot_api import snapshot_api
+from api.table_api import table_api
+from pkg.config import INSTRUMENTATION_CONFIG
+
+
+def register_api(server):
+    server.register_blueprint(graph_api)
+    server.register_blueprint(impact_api)
+    server.register_blueprint(coverage_api)
+    server.register_blueprint(snapshot_api)
+    server.register_blueprint(metrics_api)
+    if INSTRUMENTATION_CONFIG["query_debug_endpoint"]:
+        server.register_blueprint(debug_api)
+    server.register_blueprint(assets_api)
+    server.register_blueprint(table_api)
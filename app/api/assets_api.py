@@ -0,0 +1,40 @@
+# api/assets_api.py
+
+"""Fingerprinted front-end Bundles with far-future cache headers"""
+
+# Import Libraries
+import mimetypes
+
+from flask import Blueprint, abort, request, send_file
+
+from pkg.config import ASSET_CONFIG
+from utils.asset_pipeline import bundle_file
+
+assets_api = Blueprint("assets_api", __name__, url_prefix=ASSET_CONFIG["url_path"])
+
+# Precompressed variants written next to each Bundle, in order of preference
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+@assets_api.route("/<path:filename>")
+def get_bundle_file(filename):
+    """A Bundle file, served from its .br or .gz variant when the Browser accepts one"""
+    path = bundle_file(filename)
+    if path is None:
+        abort(404)
+
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    encoding = None
+    for candidate, suffix in ENCODINGS:
+        variant = path.with_name(path.name + suffix)
+        if request.accept_encodings[candidate] and variant.exists():
+            path, encoding = variant, candidate
+            break
+
+    response = send_file(path, mimetype=mimetype, max_age=ASSET_CONFIG["max_age"])
+    # The name changes whenever the content does, so Browsers need not revalidate
+    response.cache_control.immutable = True
+    response.vary.add("Accept-Encoding")
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    return response
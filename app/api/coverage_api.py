@@ -0,0 +1,64 @@
+# api/coverage_api.py
+
+"""Traceability Coverage Routes with CSV export"""
+
+# Import Libraries
+import csv
+import io
+import logging
+
+from flask import Blueprint, Response, jsonify
+
+from utils.coverage import coverage_matrix_pairs, get_coverage_report, summarize_coverage, uncovered_rows
+from utils.cytoscape_cache import get_graph_elements, get_graph_version
+
+logger = logging.getLogger('TracerApp')
+
+coverage_api = Blueprint("coverage_api", __name__, url_prefix="/api/coverage")
+
+
+def _report():
+    graph_version = get_graph_version()
+    G, _ = get_graph_elements(graph_version)
+    return graph_version, G, get_coverage_report(G, graph_version)
+
+
+def _csv_response(rows, fieldnames, filename: str) -> Response:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+    writer.writeheader()
+    writer.writerows(rows)
+    response = Response(buffer.getvalue(), mimetype="text/csv")
+    response.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+@coverage_api.route("")
+def get_coverage():
+    """Coverage of every Chain with its per-layer breakdown and uncovered Nodes"""
+    graph_version, _, report = _report()
+    return jsonify({"graph_version": graph_version, "chains": summarize_coverage(report)})
+
+
+@coverage_api.route("/uncovered.csv")
+def export_uncovered():
+    """Every uncovered Node of every Chain as CSV"""
+    graph_version, G, report = _report()
+    return _csv_response(
+        uncovered_rows(report, G),
+        ["Chain", "Coverage (%)", "Node ID", "Identifier", "Name"],
+        f"coverage-uncovered-v{graph_version}.csv",
+    )
+
+
+@coverage_api.route("/<int:chain>/matrix.csv")
+def export_coverage_matrix(chain):
+    """Coverage matrix of a Chain as (first layer Node, last layer Node) pairs"""
+    graph_version, _, report = _report()
+    if not 0 <= chain < len(report) or "error" in report[chain]:
+        return jsonify({"error": f"Chain {chain} does not exist"}), 404
+
+    result = report[chain]
+    fieldnames = [f"Source ({result['layers'][0]})", f"Target ({result['layers'][-1]})"]
+    rows = [dict(zip(fieldnames, pair)) for pair in coverage_matrix_pairs(result)]
+    return _csv_response(rows, fieldnames, f"coverage-matrix-{chain}-v{graph_version}.csv")
@@ -0,0 +1,30 @@
+# api/debug_api.py
+
+"""Query profile Routes for finding N+1 regressions; registered only when
+INSTRUMENTATION_CONFIG["query_debug_endpoint"] is set"""
+
+# Import Libraries
+from flask import Blueprint, jsonify, request
+
+from pkg.config import INSTRUMENTATION_CONFIG
+from utils.query_profiler import query_profile
+
+debug_api = Blueprint("debug_api", __name__, url_prefix="/api/debug")
+
+
+@debug_api.route("/queries")
+def get_query_profile():
+    """The statement shapes each Callback or Route repeats, costliest first,
+    and the statements issued per request"""
+    limit = request.args.get("limit", default=20, type=int)
+    return jsonify({
+        "n_plus_one_threshold": INSTRUMENTATION_CONFIG["n_plus_one_threshold"],
+        "offenders": query_profile.top_offenders(limit),
+        "requests": query_profile.request_totals(limit),
+    })
+
+
+@debug_api.route("/queries", methods=["DELETE"])
+def reset_query_profile():
+    query_profile.reset()
+    return jsonify({"success": True, "message": "Query profile cleared"})
@@ -0,0 +1,174 @@
+# api/graph_api.py
+
+"""Graph Data Routes with ETag revalidation"""
+
+# Import Libraries
+import logging
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode
+
+from flask import Blueprint, Response, jsonify, request
+
+from pkg.config import GRAPH_QUERY_CONFIG
+from utils.cytoscape_cache import (
+    ALL_ROOTS,
+    choose_encoding,
+    get_cytoscape_payload,
+    get_element_patch,
+    get_graph_elements,
+    get_graph_version,
+    get_lod_patch,
+)
+from utils.graph_queries import GraphQueryError, UnknownNodeError, get_graph_query_service
+
+logger = logging.getLogger('TracerApp')
+
+graph_api = Blueprint("graph_api", __name__, url_prefix="/api/graph")
+
+
+def cytoscape_descriptor(root: Optional[str] = None) -> Dict[str, Any]:
+    """Descriptor for the Graphs page: where to fetch the Elements and what they contain"""
+    root = root or ALL_ROOTS
+    payload = get_cytoscape_payload(root)
+    return payload.descriptor(f"{graph_api.url_prefix}/cytoscape?{urlencode({'root': root})}")
+
+
+@graph_api.route("/cytoscape")
+def get_cytoscape_elements():
+    """Serve the cached Elements; browsers revalidate with If-None-Match and get a 304"""
+    try:
+        payload = get_cytoscape_payload(request.args.get("root", ALL_ROOTS))
+    except GraphQueryError as e:
+        return jsonify({"error": str(e)}), 400
+    encoding = choose_encoding(request.accept_encodings)
+    etag = payload.representation_etag(encoding)
+
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(payload.encode(encoding), mimetype="application/json")
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+
+    response.set_etag(etag)
+    # Always revalidate, so a new Graph Version is never served stale
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["X-Graph-Version"] = str(payload.graph_version)
+    return response
+
+
+@graph_api.route("/expand", methods=["POST"])
+def expand_cluster():
+    """Patch for expanding (or collapsing) a Cluster of a level-of-detail View"""
+    body = request.get_json(silent=True) or {}
+    node_id = body.get("node")
+    if not node_id:
+        return jsonify({"error": "A Node is required"}), 400
+
+    graph_version = get_graph_version()
+    if body.get("graph_version") != graph_version:
+        # The client's View belongs to an older Graph and must be reloaded
+        return jsonify({"error": "The Graph has changed", "graph_version": graph_version}), 409
+
+    patch = get_lod_patch(
+        graph_version,
+        body.get("root") or ALL_ROOTS,
+        body.get("expanded") or [],
+        node_id,
+        collapse=bool(body.get("collapse")),
+    )
+    return jsonify(patch)
+
+
+@graph_api.route("/patch")
+def get_element_patch_route():
+    """Changes since a View the browser already shows, so it can update in place"""
+    root = request.args.get("root", ALL_ROOTS)
+    try:
+        from_version = int(request.args["from_version"])
+    except (KeyError, ValueError):
+        return jsonify({"error": "An integer from_version is required"}), 400
+
+    try:
+        patch = get_element_patch(from_version, request.args.get("from_root", ALL_ROOTS), root)
+    except GraphQueryError as e:
+        return jsonify({"error": str(e)}), 400
+    if patch is None:
+        # The earlier View is no longer known (or is level-of-detail), so reload it in full
+        return jsonify({"reset": True, "descriptor": cytoscape_descriptor(root)})
+    return jsonify(patch)
+
+
+# ==================== Graph Queries ====================
+
+
+def _int_arg(name: str, default: Optional[int], maximum: Optional[int] = None) -> Optional[int]:
+    """An integer query argument, clamped to maximum when one is given"""
+    value = request.args.get(name)
+    if value is None or value == "":
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        raise GraphQueryError(f"{name} must be an integer")
+    return value if maximum is None else min(value, maximum)
+
+
+def _query(run):
+    """Run a query against the current Graph Version and wrap its result"""
+    graph_version = get_graph_version()
+    G, _ = get_graph_elements(graph_version)
+    try:
+        result = run(get_graph_query_service(G, graph_version))
+    except UnknownNodeError as e:
+        return jsonify({"error": str(e)}), 404
+    except GraphQueryError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"graph_version": graph_version, **result})
+
+
+@graph_api.route("/neighbourhood")
+def get_neighbourhood():
+    """Nodes and Edges within k hops of a Node, optionally restricted to Edge Types"""
+    return _query(lambda service: service.ego_network(
+        request.args.get("node"),
+        k=_int_arg("k", 1),
+        direction=request.args.get("direction", "both"),
+        edge_types=request.args.getlist("edge_type"),
+    ))
+
+
+@graph_api.route("/path")
+def get_path():
+    """Shortest path (mode=shortest) or bounded simple paths (mode=all) between two Nodes;
+    max_depth and max_paths are clamped to GRAPH_QUERY_CONFIG's limits"""
+    source, target = request.args.get("source"), request.args.get("target")
+    edge_types = request.args.getlist("edge_type")
+    mode = request.args.get("mode", "shortest")
+
+    def run(service):
+        if mode == "all":
+            return service.all_simple_paths(
+                source, target,
+                max_depth=_int_arg("max_depth", 6, GRAPH_QUERY_CONFIG["max_path_depth"]),
+                max_paths=_int_arg("max_paths", 50, GRAPH_QUERY_CONFIG["max_paths"]),
+                edge_types=edge_types,
+            )
+        if mode == "shortest":
+            directed = request.args.get("directed", "true").lower() != "false"
+            return {"path": service.shortest_path(source, target, directed=directed, edge_types=edge_types)}
+        raise GraphQueryError(f"Unknown mode '{mode}'")
+
+    return _query(run)
+
+
+@graph_api.route("/impact")
+def get_impact():
+    """Downstream (or upstream) impact set of a Node with hop distances"""
+    return _query(lambda service: service.impact(
+        request.args.get("node"),
+        direction=request.args.get("direction", "downstream"),
+        max_depth=_int_arg("max_depth", None),
+        edge_types=request.args.getlist("edge_type"),
+    ))
@@ -0,0 +1,94 @@
+# api/impact_api.py
+
+"""Change Impact Routes for flagging the Nodes a change affects"""
+
+# Import Libraries
+import logging
+
+from flask import Blueprint, jsonify, request
+
+from models.model import Model
+from pkg.config import GRAPH_CHANGE_CONFIG
+from utils.cytoscape_cache import get_graph_elements, get_graph_version
+from utils.impact_analysis import changed_nodes_since, get_impact_analyzer
+
+logger = logging.getLogger('TracerApp')
+
+impact_api = Blueprint("impact_api", __name__, url_prefix="/api/impact")
+
+
+def _analyzer():
+    graph_version = get_graph_version()
+    G, _ = get_graph_elements(graph_version)
+    return graph_version, get_impact_analyzer(G, graph_version)
+
+
+@impact_api.route("/node/<node_id>")
+def get_node_impact(node_id):
+    """Transitive downstream and upstream impact sets of a Node"""
+    graph_version, analyzer = _analyzer()
+    if node_id not in analyzer.sparse.index:
+        return jsonify({"error": f"Node '{node_id}' does not exist"}), 404
+
+    impact = analyzer.impact_of(node_id)
+    return jsonify({
+        "graph_version": graph_version,
+        "node": node_id,
+        "downstream": sorted(impact["downstream"]),
+        "upstream": sorted(impact["upstream"]),
+    })
+
+
+@impact_api.route("/batch", methods=["POST"])
+def get_batch_impact():
+    """Impacted set of many changed Nodes (e.g. a bulk import) in one traversal"""
+    body = request.get_json(silent=True) or {}
+    node_ids = body.get("nodes")
+    if not isinstance(node_ids, list):
+        return jsonify({"error": "A list of Nodes is required"}), 400
+    max_depth = body.get("max_depth")
+    if max_depth is not None and not isinstance(max_depth, int):
+        return jsonify({"error": "max_depth must be an integer"}), 400
+
+    graph_version, analyzer = _analyzer()
+    try:
+        result = analyzer.batch_impact(
+            node_ids, direction=body.get("direction", "downstream"), max_depth=max_depth
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"graph_version": graph_version, **result})
+
+
+@impact_api.route("/since/<int:since_version>")
+def get_impact_since(since_version):
+    """Nodes flagged by the changes recorded after a Graph Version, a page of at
+    most ?limit= changes at a time; when "complete" is false, request the next
+    page with since = "through"."""
+    graph_version, analyzer = _analyzer()
+    model = Model()
+    horizon = model.get_graph_change_horizon()
+    if since_version < horizon:
+        # The changes just after since_version were compacted away
+        return jsonify({
+            "error": f"Changes before Graph Version {horizon} are no longer kept",
+            "horizon": horizon,
+            "graph_version": graph_version,
+        }), 410
+
+    page_size = GRAPH_CHANGE_CONFIG["page_size"]
+    limit = request.args.get("limit", page_size, type=int)
+    if limit < 1:
+        return jsonify({"error": "limit must be a positive integer"}), 400
+    limit = min(limit, page_size)
+
+    changes = model.get_graph_changes_since(since_version, until=graph_version, limit=limit)
+    through = changes[-1]["Version"] if len(changes) == limit else max(since_version, graph_version)
+    changed = changed_nodes_since(since_version, changes, analyzer)
+    return jsonify({
+        "since": since_version,
+        "through": through,
+        "complete": through >= graph_version,
+        "graph_version": graph_version,
+        **analyzer.batch_impact(changed),
+    })
@@ -0,0 +1,16 @@
+# api/metrics_api.py
+
+"""Request Metrics in the Prometheus text exposition format"""
+
+# Import Libraries
+from flask import Blueprint, Response
+
+from utils.instrumentation import request_metrics
+
+metrics_api = Blueprint("metrics_api", __name__)
+
+
+@metrics_api.route("/metrics")
+def get_metrics():
+    """Latency, payload size and Database query Histograms per Dash Callback and Flask Route"""
+    return Response(request_metrics.exposition(), content_type="text/plain; version=0.0.4; charset=utf-8")
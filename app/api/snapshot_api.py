@@ -0,0 +1,58 @@
+# api/snapshot_api.py
+
+"""Graph Snapshot Routes for taking Snapshots and diffing any two Versions"""
+
+# Import Libraries
+import logging
+
+from flask import Blueprint, jsonify, request
+
+from models.model import Model
+from utils.graph_snapshots import CURRENT, diff_snapshots, take_graph_snapshot
+
+logger = logging.getLogger('TracerApp')
+
+snapshot_api = Blueprint("snapshot_api", __name__, url_prefix="/api/snapshots")
+
+
+def _ref(value, default=None):
+    value = value or default
+    if value is None:
+        raise ValueError("A Snapshot id or 'current' is required")
+    if value != CURRENT and not str(value).isdigit():
+        raise ValueError(f"Invalid Snapshot '{value}'")
+    return value
+
+
+@snapshot_api.route("")
+def list_snapshots():
+    return jsonify({"snapshots": Model().get_graph_snapshots()})
+
+
+@snapshot_api.route("", methods=["POST"])
+def create_snapshot():
+    """Snapshot the current Graph under a label, e.g. a Baseline name"""
+    body = request.get_json(silent=True) or {}
+    label = str(body.get("label") or "").strip()
+    if not label:
+        return jsonify({"error": "A label is required"}), 400
+
+    result = take_graph_snapshot(label)
+    if not result["success"]:
+        return jsonify({"error": result["message"]}), 500
+    return jsonify(result["data"]), 201
+
+
+@snapshot_api.route("/diff")
+def get_snapshot_diff():
+    """Nodes and Edges added, removed and changed between two Snapshots
+    (either may be 'current'), with per-field changes"""
+    try:
+        from_ref = _ref(request.args.get("from"))
+        to_ref = _ref(request.args.get("to"), CURRENT)
+        limit = request.args.get("limit", type=int)
+        return jsonify(diff_snapshots(from_ref, to_ref, limit))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except KeyError as e:
+        return jsonify({"error": e.args[0]}), 404
@@ -0,0 +1,65 @@
+# api/table_api.py
+
+"""Editor tables in the columnar encoding decoded by assets/js/columnar.js"""
+
+# Import Libraries
+import json
+import logging
+
+from flask import Blueprint, Response, jsonify, request
+
+from pkg.config import TABLE_STREAM_CONFIG
+from utils.columnar import TABLE_CHUNK_LOADERS, TABLE_LOADERS, encode_columnar
+from utils.compression import accepted_encoding, compress_stream
+
+logger = logging.getLogger('TracerApp')
+
+table_api = Blueprint("table_api", __name__, url_prefix="/api/tables")
+
+
+@table_api.route("/<name>")
+def get_table(name):
+    """A registered table as a columnar payload, or with ?format=rows as a list of rows"""
+    loader = TABLE_LOADERS.get(name)
+    if loader is None:
+        return jsonify({"error": f"Unknown table '{name}'"}), 404
+
+    rows = loader()
+    response = jsonify(rows if request.args.get("format") == "rows" else encode_columnar(rows))
+    # Tables change with every edit, so always fetch them fresh
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+def _stream_lines(chunks):
+    """One columnar payload per line, each with the ID to resume after; a failure ends
+    the stream with an error line, since the status has already been sent"""
+    try:
+        for rows in chunks:
+            payload = encode_columnar(rows)
+            payload["cursor"] = rows[-1]["ID"]
+            yield (json.dumps(payload) + "\n").encode("utf-8")
+    except Exception as e:
+        logger.error(f"Error streaming table: {e}")
+        yield (json.dumps({"error": str(e)}) + "\n").encode("utf-8")
+
+
+@table_api.route("/<name>/stream")
+def stream_table(name):
+    """A registered table as newline-delimited columnar chunks in ID order,
+    starting after ?after=<ID> when given"""
+    chunks = TABLE_CHUNK_LOADERS.get(name)
+    if chunks is None:
+        return jsonify({"error": f"Unknown table '{name}'"}), 404
+
+    body = _stream_lines(chunks(
+        TABLE_STREAM_CONFIG["first_chunk_rows"],
+        TABLE_STREAM_CONFIG["chunk_rows"],
+        request.args.get("after"),
+    ))
+    headers = {"Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    encoding = accepted_encoding()
+    if encoding:
+        body = compress_stream(body, encoding)
+        headers["Content-Encoding"] = encoding
+    return Response(body, mimetype="application/x-ndjson", headers=headers)
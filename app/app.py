@@ -27,43 +27,9 @@ if not hasattr(pkgutil, "find_loader"):
 
     pkgutil.find_loader = _find_loader
 
-from utils import network_utils
-from pkg.config import LOG_DIR
-
-# External Scripts
-external_scripts = [
-    {"src": "https://unpkg.com/cytoscape@3.26.0/dist/cytoscape.min.js"},
-    {"src": "https://unpkg.com/cytoscape-fcose@2.2.0/cytoscape-fcose.js"},
-    {"src": "https://unpkg.com/cytoscape-dagre@2.5.0/cytoscape-dagre.js"},
-    {"src": "https://unpkg.com/dagre@0.8.5/dist/dagre.min.js"},
-    # Klay Layout
-    {"src": "https://unpkg.com/cytoscape-klay@3.1.4/cytoscape-klay.js"},
-    {"src": "https://unpkg.com/klayjs@0.4.1/klay.js"},
-    # COLA Layout
-    {"src": "https://unpkg.com/cytoscape-cola@2.4.0/cytoscape-cola.js"},
-    {"src": "https://unpkg.com/webcola@3.4.0/WebCola/cola.min.js"},
-    {"src": "https://cdn.jsdelivr.net/npm/cytoscape-svg@0.4.0/cytoscape-svg.js"},
-    {"src": "/assets/js/cytoscape_config.js"},
-    {"src": "/assets/js/cytoscape_utils.js"},
-    {"src": "/assets/js/cytoscape_styles.js"},
-    {"src": "/assets/js/cytoscape_events.js"},
-    {"src": "/assets/js/cytoscape_search.js"},
-    {"src": "/assets/js/cytoscape_callback.js"},
-    {"src": "https://unpkg.com/tabulator-tables@6.3.1/dist/js/tabulator.min.js"},
-    {"src": "https://cdnjs.cloudflare.com/ajax/libs/jspdf/2.5.1/jspdf.umd.min.js"},
-    {
-        "src": "https://cdnjs.cloudflare.com/ajax/libs/jspdf-autotable/3.5.31/jspdf.plugin.autotable.min.js"
-    },
-]
-
-# External Stylesheets
-external_stylesheets = [
-    dbc.themes.BOOTSTRAP,
-    "https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.3/font/bootstrap-icons.min.css",
-    "https://unpkg.com/tabulator-tables@6.3.1/dist/css/tabulator_bootstrap5.min.css",
-    "/assets/css/app.css",
-    "/assets/css/tabulator.css",
-]
+from utils import cache_utils
+from pkg.config import GRAPH_CACHE_CONFIG, LOG_DIR
+from utils.asset_pipeline import ensure_bundles, page_scripts, page_stylesheets
 
 
 def setup_logging(app_name="TracerApp", log_level=logging.INFO):
@@ -98,6 +64,12 @@ def setup_logging(app_name="TracerApp", log_level=logging.INFO):
 logger = setup_logging()
 logger.info("Tracer Application is starting...")
 
+# Scripts and Stylesheets: the fingerprinted Bundles, built here when missing or out of
+# date, otherwise the CDN and /assets files
+ensure_bundles()
+external_scripts = page_scripts()
+external_stylesheets = page_stylesheets()
+
 server = Flask(__name__)
 app = dash.Dash(
     __name__,
@@ -106,46 +78,50 @@ app = dash.Dash(
     pages_folder="pages",
     external_scripts=external_scripts,
     external_stylesheets=external_stylesheets,
+    # Bundled or listed above; the PDF.js Viewer loads its own files inside its iframe
+    assets_path_ignore=["^js$", "^css$", "^pdfjs"],
     suppress_callback_exceptions=True,
     title="Tracer",
 )
 
+# A Cache shared by every Server Worker rather than one per process
 cache = Cache(
-    app.server, config={"CACHE_TYPE": "SimpleCache", "CACHE_DEFAULT_TIMEOUT": 3600}
+    app.server,
+    config={
+        "CACHE_TYPE": GRAPH_CACHE_CONFIG["flask_cache_type"],
+        "CACHE_DIR": str(GRAPH_CACHE_CONFIG["flask_cache_dir"]),
+        "CACHE_DEFAULT_TIMEOUT": GRAPH_CACHE_CONFIG["flask_cache_timeout"],
+    },
 )
 
 server.static_folder = "assets"
 
-# Import pages AFTER creating the App
-import pages
+# Time every Callback and Route, before any other request hooks
+from utils.instrumentation import install_instrumentation
 
-_cached_network = None
+install_instrumentation(app)
 
+# Compress responses; after_request hooks run in reverse, so before the instrumentation's
+from utils.compression import install_compression
 
-def get_network():
-    global _cached_network
-    if _cached_network is None or _cached_network.number_of_nodes() == 0:
-        _cached_network = network_utils.build_networkx_from_database()
-        roots = network_utils.get_graph_roots(_cached_network)
-        if roots:
-            logger.info(f"Identified {len(roots)} Root Nodes in the NetworkX Graph")
-            for root in roots:
-                logger.info(f"Root Node ID: {root}")
-        else:
-            logger.info("No Root Nodes found in the NetworkX Graph")
+install_compression(server)
+
+# Flask Routes for Graph Data
+from api import register_api
+
+register_api(server)
 
-        logger.info("Network was re-built from the DB.")
+# Import pages AFTER creating the App
+import pages
 
-        breakdown = network_utils.build_breakdown_from_graph(_cached_network)
-        logger.info(f"Breakdown built with {len(breakdown)} Top-level Items.")
 
-    return _cached_network
+def get_network():
+    """The Graph of the current Graph Version, shared between Server Workers"""
+    return cache_utils.get_network()
 
 
 def refresh_network_cache():
-    global _cached_network
-    _cached_network = None
-    logger.info("Network cleared from Cache.")
+    cache_utils.invalidate_network_cache()
 
 
 logger.info("Initializing the Network Graph...")
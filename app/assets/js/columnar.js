@@ -0,0 +1,192 @@
+// assets/js/columnar.js
+// Decodes the columnar table payloads written by utils/columnar.py into Tabulator rows
+
+(function() {
+    'use strict';
+
+    // Packed codes: little-endian unsigned integers, 1, 2 or 4 bytes wide, in base64
+    function unpack(encoded, width) {
+        const binary = atob(encoded);
+        const bytes = new Uint8Array(binary.length);
+        for (let i = 0; i < binary.length; i++) {
+            bytes[i] = binary.charCodeAt(i);
+        }
+        if (width === 1) {
+            return bytes;
+        }
+        return width === 2 ? new Uint16Array(bytes.buffer) : new Uint32Array(bytes.buffer);
+    }
+
+    function decodeColumnar(payload) {
+        if (typeof payload === 'string') {
+            payload = JSON.parse(payload);
+        }
+        // Plain row lists pass through unchanged
+        if (!payload || payload.format !== 'columnar') {
+            return payload;
+        }
+
+        const length = payload.length;
+        const rows = new Array(length);
+        for (let i = 0; i < length; i++) {
+            rows[i] = {};
+        }
+
+        payload.columns.forEach(function(column) {
+            const name = column.name;
+            if (column.dictionary) {
+                const dictionary = column.dictionary;
+                const codes = unpack(column.codes, column.width);
+                for (let i = 0; i < length; i++) {
+                    // The code just past the dictionary marks a row without this key
+                    if (codes[i] < dictionary.length) {
+                        rows[i][name] = dictionary[codes[i]];
+                    }
+                }
+            } else {
+                const values = column.values;
+                for (let i = 0; i < length; i++) {
+                    rows[i][name] = values[i];
+                }
+            }
+        });
+
+        if (!payload.parents) {
+            return rows;
+        }
+
+        // Rows are in pre-order; each parent code is the parent's position plus one
+        const childField = payload.child_field;
+        const parents = unpack(payload.parents.codes, payload.parents.width);
+        const topLevel = [];
+        for (let i = 0; i < length; i++) {
+            if (parents[i] === 0) {
+                topLevel.push(rows[i]);
+            } else {
+                const parent = rows[parents[i] - 1];
+                (parent[childField] = parent[childField] || []).push(rows[i]);
+            }
+        }
+        return topLevel;
+    }
+
+    // Fetch a table from /api/tables and decode it, for the Editor tables' clientside Callbacks
+    function fetchColumnarTable(url) {
+        return fetch(url, {headers: {'Accept': 'application/json'}})
+            .then(function(response) {
+                if (!response.ok) {
+                    throw new Error('Loading ' + url + ' failed with ' + response.status);
+                }
+                return response.json();
+            })
+            .then(decodeColumnar);
+    }
+
+    // Read newline-delimited JSON, calling onLine with each parsed line as it arrives
+    function readLines(response, onLine) {
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        function pump() {
+            return reader.read().then(function(result) {
+                buffer += decoder.decode(result.value || new Uint8Array(), {stream: !result.done});
+                const lines = buffer.split('\n');
+                buffer = lines.pop();
+                for (let i = 0; i < lines.length; i++) {
+                    if (lines[i] && onLine(JSON.parse(lines[i])) === false) {
+                        return reader.cancel();
+                    }
+                }
+                return result.done ? undefined : pump();
+            });
+        }
+        return pump();
+    }
+
+    // Latest stream per table, so a stream started again for the same table stops the older one
+    const streams = {};
+    // Longest a streamed table waits before its next batch of rows is shown
+    const STREAM_UPDATE_INTERVAL = 500;
+
+    // Stream a table from /api/tables/<name>/stream into a DashTabulator. The returned Promise
+    // resolves with the first chunk's rows for the table's data prop; the later chunks are set
+    // on the same prop through dash_clientside.set_props, batched so the table re-renders at
+    // most once per STREAM_UPDATE_INTERVAL, each time as a new array so Dash holds what the
+    // table shows. Without set_props the Promise resolves with every row once all have arrived.
+    function streamColumnarTable(url, tableId) {
+        const token = {};
+        streams[tableId] = token;
+        const setProps = window.dash_clientside && window.dash_clientside.set_props;
+
+        return fetch(url, {headers: {'Accept': 'application/x-ndjson'}}).then(function(response) {
+            if (!response.ok) {
+                throw new Error('Loading ' + url + ' failed with ' + response.status);
+            }
+
+            return new Promise(function(resolve, reject) {
+                let rows = null;
+                let shown = 0;
+                let timer = null;
+
+                function current() {
+                    // Superseded by a newer stream, or the page was left
+                    return streams[tableId] === token && document.getElementById(tableId) !== null;
+                }
+
+                function show() {
+                    timer = null;
+                    if (rows.length > shown && current()) {
+                        shown = rows.length;
+                        setProps(tableId, {data: rows});
+                    }
+                }
+
+                readLines(response, function(line) {
+                    if (line.error) {
+                        throw new Error('Streaming ' + url + ' failed: ' + line.error);
+                    }
+                    const chunk = decodeColumnar(line);
+                    if (!setProps) {
+                        rows = rows === null ? chunk : rows.concat(chunk);
+                        return true;
+                    }
+                    if (rows === null) {
+                        rows = chunk;
+                        shown = rows.length;
+                        resolve(rows);
+                        return true;
+                    }
+                    if (!current()) {
+                        return false;
+                    }
+                    rows = rows.concat(chunk);
+                    if (timer === null) {
+                        timer = window.setTimeout(show, STREAM_UPDATE_INTERVAL);
+                    }
+                    return true;
+                }).then(function() {
+                    if (timer !== null) {
+                        window.clearTimeout(timer);
+                        show();
+                    }
+                    // Tables with no rows send no chunks
+                    resolve(rows === null ? [] : rows);
+                }, function(error) {
+                    if (rows === null || !setProps) {
+                        reject(error);
+                    } else {
+                        console.error(error);
+                    }
+                }).finally(function() {
+                    if (streams[tableId] === token) {
+                        delete streams[tableId];
+                    }
+                });
+            });
+        });
+    }
+
+    window.decodeColumnar = decodeColumnar;
+    window.fetchColumnarTable = fetchColumnarTable;
+    window.streamColumnarTable = streamColumnarTable;
+})();
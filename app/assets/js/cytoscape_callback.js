@@ -84,6 +84,113 @@ if (typeof clearHighlighting === 'undefined') {
     };
 }
 
+// Cytoscape Elements fetched from the server, keyed by URL and ETag
+window.networkDataCache = window.networkDataCache || {};
+
+/**
+ * Resolve the contents of cytoscape-data-div to the Elements JSON string.
+ * The div holds a descriptor ({src, etag, ...}) of the cached Elements; they
+ * are fetched once per ETag and revalidated by the browser (304) otherwise.
+ * @param {string} networkDataJson - Descriptor or Elements JSON string
+ * @returns {Promise<string>} - Elements JSON string
+ */
+window.resolveNetworkData = function(networkDataJson) {
+    let descriptor;
+    try {
+        descriptor = JSON.parse(networkDataJson);
+    } catch (e) {
+        return Promise.resolve(networkDataJson);
+    }
+
+    if (!descriptor || !descriptor.src) {
+        return Promise.resolve(networkDataJson);
+    }
+
+    const cached = window.networkDataCache[descriptor.src];
+    if (cached && cached.etag === descriptor.etag) {
+        return Promise.resolve(cached.json);
+    }
+
+    // no-cache sends If-None-Match, so an unchanged Graph costs a 304
+    return fetch(descriptor.src, { cache: 'no-cache', credentials: 'same-origin' })
+        .then(response => {
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+            return response.text();
+        })
+        .then(json => {
+            window.networkDataCache[descriptor.src] = { etag: descriptor.etag, json: json };
+            return json;
+        })
+        .catch(error => {
+            console.error('Failed to fetch network data:', error);
+            return JSON.stringify({ elements: [] });
+        });
+};
+
+/**
+ * Patch the graph already drawn to match the contents of cytoscape-data-div,
+ * keeping the positions of the Elements that did not change.
+ * @param {string} networkDataJson - Descriptor JSON from cytoscape-data-div
+ * @returns {Promise<boolean>} - Whether the graph was patched (false means redraw it)
+ */
+window.patchNetworkData = function(networkDataJson, labelFilter, elementFilter, edgeTypeFilter) {
+    const view = window.networkView;
+    let descriptor;
+    try {
+        descriptor = JSON.parse(networkDataJson);
+    } catch (e) {
+        return Promise.resolve(false);
+    }
+
+    if (!window.cy || !view || view.lod || !descriptor || !descriptor.src || descriptor.lod) {
+        return Promise.resolve(false);
+    }
+    if (descriptor.graph_version === view.graph_version && descriptor.root === view.root) {
+        return Promise.resolve(true);
+    }
+
+    const params = new URLSearchParams({
+        root: descriptor.root,
+        from_version: view.graph_version,
+        from_root: view.root
+    });
+    return fetch(`/api/graph/patch?${params}`, { credentials: 'same-origin' })
+        .then(response => {
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+            return response.json();
+        })
+        .then(patch => {
+            if (patch.reset) {
+                return false;
+            }
+
+            // A patch replacing most of the graph is better served by a fresh layout
+            const removed = new Set(patch.remove);
+            const kept = window.cy.nodes().filter(node => !removed.has(node.id())).length;
+            const added = patch.add.filter(ele => ele.group === 'nodes').length;
+            if (added > kept) {
+                return false;
+            }
+
+            applyElementPatch(patch);
+            highlightDiff(window.graphDiff);
+            window.networkView = { graph_version: patch.graph_version, root: patch.root, lod: false };
+            applyLabelFilter(labelFilter);
+            applyVisualFilters(elementFilter, edgeTypeFilter);
+            console.log(`Patched network to version ${patch.graph_version}: ` +
+                `${patch.add.length} added, ${patch.remove.length} removed, ${patch.update.length} updated`);
+            return true;
+        })
+        .catch(error => {
+            console.error('Failed to patch network data:', error);
+            return false;
+        });
+};
+
 window.cytoscapeCallback = function(networkDataJson, filteredValue, layoutAlgorithm, labelFilter, elementFilter, edgeTypeFilter) {
     // Parse the JSON data
     let networkData;
@@ -98,6 +205,16 @@ window.cytoscapeCallback = function(networkDataJson, filteredValue, layoutAlgori
         return window.dash_clientside.no_update;
     }
     
+    // Large Graphs arrive as a level-of-detail View whose Clusters expand on demand
+    window.lodState = networkData.lod || null;
+    
+    // Remember which Graph Version and Root are drawn, so later changes can be patched in
+    window.networkView = {
+        graph_version: networkData.graph_version,
+        root: networkData.root,
+        lod: Boolean(networkData.lod)
+    };
+    
     // Default to fcose if no algorithm specified
     layoutAlgorithm = layoutAlgorithm || 'fcose';
     console.log('Applying layout algorithm:', layoutAlgorithm);
@@ -196,6 +313,7 @@ window.cytoscapeCallback = function(networkDataJson, filteredValue, layoutAlgori
             animate: false
         }
     });
+    highlightDiff(window.graphDiff);
 
     // Then run the selected layout after initialization
     setTimeout(() => {
@@ -99,6 +99,11 @@ function setupTapEvents(filteredValue) {
     // Double tap on node
     window.cy.on('dbltap', 'node', function(event) {
         const node = event.target;
+        // Expand a Cluster, or collapse an expanded Node, of a level-of-detail View
+        if (window.lodState && (node.data('hidden') > 0 || node.data('expanded'))) {
+            expandCluster(node, Boolean(node.data('expanded')));
+            return;
+        }
         // Center and zoom to node
         window.cy.animate({
             center: { eles: node },
@@ -187,6 +192,21 @@ function handleNodeContextMenu(event) {
                 );
             }
         },
+        {
+            label: 'Show Downstream Impact',
+            action: () => highlightImpact(node, 'downstream')
+        },
+        {
+            label: 'Show Upstream Impact',
+            action: () => highlightImpact(node, 'upstream')
+        },
+        {
+            label: 'Focus on Neighbourhood',
+            action: () => {
+                const params = new URLSearchParams({ focus: node.id(), hops: 2 });
+                window.location.href = `/network?${params}`;
+            }
+        },
         {
             label: 'Center on Node',
             action: () => {
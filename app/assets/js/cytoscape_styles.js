@@ -31,6 +31,28 @@ function getCytoscapeStyles() {
             }
         },
         
+        // Collapsed Cluster of a level-of-detail View
+        {
+            selector: 'node.cluster',
+            style: {
+                'shape': 'round-rectangle',
+                'border-style': 'double',
+                'border-width': '4px',
+                'height': '60px',
+                'width': '60px'
+            }
+        },
+        
+        // Meta-Edge summarising the Edges between Clusters
+        {
+            selector: 'edge.meta-edge',
+            style: {
+                'line-style': 'dashed',
+                'width': 'mapData(weight, 1, 100, 1, 8)',
+                'label': 'data(label)'
+            }
+        },
+        
         // Selected node style
         {
             selector: ':selected',
@@ -165,6 +187,28 @@ function getCytoscapeStyles() {
             }
         },
         
+        // Elements added or changed since the Snapshot being compared
+        {
+            selector: '.diff-added',
+            style: {
+                'border-color': '#2ca02c',
+                'border-width': '4px',
+                'line-color': '#2ca02c',
+                'target-arrow-color': '#2ca02c'
+            }
+        },
+        {
+            selector: '.diff-changed',
+            style: {
+                'border-color': '#ff7f0e',
+                'border-width': '4px',
+                'border-style': 'dashed',
+                'line-color': '#ff7f0e',
+                'line-style': 'dashed',
+                'target-arrow-color': '#ff7f0e'
+            }
+        },
+        
         // Search match elements (direct matches from search)
         {
             selector: '.search-match',
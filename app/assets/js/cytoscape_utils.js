@@ -580,6 +580,60 @@ function highlightPath(path) {
     path.removeClass('faded').addClass('highlighted');
 }
 
+/**
+ * Highlight the Nodes a Node impacts (or is impacted by), as computed by the server
+ * @param {Object} node - Cytoscape node
+ * @param {string} direction - 'downstream' or 'upstream'
+ */
+function highlightImpact(node, direction = 'downstream') {
+    if (!window.cy || !node) return;
+    
+    // The server applies the Edge Type propagation rules
+    fetch(`/api/impact/node/${encodeURIComponent(node.id())}`, { credentials: 'same-origin' })
+        .then(response => {
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+            return response.json();
+        })
+        .then(result => {
+            const impactedIds = result[direction] || [];
+            const impacted = window.cy.collection([node]);
+            impactedIds.forEach(id => impacted.merge(window.cy.getElementById(id)));
+            
+            clearHighlighting();
+            window.cy.elements().addClass('faded');
+            impacted.union(impacted.edgesWith(impacted)).removeClass('faded').addClass('highlighted');
+            
+            // Part of the impact set may lie outside the graph currently drawn
+            const hidden = impactedIds.length - (impacted.length - 1);
+            const suffix = hidden > 0 ? ` (${hidden} not shown)` : '';
+            showToast(`${impactedIds.length} nodes ${direction} of ${node.data('label') || node.id()}${suffix}`, 'info');
+        })
+        .catch(error => {
+            console.error('Error loading impact set:', error);
+            showToast('Failed to load the impact set', 'error');
+        });
+}
+
+/**
+ * Mark the elements added or changed since a Snapshot
+ * @param {Object|null} diff - Element ids by section and change, or null to clear
+ */
+function highlightDiff(diff) {
+    window.graphDiff = diff || null;
+    if (!window.cy) return;
+    
+    window.cy.elements().removeClass('diff-added diff-changed');
+    if (!diff) return;
+    
+    ['nodes', 'edges'].forEach(section => {
+        const changes = diff[section] || {};
+        (changes.added || []).forEach(id => window.cy.getElementById(id).addClass('diff-added'));
+        (changes.changed || []).forEach(id => window.cy.getElementById(id).addClass('diff-changed'));
+    });
+}
+
 /**
  * Apply visual filters to control which elements are grayed out
  * @param {string} elementFilter - Filter type: 'all', 'nodes', 'edges'
@@ -675,5 +729,103 @@ function applyLabelFilter(labelFilter) {
     }
 }
 
+/**
+ * Merge an Element patch into the current graph without a full re-layout
+ * @param {Object} patch - { add: [elements], remove: [ids], update: [{data, classes}] }
+ * @param {Object} origin - Node around which added Nodes are placed (optional)
+ */
+function applyElementPatch(patch, origin) {
+    if (!window.cy || !patch) return;
+    
+    const addedNodes = (patch.add || []).filter(ele => ele.group === 'nodes');
+    const addedEdges = (patch.add || []).filter(ele => ele.group === 'edges');
+    
+    // Without an origin, new Nodes are placed around a neighbour already drawn
+    const neighbours = {};
+    addedEdges.forEach(ele => {
+        (neighbours[ele.data.source] = neighbours[ele.data.source] || []).push(ele.data.target);
+        (neighbours[ele.data.target] = neighbours[ele.data.target] || []).push(ele.data.source);
+    });
+    const extent = window.cy.extent();
+    const viewportCenter = { x: (extent.x1 + extent.x2) / 2, y: (extent.y1 + extent.y2) / 2 };
+    const anchorOf = (id) => {
+        if (origin) return origin.position();
+        const drawn = (neighbours[id] || [])
+            .map(other => window.cy.getElementById(other))
+            .find(other => other.nonempty());
+        return drawn ? drawn.position() : viewportCenter;
+    };
+    const radius = origin ? 60 + 8 * addedNodes.length : 80;
+    
+    window.cy.batch(() => {
+        (patch.remove || []).forEach(id => window.cy.getElementById(id).remove());
+        
+        // New Nodes fan out around their anchor
+        addedNodes.forEach((ele, i) => {
+            const center = anchorOf(ele.data.id);
+            const angle = (2 * Math.PI * i) / Math.max(addedNodes.length, 1);
+            window.cy.add({
+                ...ele,
+                position: {
+                    x: center.x + radius * Math.cos(angle),
+                    y: center.y + radius * Math.sin(angle)
+                }
+            });
+        });
+        
+        (patch.update || []).forEach(ele => {
+            const existing = window.cy.getElementById(ele.data.id);
+            if (existing.empty()) return;
+            // An Edge's endpoints cannot be changed through data()
+            if (existing.isEdge() &&
+                (existing.data('source') !== ele.data.source || existing.data('target') !== ele.data.target)) {
+                existing.move({ source: ele.data.source, target: ele.data.target });
+            }
+            existing.data(ele.data);
+            existing.classes(ele.classes || '');
+        });
+        window.cy.add(addedEdges);
+    });
+}
+
+/**
+ * Expand (or collapse) a Cluster of a level-of-detail View
+ * @param {Object} node - Cytoscape node that was double tapped
+ * @param {boolean} collapse - Collapse the Node instead of expanding it
+ */
+function expandCluster(node, collapse = false) {
+    const state = window.lodState;
+    if (!state || !node) return;
+    
+    fetch('/api/graph/expand', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({
+            root: state.root,
+            graph_version: state.graph_version,
+            expanded: state.expanded,
+            node: node.id(),
+            collapse: collapse
+        })
+    })
+        .then(response => {
+            if (response.status === 409) {
+                throw new Error('The network has changed, please reload the graph');
+            }
+            if (!response.ok) {
+                throw new Error(`Failed to expand cluster (${response.status})`);
+            }
+            return response.json();
+        })
+        .then(patch => {
+            applyElementPatch(patch, node);
+            state.expanded = patch.expanded;
+        })
+        .catch(error => {
+            console.error('Error expanding cluster:', error);
+            showToast(error.message, 'warning');
+        });
+}
+
 // Click anywhere to hide context menu
 document.addEventListener('click', hideContextMenu);
\ No newline at end of file
@@ -0,0 +1,104 @@
+# benchmarks/bench_sparse_metrics.py
+
+"""Benchmark the NetworkX Metric loops against the Sparse Matrix backend.
+
+Run from the app directory:
+
+    python -m benchmarks.bench_sparse_metrics [--edges 10000 100000 1000000]
+"""
+
+# Import Libraries
+import argparse
+import random
+import statistics
+import time
+import uuid
+
+import networkx as nx
+
+from utils.sparse_metrics import SparseGraph, calculate_structural_metrics
+
+
+def generate_graph(num_edges: int, seed: int = 42) -> nx.MultiDiGraph:
+    """Random MultiDiGraph shaped like a Breakdown: a tree plus cross Edges"""
+    rng = random.Random(seed)
+    num_nodes = max(2, num_edges // 2)
+    node_ids = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(num_nodes)]
+
+    G = nx.MultiDiGraph()
+    for i, node_id in enumerate(node_ids):
+        G.add_node(
+            node_id,
+            name=f"Node {i}",
+            description=f"Description {i}" if rng.random() < 0.7 else None,
+        )
+
+    # number_of_edges() is O(n) on a MultiDiGraph, so count the Edges here
+    for key in range(num_edges):
+        if 0 < key < num_nodes:
+            G.add_edge(node_ids[rng.randrange(key)], node_ids[key], key=key)
+        else:
+            G.add_edge(rng.choice(node_ids), rng.choice(node_ids), key=key)
+    # Leave some Nodes isolated
+    G.add_nodes_from(str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(num_nodes // 100))
+    return G
+
+
+def networkx_loops(G: nx.MultiDiGraph) -> dict:
+    """The Metric loops as written in metric_utils and the Dashboard before the Sparse backend"""
+    degrees = [G.degree(n) for n in G.nodes()]
+    return {
+        'total_nodes': G.number_of_nodes(),
+        'total_edges': G.number_of_edges(),
+        'density': nx.density(G),
+        'average_degree': sum(degrees) / len(degrees) if degrees else 0,
+        'min_degree': min(degrees),
+        'max_degree': max(degrees),
+        'median_degree': statistics.median(degrees),
+        'isolated_nodes': sum(1 for n in G.nodes() if G.degree(n) == 0),
+        'self_loops': nx.number_of_selfloops(G),
+        'weakly_connected_components': nx.number_weakly_connected_components(G),
+        'strongly_connected_components': nx.number_strongly_connected_components(G),
+        'nodes_with_names': sum(1 for _, data in G.nodes(data=True) if data.get('name')),
+        'nodes_with_descriptions': sum(1 for _, data in G.nodes(data=True) if data.get('description')),
+        'attribute_completeness': round(
+            sum(1 for _, data in G.nodes(data=True) if data.get('name') and data.get('description'))
+            / G.number_of_nodes() * 100, 2
+        ),
+    }
+
+
+def _best_of(func, repeat: int):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(edge_counts, repeat: int = 3) -> None:
+    print(f"{'edges':>10} {'networkx':>10} {'csr build':>10} {'csr metrics':>12} {'speedup':>8}")
+    for num_edges in edge_counts:
+        G = generate_graph(num_edges)
+
+        nx_time, expected = _best_of(lambda: networkx_loops(G), repeat)
+        build_time, S = _best_of(lambda: SparseGraph.from_networkx(G), repeat)
+        sparse_time, actual = _best_of(lambda: calculate_structural_metrics(S), repeat)
+
+        for name, value in expected.items():
+            if abs(float(value) - float(actual[name])) > 1e-9:
+                raise AssertionError(f"{name}: networkx={value} sparse={actual[name]}")
+
+        print(
+            f"{num_edges:>10} {nx_time:>9.3f}s {build_time:>9.3f}s {sparse_time:>11.4f}s "
+            f"{nx_time / sparse_time:>7.0f}x"
+        )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--edges', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    run(args.edges, args.repeat)
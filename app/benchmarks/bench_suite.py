@@ -0,0 +1,248 @@
+# benchmarks/bench_suite.py
+
+"""Time the key paths against synthetic Models and write the results to JSON.
+
+Each size gets a generated Database and a fresh Worker process (so no cache
+or import warms one size for the next) that times building the Graph, the
+Breakdown, the Cytoscape Elements, the Editor loaders, the Metric Families
+and the PDF exports. Results record the best and median of the repeats, the
+Database queries and, with --memory, the peak allocation of each path.
+
+Run from the app directory:
+
+    python -m benchmarks.bench_suite --nodes 1000 10000 --output results.json
+    python -m benchmarks.bench_suite --nodes 1000 --compare results.json
+"""
+
+# Import Libraries
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.synthetic import SyntheticSpec, create_synthetic_database
+
+APP_DIR = Path(__file__).resolve().parent.parent
+
+
+# ==================== Worker ====================
+
+
+def _measure(func: Callable[[], Any], repeat: int, memory: bool) -> Tuple[Dict[str, Any], Any]:
+    from utils.query_profiler import profile_queries
+
+    times = []
+    with profile_queries() as stats:
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    measurement = {
+        'best_seconds': round(min(times), 6),
+        'median_seconds': round(statistics.median(times), 6),
+        'runs': [round(t, 6) for t in times],
+        'queries': stats.count,
+    }
+    if memory:
+        # A separate run, since tracing slows the timed ones down
+        tracemalloc.start()
+        func()
+        measurement['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return measurement, result
+
+
+def _breakdown_rows(items: List[Dict[str, Any]], prefix: str = "") -> List[Dict[str, Any]]:
+    """Breakdown items in the numbered form the Components page exports"""
+    rows = []
+    for index, item in enumerate(items, start=1):
+        element = f"{prefix}.{index}" if prefix else f"{index}.0"
+        rows.append({
+            'Element': element,
+            'Relation': item.get('edge_label', ''),
+            'Weight': str(item.get('weight', 1)),
+            'Identifier': item.get('identifier', ''),
+            'Name': item.get('name', ''),
+            'Description': item.get('description', ''),
+            '_children': _breakdown_rows(item.get('_children', []), element if prefix else str(index)),
+        })
+    return rows
+
+
+def run_worker(repeat: int, memory: bool) -> Dict[str, Any]:
+    """Time every path against the Database in DB_PATH"""
+    from models.model import Model
+    from utils import metric_utils
+    from utils.network_utils import (
+        build_breakdown_from_graph,
+        build_networkx_from_database,
+        get_graph_roots,
+        networkx_to_cytoscape,
+    )
+    from utils.pdf_utils import generate_breakdown_pdf, generate_table_pdf
+
+    results: Dict[str, Dict[str, Any]] = {}
+
+    def bench(name: str, func: Callable[[], Any]) -> Any:
+        results[name], value = _measure(func, repeat, memory)
+        return value
+
+    model = Model()
+    G = bench('build_networkx_from_database', build_networkx_from_database)
+    roots = get_graph_roots(G)
+    graph_version = model.get_graph_version()
+    breakdown = bench('build_breakdown_from_graph', lambda: build_breakdown_from_graph(G, graph_version))
+    bench('networkx_to_cytoscape', lambda: networkx_to_cytoscape(G))
+
+    nodes = bench('get_nodes_for_editor', model.get_nodes_for_editor)
+    bench('get_edges_for_editor', model.get_edges_for_editor)
+    bench('get_edge_types_for_editor', model.get_edge_types_for_editor)
+
+    bench('metrics.completeness', lambda: metric_utils.calculate_completeness_metrics(G, graph_version=graph_version))
+    bench('metrics.efficiency', lambda: metric_utils.calculate_efficiency_metrics(G))
+    bench('metrics.robustness', lambda: metric_utils.calculate_robustness_metrics(G, graph_version=graph_version))
+    bench('metrics.resilience', lambda: metric_utils.calculate_resilience_metrics(G))
+    bench('metrics.cycles', lambda: metric_utils.calculate_cycle_metrics(G, graph_version=graph_version))
+
+    bench('pdf.nodes_table', lambda: generate_table_pdf(nodes, "Nodes Table", ["ID"], "nodes"))
+    rows = _breakdown_rows(breakdown[:1])
+    bench('pdf.breakdown', lambda: generate_breakdown_pdf(rows, "Breakdown", "breakdown"))
+
+    model.close()
+    return {
+        'graph': {'nodes': G.number_of_nodes(), 'edges': G.number_of_edges(), 'roots': len(roots)},
+        'paths': results,
+    }
+
+
+# ==================== Suite ====================
+
+
+def _environment() -> Dict[str, Any]:
+    def git(*args: str) -> Optional[str]:
+        try:
+            return subprocess.run(
+                ['git', *args], cwd=APP_DIR, capture_output=True, text=True, timeout=10, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.SubprocessError):
+            return None
+
+    import networkx
+    import numpy
+    import sqlalchemy
+
+    return {
+        'commit': git('rev-parse', 'HEAD'),
+        'dirty': bool(git('status', '--porcelain', '--untracked-files=no')),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'packages': {
+            'networkx': networkx.__version__,
+            'numpy': numpy.__version__,
+            'sqlalchemy': sqlalchemy.__version__,
+        },
+    }
+
+
+def _run_size(spec: SyntheticSpec, directory: str, repeat: int, memory: bool) -> Dict[str, Any]:
+    path = os.path.join(directory, f"synthetic-{spec.nodes}-{spec.seed}.db")
+    generated = create_synthetic_database(path, spec)
+    print(f"Generated {generated['rows']['Node']} Nodes and {generated['rows']['Edge']} Edges "
+          f"in {generated['seconds']}s", file=sys.stderr)
+
+    command = [sys.executable, '-m', 'benchmarks.bench_suite', '--worker', '--repeat', str(repeat)]
+    if memory:
+        command.append('--memory')
+    env = dict(os.environ, DB_PATH=path, LOG_LEVEL='WARNING')
+    completed = subprocess.run(command, cwd=APP_DIR, env=env, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"Benchmark Worker failed for {spec.nodes} Nodes:\n{completed.stderr}")
+
+    # The Worker prints its results as the last line, after anything the App logs
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result['spec'] = asdict(spec)
+    result['rows'] = generated['rows']
+    result['generate_seconds'] = generated['seconds']
+    return result
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> None:
+    """Print the change in best time of every path against a baseline run"""
+    previous = {run['spec']['nodes']: run for run in baseline.get('runs', [])}
+    print(f"Baseline commit {baseline.get('environment', {}).get('commit')}")
+    for run in current['runs']:
+        base = previous.get(run['spec']['nodes'])
+        if base is None:
+            continue
+        print(f"\n{run['spec']['nodes']} Nodes")
+        print(f"{'path':<32} {'baseline':>10} {'current':>10} {'change':>8} {'queries':>12}")
+        for name, measurement in run['paths'].items():
+            before = base['paths'].get(name)
+            if before is None:
+                continue
+            ratio = measurement['best_seconds'] / before['best_seconds'] if before['best_seconds'] else float('inf')
+            print(
+                f"{name:<32} {before['best_seconds']:>9.4f}s {measurement['best_seconds']:>9.4f}s "
+                f"{(ratio - 1) * 100:>+7.1f}% {before['queries']:>5} -> {measurement['queries']:<5}"
+            )
+
+
+def run_suite(args: argparse.Namespace) -> Dict[str, Any]:
+    results = {
+        'created_on': datetime.now().isoformat(timespec='seconds'),
+        'environment': _environment(),
+        'repeat': args.repeat,
+        'runs': [],
+    }
+    with tempfile.TemporaryDirectory(prefix='tracer-bench-') as directory:
+        for nodes in args.nodes:
+            spec = SyntheticSpec(nodes=nodes, reuse=args.reuse, branching=args.branching, seed=args.seed)
+            run = _run_size(spec, args.keep or directory, args.repeat, args.memory)
+            results['runs'].append(run)
+            for name, measurement in run['paths'].items():
+                print(f"{nodes:>8} {name:<32} {measurement['best_seconds']:>9.4f}s "
+                      f"{measurement['queries']:>6} queries", file=sys.stderr)
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--nodes', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--reuse', type=float, default=SyntheticSpec.reuse)
+    parser.add_argument('--branching', type=int, default=SyntheticSpec.branching)
+    parser.add_argument('--seed', type=int, default=SyntheticSpec.seed)
+    parser.add_argument('--memory', action='store_true', help="also record the peak allocation of each path")
+    parser.add_argument('--output', help="write the results to this JSON file")
+    parser.add_argument('--compare', help="print the change against the results in this JSON file")
+    parser.add_argument('--keep', help="generate the Databases in this directory and keep them")
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.repeat, args.memory)))
+        sys.exit(0)
+
+    results = run_suite(args)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {args.output}", file=sys.stderr)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), results)
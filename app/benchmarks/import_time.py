@@ -0,0 +1,134 @@
+# benchmarks/import_time.py
+
+"""Break down the time spent importing the App at startup.
+
+Runs `python -X importtime -c "import app"` in a fresh process and groups the
+cumulative import time by top-level package, then checks that the modules
+deferred to first use (pandas, reportlab and memory_profiler) were not
+imported at startup and what each costs when it is. Dash imports
+plotly.graph_objects itself, which stays cheap since plotly loads the Figure
+classes on first use.
+
+Run from the app directory:
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --nodes 1000 --output imports.json
+"""
+
+# Import Libraries
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple
+
+from benchmarks.bench_suite import APP_DIR
+
+# Imported on first use rather than at startup
+DEFERRED_MODULES = ('pandas', 'reportlab.platypus', 'memory_profiler')
+
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$")
+
+
+def parse_importtime(output: str) -> List[Tuple[int, str, int, int]]:
+    """(depth, module, self microseconds, cumulative microseconds) of each -X importtime line"""
+    entries = []
+    for line in output.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append((len(indent) // 2, module, int(self_us), int(cumulative_us)))
+    return entries
+
+
+def package_breakdown(entries: List[Tuple[int, str, int, int]]) -> Dict[str, Dict[str, float]]:
+    """Cumulative milliseconds per top-level package, counting each package where it was first imported"""
+    breakdown: Dict[str, Dict[str, float]] = {}
+    for depth, module, _, cumulative_us in entries:
+        # Nested imports are included in the cumulative time of the import that triggered them
+        if depth > 1 or module == 'app':
+            continue
+        package = module.split('.')[0]
+        totals = breakdown.setdefault(package, {'cumulative_ms': 0.0, 'modules': 0})
+        totals['cumulative_ms'] += cumulative_us / 1000
+        totals['modules'] += 1
+    return dict(sorted(breakdown.items(), key=lambda item: -item[1]['cumulative_ms']))
+
+
+def _standalone_import_ms(module: str) -> Optional[float]:
+    """Milliseconds a fresh interpreter takes to import module, i.e. its cost on first use"""
+    code = (
+        "import time, importlib; start = time.perf_counter(); "
+        f"importlib.import_module({module!r}); print((time.perf_counter() - start) * 1000)"
+    )
+    completed = subprocess.run([sys.executable, '-c', code], cwd=APP_DIR, capture_output=True, text=True)
+    if completed.returncode != 0:
+        return None
+    return round(float(completed.stdout.strip().splitlines()[-1]), 1)
+
+
+def measure_startup(db_path: str) -> Dict[str, Any]:
+    env = dict(os.environ, DB_PATH=db_path, LOG_LEVEL='WARNING')
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app'],
+        cwd=APP_DIR, env=env, capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing the App failed:\n{completed.stderr[-2000:]}")
+
+    entries = parse_importtime(completed.stderr)
+    imported = {module for _, module, _, _ in entries}
+    app_entry = next((entry for entry in entries if entry[1] == 'app' and entry[0] == 0), None)
+    return {
+        'total_ms': round(app_entry[3] / 1000, 1) if app_entry else None,
+        # Time spent in app.py itself: creating the App and warming the Graph
+        'app_self_ms': round(app_entry[2] / 1000, 1) if app_entry else None,
+        'modules_imported': len(imported),
+        'packages': {
+            package: {'cumulative_ms': round(totals['cumulative_ms'], 1), 'modules': totals['modules']}
+            for package, totals in package_breakdown(entries).items()
+        },
+        'deferred': {
+            module: {'imported_at_startup': module in imported, 'first_use_ms': _standalone_import_ms(module)}
+            for module in DEFERRED_MODULES
+        },
+    }
+
+
+def print_report(report: Dict[str, Any], limit: int) -> None:
+    print(f"import app: {report['total_ms']}ms total, {report['app_self_ms']}ms in app.py, "
+          f"{report['modules_imported']} modules")
+    print(f"\n{'package':<28} {'cumulative':>12} {'modules':>8}")
+    for package, totals in list(report['packages'].items())[:limit]:
+        print(f"{package:<28} {totals['cumulative_ms']:>10.1f}ms {totals['modules']:>8}")
+    print(f"\n{'deferred module':<28} {'at startup':>12} {'first use':>12}")
+    for module, status in report['deferred'].items():
+        first_use = f"{status['first_use_ms']:.1f}ms" if status['first_use_ms'] is not None else "missing"
+        print(f"{module:<28} {'yes' if status['imported_at_startup'] else 'no':>12} {first_use:>12}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--db', help="import the App against this Database (default: a generated one)")
+    parser.add_argument('--nodes', type=int, default=200, help="size of the generated Database")
+    parser.add_argument('--limit', type=int, default=20, help="packages to print")
+    parser.add_argument('--output', help="write the report to this JSON file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='tracer-imports-') as directory:
+        db_path = args.db
+        if db_path is None:
+            from benchmarks.synthetic import SyntheticSpec, create_synthetic_database
+
+            db_path = os.path.join(directory, 'imports.db')
+            create_synthetic_database(db_path, SyntheticSpec(nodes=args.nodes))
+        report = measure_startup(db_path)
+
+    print_report(report, args.limit)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.output}", file=sys.stderr)
@@ -0,0 +1,393 @@
+# benchmarks/load_test.py
+
+"""Load test the App by replaying Dash Callback sequences with simulated users.
+
+Each user opens the Graphs page, picks a Root, searches for a Node, opens the
+Components page, edits a Node in the Nodes table and exports the Breakdown to
+PDF, sending the same _dash-update-component requests (and Graph API fetches)
+a browser would. The report gives the throughput and latency percentiles of
+every step.
+
+By default a synthetic Model is generated and served locally:
+
+    python -m benchmarks.load_test --nodes 5000 --users 20 --duration 60
+
+or point it at a running server (e.g. several gunicorn workers) whose
+Database it may write to:
+
+    python -m benchmarks.load_test --url http://127.0.0.1:8050 --users 50
+"""
+
+# Import Libraries
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+APP_DIR = Path(__file__).resolve().parent.parent
+DASH_UPDATE = "/_dash-update-component"
+
+
+# ==================== Dash Callback Requests ====================
+
+
+def _parse_outputs(output: str):
+    """The outputs field the Dash renderer sends for a Callback's Output string"""
+    def parse(spec: str) -> Dict[str, str]:
+        component_id, prop = spec.rsplit('.', 1)
+        return {'id': component_id, 'property': prop}
+
+    if output.startswith('..') and output.endswith('..'):
+        return [parse(spec) for spec in output[2:-2].split('...')]
+    return parse(output)
+
+
+class DashClient:
+    """Builds _dash-update-component bodies from the App's Callback dependencies"""
+
+    def __init__(self, dependencies: List[Dict[str, Any]]):
+        self.callbacks: Dict[Tuple[str, str], List[Dict[str, Any]]] = defaultdict(list)
+        for dependency in dependencies:
+            if dependency.get('clientside_function'):
+                continue
+            for spec in dependency['inputs']:
+                self.callbacks[(spec['id'], spec['property'])].append(dependency)
+
+    def triggered_by(self, component_id: str, prop: str, output_prefix: str = '') -> Dict[str, Any]:
+        """The Callback a change of component_id.prop triggers, optionally narrowed by Output"""
+        for dependency in self.callbacks.get((component_id, prop), []):
+            if output_prefix in dependency['output']:
+                return dependency
+        raise LookupError(f"No Callback is triggered by {component_id}.{prop} ({output_prefix})")
+
+    @staticmethod
+    def body(dependency: Dict[str, Any], values: Dict[str, Any], changed: List[str]) -> Dict[str, Any]:
+        def fill(specs):
+            return [dict(spec, value=values.get(f"{spec['id']}.{spec['property']}")) for spec in specs]
+
+        return {
+            'output': dependency['output'],
+            'outputs': _parse_outputs(dependency['output']),
+            'inputs': fill(dependency['inputs']),
+            'state': fill(dependency['state']),
+            'changedPropIds': changed,
+        }
+
+
+def _find_prop(tree: Any, component_id: str, prop: str) -> Any:
+    """A property of a component in a serialised Dash layout"""
+    if isinstance(tree, dict):
+        props = tree.get('props')
+        if isinstance(props, dict):
+            if props.get('id') == component_id and prop in props:
+                return props[prop]
+            return _find_prop(props.get('children'), component_id, prop)
+        return None
+    if isinstance(tree, list):
+        for child in tree:
+            found = _find_prop(child, component_id, prop)
+            if found is not None:
+                return found
+    return None
+
+
+# ==================== Simulated User ====================
+
+
+class Recorder:
+    """Latencies, errors and response sizes per step, shared by every user thread"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.bytes: Dict[str, int] = defaultdict(int)
+        self.sessions = 0
+
+    def session_done(self) -> None:
+        with self._lock:
+            self.sessions += 1
+
+    def record(self, step: str, seconds: float, size: int, ok: bool) -> None:
+        with self._lock:
+            self.latencies[step].append(seconds)
+            self.bytes[step] += size
+            if not ok:
+                self.errors[step] += 1
+
+
+class SimulatedUser:
+    def __init__(self, base_url: str, client: DashClient, recorder: Recorder, node_ids: List[str],
+                 user: int, rng: random.Random, think: float, edits: bool):
+        self.base_url = base_url.rstrip('/')
+        self.node_ids = node_ids
+        self.client = client
+        self.recorder = recorder
+        self.user = user
+        self.rng = rng
+        self.think = think
+        self.edits = edits
+        self.session = requests.Session()
+        self.session.headers['Accept-Encoding'] = 'gzip, br'
+
+    def _request(self, step: str, method: str, path: str, **kwargs) -> Optional[requests.Response]:
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, self.base_url + path, timeout=300, **kwargs)
+            ok = response.status_code < 400 or response.status_code == 304
+            self.recorder.record(step, time.perf_counter() - start, len(response.content), ok)
+            return response if ok else None
+        except requests.RequestException:
+            self.recorder.record(step, time.perf_counter() - start, 0, False)
+            return None
+
+    def callback(self, step: str, trigger: str, values: Dict[str, Any],
+                 output_prefix: str = '') -> Optional[Dict[str, Any]]:
+        component_id, prop = trigger.rsplit('.', 1)
+        dependency = self.client.triggered_by(component_id, prop, output_prefix)
+        body = DashClient.body(dependency, values, [trigger])
+        response = self._request(step, 'POST', DASH_UPDATE, json=body)
+        if response is None or response.status_code == 204:
+            return None
+        return response.json().get('response', {})
+
+    def pause(self) -> None:
+        if self.think:
+            time.sleep(self.rng.uniform(0, 2 * self.think))
+
+    def open_page(self, step: str, pathname: str) -> Any:
+        self._request(f"{step}.html", 'GET', pathname)
+        response = self.callback(f"{step}.layout", '_pages_location.pathname',
+                                 {'_pages_location.pathname': pathname, '_pages_location.search': ''},
+                                 '_pages_content')
+        return (response or {}).get('_pages_content', {}).get('children')
+
+    def fetch_elements(self, step: str, response: Optional[Dict[str, Any]]) -> None:
+        descriptor = (response or {}).get('cytoscape-data-div', {}).get('children')
+        if isinstance(descriptor, str):
+            descriptor = json.loads(descriptor)
+        if isinstance(descriptor, dict) and descriptor.get('src'):
+            self._request(step, 'GET', descriptor['src'])
+
+    def run_session(self) -> None:
+        # Graphs page: Root options, the full Graph, then one Root's View
+        self.open_page('graphs.open', '/network')
+        options = self.callback('graphs.root_options', 'cytoscape-data-div.id',
+                                {'cytoscape-data-div.id': 'cytoscape-data-div'}) or {}
+        roots = [option['value'] for option in options.get('filter-graph-select', {}).get('options', [])
+                 if option['value'] != 'all']
+        self.callback('graphs.snapshots', 'network-snapshot-select.id',
+                      {'network-snapshot-select.id': 'network-snapshot-select'})
+        all_roots = self.callback('graphs.select_all', 'filter-graph-select.value',
+                                  {'filter-graph-select.value': None}, 'cytoscape-data-div')
+        self.fetch_elements('graphs.elements_all', all_roots)
+        self.pause()
+
+        root = self.rng.choice(roots) if roots else None
+        picked = self.callback('graphs.pick_root', 'filter-graph-select.value',
+                               {'filter-graph-select.value': root}, 'cytoscape-data-div')
+        self.fetch_elements('graphs.elements_root', picked)
+        self.pause()
+
+        # Search: a hit is shown with its neighbourhood
+        if self.node_ids:
+            self._request('graphs.search', 'GET', '/api/graph/neighbourhood',
+                          params={'node': self.rng.choice(self.node_ids), 'k': 2})
+        self.pause()
+
+        # Components page: the Breakdown of the Root
+        self.open_page('components.open', '/breakdowns')
+        self.callback('components.options', 'breakdowns-dropdown.id',
+                      {'breakdowns-dropdown.id': 'breakdowns-dropdown'})
+        breakdown = self.callback('components.breakdown', 'breakdowns-dropdown.value',
+                                  {'breakdowns-dropdown.value': root}, 'breakdowns-table-data-store') or {}
+        table_data = breakdown.get('breakdowns-table-data-store', {}).get('children')
+        self.pause()
+
+        # Edit a cell in the Nodes table
+        if self.edits:
+            layout = self.open_page('nodes.open', '/nodes')
+            rows = _find_prop(layout, 'nodes-table', 'data') or []
+            if rows:
+                row = dict(self.rng.choice(rows))
+                row['Description'] = f"Edited by user {self.user} at {time.time():.3f}"
+                self.callback('nodes.edit_cell', 'nodes-table.dataChanged',
+                              {'nodes-table.dataChanged': [row], 'nodes-table.data': rows})
+            self.pause()
+
+        # Export the Breakdown
+        if table_data:
+            self.callback('components.export_pdf', 'breakdowns-print-btn.n_clicks', {
+                'breakdowns-print-btn.n_clicks': 1,
+                'breakdowns-dropdown.value': root,
+                'breakdowns-table-data-store.children': table_data,
+            })
+        self.recorder.session_done()
+
+
+# ==================== Runner ====================
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    """Nearest-rank percentile of sorted values"""
+    if not ordered:
+        return 0.0
+    index = max(0, min(len(ordered) - 1, int(round(q / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def summarize(recorder: Recorder, elapsed: float) -> Dict[str, Any]:
+    steps = {}
+    for step, latencies in sorted(recorder.latencies.items()):
+        ordered = sorted(latencies)
+        steps[step] = {
+            'requests': len(ordered),
+            'errors': recorder.errors.get(step, 0),
+            'throughput_per_second': round(len(ordered) / elapsed, 2),
+            'mean_bytes': round(recorder.bytes[step] / len(ordered)),
+            **{f"p{q}_ms": round(_percentile(ordered, q) * 1000, 1) for q in (50, 90, 95, 99)},
+            'max_ms': round(ordered[-1] * 1000, 1),
+        }
+    total = sum(len(latencies) for latencies in recorder.latencies.values())
+    return {
+        'elapsed_seconds': round(elapsed, 2),
+        'sessions': recorder.sessions,
+        'requests': total,
+        'errors': sum(recorder.errors.values()),
+        'throughput_per_second': round(total / elapsed, 2) if elapsed else 0,
+        'steps': steps,
+    }
+
+
+def print_report(summary: Dict[str, Any]) -> None:
+    print(f"{'step':<28} {'reqs':>6} {'err':>4} {'req/s':>7} {'p50':>8} {'p90':>8} {'p95':>8} "
+          f"{'p99':>8} {'max':>8} {'bytes':>9}")
+    for step, stats in summary['steps'].items():
+        print(f"{step:<28} {stats['requests']:>6} {stats['errors']:>4} {stats['throughput_per_second']:>7} "
+              f"{stats['p50_ms']:>6}ms {stats['p90_ms']:>6}ms {stats['p95_ms']:>6}ms {stats['p99_ms']:>6}ms "
+              f"{stats['max_ms']:>6}ms {stats['mean_bytes']:>9}")
+    print(f"\n{summary['sessions']} sessions, {summary['requests']} requests ({summary['errors']} errors) "
+          f"in {summary['elapsed_seconds']}s: {summary['throughput_per_second']} req/s")
+
+
+def _wait_for_server(base_url: str, process: Optional[subprocess.Popen], timeout: float) -> List[Dict[str, Any]]:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"The server exited with code {process.returncode}")
+        try:
+            response = requests.get(f"{base_url}/_dash-dependencies", timeout=5)
+            if response.ok:
+                return response.json()
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    raise TimeoutError(f"The server at {base_url} did not start within {timeout}s")
+
+
+def _start_server(args: argparse.Namespace, directory: str) -> Tuple[str, subprocess.Popen]:
+    from benchmarks.synthetic import SyntheticSpec, create_synthetic_database
+
+    path = os.path.join(directory, f"load-test-{args.nodes}.db")
+    generated = create_synthetic_database(path, SyntheticSpec(nodes=args.nodes, seed=args.seed))
+    print(f"Generated {generated['rows']['Node']} Nodes and {generated['rows']['Edge']} Edges", file=sys.stderr)
+
+    env = dict(
+        os.environ, DB_PATH=path, LOG_LEVEL='WARNING',
+        METRICS_SNAPSHOT_DIR=os.path.join(directory, 'snapshots'),
+        FLASK_CACHE_DIR=os.path.join(directory, 'flask-cache'),
+    )
+    command = [sys.executable, '-m', 'benchmarks.load_test', '--serve', '--port', str(args.port)]
+    process = subprocess.Popen(command, cwd=APP_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return f"http://127.0.0.1:{args.port}", process
+
+
+def serve(port: int) -> None:
+    """Run the App without the debug reloader, one thread per request"""
+    sys.path.insert(0, str(APP_DIR))
+    import app as tracer_app
+
+    tracer_app.app.run(host='127.0.0.1', port=port, debug=False, threaded=True)
+
+
+def run_load_test(args: argparse.Namespace) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix='tracer-load-') as directory:
+        process = None
+        if args.url:
+            base_url = args.url.rstrip('/')
+        else:
+            base_url, process = _start_server(args, directory)
+        try:
+            client = DashClient(_wait_for_server(base_url, process, args.startup_timeout))
+            # The Node ids users search for
+            elements = requests.get(f"{base_url}/api/graph/cytoscape", timeout=300).json()
+            node_ids = [
+                element['data']['id'] for element in elements.get('elements', []) if element.get('group') == 'nodes'
+            ]
+
+            recorder = Recorder()
+            deadline = time.monotonic() + args.duration
+
+            def user_loop(user: int) -> None:
+                rng = random.Random(args.seed + user)
+                simulated = SimulatedUser(base_url, client, recorder, node_ids, user, rng, args.think,
+                                          not args.no_edits)
+                # Stagger the users' first requests over the ramp-up
+                time.sleep(rng.uniform(0, args.ramp_up))
+                sessions = 0
+                while time.monotonic() < deadline and (not args.sessions or sessions < args.sessions):
+                    simulated.run_session()
+                    sessions += 1
+
+            start = time.monotonic()
+            threads = [threading.Thread(target=user_loop, args=(user,), daemon=True) for user in range(args.users)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            summary = summarize(recorder, time.monotonic() - start)
+            summary['users'] = args.users
+            summary['nodes'] = len(node_ids)
+            return summary
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait(timeout=30)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help="load test a running server instead of starting one")
+    parser.add_argument('--nodes', type=int, default=2000, help="size of the generated Model")
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--duration', type=float, default=60, help="seconds to keep starting sessions")
+    parser.add_argument('--sessions', type=int, default=0, help="stop each user after this many sessions")
+    parser.add_argument('--ramp-up', type=float, default=5)
+    parser.add_argument('--think', type=float, default=0.0, help="mean pause between steps in seconds")
+    parser.add_argument('--no-edits', action='store_true', help="skip the Nodes table edit")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--startup-timeout', type=float, default=300)
+    parser.add_argument('--output', help="write the summary to this JSON file")
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.port)
+        sys.exit(0)
+
+    summary = run_load_test(args)
+    print_report(summary)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(summary, f, indent=2)
@@ -0,0 +1,124 @@
+# benchmarks/payload_sizes.py
+
+"""Measure the bytes response compression saves on the largest payloads.
+
+A Worker process imports the App against a synthetic Database and, through the
+Flask test client, requests the Edges and Nodes pages (the page layout
+Callback), their tables from /api/tables both columnar and as plain rows, and
+the Graph JSON the Graphs page loads for all Roots. Each uncompressed body is
+then compressed with gzip and, when brotli is installed, br at the configured
+levels.
+
+Run from the app directory:
+
+    python -m benchmarks.payload_sizes --nodes 91500
+    python -m benchmarks.payload_sizes --db /tmp/model.db --output payloads.json
+"""
+
+# Import Libraries
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, Optional
+
+from benchmarks.bench_suite import APP_DIR
+from benchmarks.synthetic import SyntheticSpec, create_synthetic_database
+
+
+def _measure_body(body: bytes) -> Dict[str, Any]:
+    from utils.compression import brotli, compress
+
+    measurement: Dict[str, Any] = {'bytes': len(body)}
+    for encoding in ('gzip', 'br'):
+        if encoding == 'br' and brotli is None:
+            continue
+        start = time.perf_counter()
+        compressed = compress(body, encoding)
+        measurement[encoding] = {
+            'bytes': len(compressed),
+            'ms': round((time.perf_counter() - start) * 1000, 2),
+            'saved': round(1 - len(compressed) / len(body), 4) if body else 0.0,
+        }
+    return measurement
+
+
+def run_worker() -> Dict[str, Any]:
+    """Request each payload from the App over the Database in DB_PATH"""
+    from app import app
+    from benchmarks.load_test import DashClient
+
+    client = app.server.test_client()
+    dash_client = DashClient(client.get('/_dash-dependencies').get_json())
+    payloads: Dict[str, Dict[str, Any]] = {}
+
+    def callback(name: str, trigger: str, values: Dict[str, Any], output_prefix: str = '') -> bytes:
+        component_id, prop = trigger.rsplit('.', 1)
+        dependency = dash_client.triggered_by(component_id, prop, output_prefix)
+        response = client.post('/_dash-update-component', json=DashClient.body(dependency, values, [trigger]))
+        payloads[name] = _measure_body(response.get_data())
+        return response.get_data()
+
+    for name, pathname in (('edges_page', '/edges'), ('nodes_page', '/nodes')):
+        callback(name, '_pages_location.pathname',
+                 {'_pages_location.pathname': pathname, '_pages_location.search': ''}, '_pages_content')
+    for table in ('edges', 'nodes'):
+        payloads[f'{table}_columnar'] = _measure_body(client.get(f'/api/tables/{table}').get_data())
+        payloads[f'{table}_rows'] = _measure_body(client.get(f'/api/tables/{table}?format=rows').get_data())
+    payloads['graph_json'] = _measure_body(client.get('/api/graph/cytoscape').get_data())
+    return payloads
+
+
+def measure(db_path: str) -> Dict[str, Any]:
+    env = dict(os.environ, DB_PATH=db_path, LOG_LEVEL='WARNING')
+    completed = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.payload_sizes', '--worker'],
+        cwd=APP_DIR, env=env, capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Payload Worker failed:\n{completed.stderr[-2000:]}")
+    # The Worker prints its results as the last line, after anything the App logs
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def print_report(payloads: Dict[str, Any], rows: Optional[Dict[str, int]]) -> None:
+    if rows:
+        print(f"{rows['Node']} Nodes, {rows['Edge']} Edges")
+    print(f"{'payload':<16} {'bytes':>12} {'gzip':>12} {'saved':>7} {'ms':>8} {'br':>12} {'saved':>7} {'ms':>8}")
+    for name, measurement in payloads.items():
+        line = f"{name:<16} {measurement['bytes']:>12}"
+        for encoding in ('gzip', 'br'):
+            result = measurement.get(encoding)
+            if result:
+                line += f" {result['bytes']:>12} {result['saved']:>7.1%} {result['ms']:>8.1f}"
+        print(line)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--db', help="measure against this Database (default: a generated one)")
+    parser.add_argument('--nodes', type=int, default=91500, help="size of the generated Database; 91500 Nodes give about 100k Edges")
+    parser.add_argument('--output', help="write the measurements to this JSON file")
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker()))
+        sys.exit(0)
+
+    generated_rows = None
+    with tempfile.TemporaryDirectory(prefix='tracer-payloads-') as directory:
+        db_path = args.db
+        if db_path is None:
+            db_path = os.path.join(directory, 'payloads.db')
+            generated_rows = create_synthetic_database(db_path, SyntheticSpec(nodes=args.nodes))['rows']
+        results = measure(db_path)
+
+    print_report(results, generated_rows)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'rows': generated_rows, 'payloads': results}, f, indent=2)
+        print(f"Wrote {args.output}", file=sys.stderr)
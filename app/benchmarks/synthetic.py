@@ -0,0 +1,240 @@
+# benchmarks/synthetic.py
+
+"""Generate synthetic Assurance Models in a SQLite Database.
+
+The Models follow the Schema: Node Types, Edge Types and EAV Property
+Definitions assigned to them, with Property Values filled in for a share of
+the Nodes and Edges. The Graph is a layered DAG (Goals supported by
+Strategies supported by Goals, down to Solutions) where some Nodes are reused
+by a second parent, plus Context Nodes attached to Goals.
+
+Run from the app directory:
+
+    python -m benchmarks.synthetic /tmp/model.db --nodes 10000
+"""
+
+# Import Libraries
+import argparse
+import os
+import random
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List
+
+from sqlalchemy import insert
+
+from models.model import (
+    Edge,
+    EdgePropertyDefinition,
+    EdgePropertyValue,
+    EdgeType,
+    EdgeTypePropertyAssignment,
+    Model,
+    Node,
+    NodePropertyDefinition,
+    NodePropertyValue,
+    NodeType,
+    NodeTypePropertyAssignment,
+)
+
+# (identifier, name) of the Node and Edge Types in a generated Model
+NODE_TYPES = (('G', 'Goal'), ('S', 'Strategy'), ('Sn', 'Solution'), ('C', 'Context'))
+EDGE_TYPES = (('SB', 'Supported By'), ('IC', 'In Context Of'))
+
+# Property name -> candidate values (None for free text)
+NODE_PROPERTIES = {'description': None, 'status': ('Draft', 'Reviewed', 'Approved'), 'owner': None}
+EDGE_PROPERTIES = {'description': None}
+
+INSERT_BATCH = 5000
+
+
+@dataclass
+class SyntheticSpec:
+    """The shape of a generated Model"""
+
+    nodes: int = 1000
+    # Top-level Goals; by default one per 2000 Nodes
+    roots: int = 0
+    # Children per Node in the layered breakdown
+    branching: int = 4
+    # Share of Nodes that are also supported by a second parent (reuse)
+    reuse: float = 0.1
+    # Share of Nodes that are Context Nodes
+    context: float = 0.05
+    # Share of Property slots holding a value
+    fill: float = 0.7
+    seed: int = 42
+
+    def root_count(self) -> int:
+        return self.roots or max(1, self.nodes // 2000)
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _layer_sizes(spec: SyntheticSpec, count: int) -> List[int]:
+    """Breakdown layer sizes growing by the branching factor, the last taking the remainder"""
+    sizes = []
+    size = spec.root_count()
+    while count > 0:
+        size = min(size, count)
+        sizes.append(size)
+        count -= size
+        size *= spec.branching
+    return sizes
+
+
+def _layer_type(layer: int, layers: int) -> str:
+    if layer == layers - 1 and layers > 1:
+        return 'Sn'
+    return 'G' if layer % 2 == 0 else 'S'
+
+
+def generate_model_rows(spec: SyntheticSpec) -> Dict[str, List[Dict[str, Any]]]:
+    """The rows of every Table for a Model, keyed by Table name, deterministic for a seed"""
+    rng = random.Random(spec.seed)
+    rows: Dict[str, List[Dict[str, Any]]] = {}
+
+    node_types = {code: _uuid(rng) for code, _ in NODE_TYPES}
+    edge_types = {code: _uuid(rng) for code, _ in EDGE_TYPES}
+    rows['NodeType'] = [{'id': node_types[code], 'identifier': code, 'name': name} for code, name in NODE_TYPES]
+    rows['EdgeType'] = [{'id': edge_types[code], 'identifier': code, 'name': name} for code, name in EDGE_TYPES]
+
+    node_definitions = {name: _uuid(rng) for name in NODE_PROPERTIES}
+    edge_definitions = {name: _uuid(rng) for name in EDGE_PROPERTIES}
+    rows['NodePropertyDefinition'] = [
+        {'id': definition_id, 'name': name, 'value_type': 'text'} for name, definition_id in node_definitions.items()
+    ]
+    rows['EdgePropertyDefinition'] = [
+        {'id': definition_id, 'name': name, 'value_type': 'text'} for name, definition_id in edge_definitions.items()
+    ]
+    rows['NodeTypePropertyAssignment'] = [
+        {'id': _uuid(rng), 'node_type_id_fk': type_id, 'node_property_definition_id_fk': definition_id, 'sort_order': i}
+        for type_id in node_types.values()
+        for i, definition_id in enumerate(node_definitions.values())
+    ]
+    rows['EdgeTypePropertyAssignment'] = [
+        {'id': _uuid(rng), 'edge_type_id_fk': type_id, 'edge_property_definition_id_fk': definition_id, 'sort_order': i}
+        for type_id in edge_types.values()
+        for i, definition_id in enumerate(edge_definitions.values())
+    ]
+
+    nodes, edges = [], []
+
+    def add_node(code: str) -> str:
+        node_id = _uuid(rng)
+        index = len(nodes) + 1
+        name = dict(NODE_TYPES)[code]
+        nodes.append({
+            'id': node_id, 'node_type_id_fk': node_types[code],
+            'identifier': f"{code}{index}", 'name': f"{name} {index}",
+        })
+        return node_id
+
+    def add_edge(code: str, source: str, target: str) -> None:
+        index = len(edges) + 1
+        edges.append({
+            'id': _uuid(rng), 'edge_type_id_fk': edge_types[code], 'identifier': f"E{index}",
+            'name': f"E{index}", 'source_node_id_fk': source, 'target_node_id_fk': target,
+        })
+
+    # Layered breakdown; parents always come from the layer above, so the Graph stays acyclic
+    context_count = int(spec.nodes * spec.context)
+    sizes = _layer_sizes(spec, spec.nodes - context_count)
+    goals: List[str] = []
+    previous: List[str] = []
+    for layer, size in enumerate(sizes):
+        code = _layer_type(layer, len(sizes))
+        current = [add_node(code) for _ in range(size)]
+        if code == 'G':
+            goals.extend(current)
+        for position, node_id in enumerate(current):
+            if not previous:
+                continue
+            # Spread children evenly over the parents, then reuse some Nodes under a second parent
+            parent = previous[position * len(previous) // len(current)]
+            add_edge('SB', parent, node_id)
+            if len(previous) > 1 and rng.random() < spec.reuse:
+                other = rng.choice(previous)
+                if other != parent:
+                    add_edge('SB', other, node_id)
+        previous = current
+
+    for _ in range(context_count):
+        add_edge('IC', rng.choice(goals), add_node('C'))
+
+    rows['Node'] = nodes
+    rows['Edge'] = edges
+
+    rows['NodePropertyValue'] = [
+        {
+            'id': _uuid(rng), 'node_id_fk': node['id'], 'node_property_definition_id_fk': definition_id,
+            'value': rng.choice(choices) if choices else f"{name.title()} of {node['name']}",
+        }
+        for node in nodes
+        for (name, choices), definition_id in zip(NODE_PROPERTIES.items(), node_definitions.values())
+        if rng.random() < spec.fill
+    ]
+    rows['EdgePropertyValue'] = [
+        {
+            'id': _uuid(rng), 'edge_id_fk': edge['id'], 'edge_property_definition_id_fk': definition_id,
+            'value': f"Rationale for {edge['identifier']}",
+        }
+        for edge in edges
+        for definition_id in edge_definitions.values()
+        if rng.random() < spec.fill / 2
+    ]
+    return rows
+
+
+# Parents before children, so Foreign Keys resolve
+TABLES = (
+    NodeType, EdgeType, NodePropertyDefinition, EdgePropertyDefinition, NodeTypePropertyAssignment,
+    EdgeTypePropertyAssignment, Node, Edge, NodePropertyValue, EdgePropertyValue,
+)
+
+
+def create_synthetic_database(path: str, spec: SyntheticSpec) -> Dict[str, Any]:
+    """Write a new Database at path holding the Model described by spec"""
+    if os.path.exists(path):
+        os.remove(path)
+
+    start = time.perf_counter()
+    rows = generate_model_rows(spec)
+    model = Model(path)
+    session = model._get_session()
+    try:
+        for table in TABLES:
+            table_rows = rows[table.__tablename__]
+            for offset in range(0, len(table_rows), INSERT_BATCH):
+                session.execute(insert(table), table_rows[offset:offset + INSERT_BATCH])
+        session.commit()
+    finally:
+        session.close()
+        model.close()
+
+    return {
+        'spec': asdict(spec),
+        'path': path,
+        'rows': {name: len(table_rows) for name, table_rows in rows.items()},
+        'seconds': round(time.perf_counter() - start, 3),
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('path')
+    parser.add_argument('--nodes', type=int, default=SyntheticSpec.nodes)
+    parser.add_argument('--roots', type=int, default=SyntheticSpec.roots)
+    parser.add_argument('--branching', type=int, default=SyntheticSpec.branching)
+    parser.add_argument('--reuse', type=float, default=SyntheticSpec.reuse)
+    parser.add_argument('--context', type=float, default=SyntheticSpec.context)
+    parser.add_argument('--fill', type=float, default=SyntheticSpec.fill)
+    parser.add_argument('--seed', type=int, default=SyntheticSpec.seed)
+    args = parser.parse_args()
+    spec = SyntheticSpec(**{key: value for key, value in vars(args).items() if key != 'path'})
+    summary = create_synthetic_database(args.path, spec)
+    print(f"Wrote {summary['rows']['Node']} Nodes and {summary['rows']['Edge']} Edges "
+          f"to {args.path} in {summary['seconds']}s")
@@ -1063,14 +1063,14 @@ BEGIN
 END;
 
 CREATE TRIGGER update_node_modified_on
-AFTER UPDATE ON Node
+AFTER UPDATE OF id, node_type_id_fk, node_identifier, node_name, created_by, created_on, modified_by, modified_on ON Node
 WHEN NEW.modified_on = OLD.modified_on
 BEGIN
     UPDATE Node SET modified_on = datetime('now') WHERE id = NEW.id;
 END;
 
 CREATE TRIGGER update_edge_modified_on
-AFTER UPDATE ON Edge
+AFTER UPDATE OF id, edge_type_id_fk, edge_identifier, edge_name, source_node_id_fk, target_node_id_fk, created_by, created_on, modified_by, modified_on ON Edge
 WHEN NEW.modified_on = OLD.modified_on
 BEGIN
     UPDATE Edge SET modified_on = datetime('now') WHERE id = NEW.id;
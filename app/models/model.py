@@ -14,7 +14,10 @@
 
 # Imports
 import os
+import json
 import logging
+import math
+import threading
 import uuid
 from pathlib import Path
 from sqlalchemy import (
@@ -26,28 +29,35 @@ from sqlalchemy import (
     ForeignKey,
     DateTime,
     Boolean,
+    Float,
     Index,
+    LargeBinary,
     UniqueConstraint,
     CheckConstraint,
     text,
+    cast,
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship, object_session
 from sqlalchemy.sql import func
-from typing import Optional, List, Dict, Any, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 from datetime import datetime
 
 # Dash-specific Logging
 logger = logging.getLogger("TracerApp")
 
 try:
-    from pkg.config import DATABASE_CONFIG
+    from pkg.config import CYCLE_CONFIG, DATABASE_CONFIG, GRAPH_CHANGE_CONFIG
 
     DEFAULT_DB_PATH = DATABASE_CONFIG["database"]
 except ImportError:
     DEFAULT_DB_PATH = "db.sqlite"
+    CYCLE_CONFIG = {"default_policy": "flag", "edge_type_policies": {}}
+    GRAPH_CHANGE_CONFIG = {"retained_changes": 100000, "compaction_interval": 1000, "page_size": 5000}
     logger.warning("Could not import DATABASE_CONFIG, using default Database Path")
 
+from utils.cycle_detection import CycleGuard
+
 Base = declarative_base()
 
 # ==================== SQLAlchemy Models ====================
@@ -302,6 +312,8 @@ class Node(Base):
     )
     identifier = Column("node_identifier", String, nullable=True, unique=True)
     name = Column("node_name", String, nullable=False, default="Default")
+    # Integer surrogate key for internal joins, assigned by SURROGATE_KEY_TRIGGERS
+    node_key = Column("node_key", Integer, nullable=True)
     created_by = Column("created_by", String, nullable=True)
     created_on = Column(
         "created_on", String, server_default=text("(datetime('now'))"), nullable=True
@@ -314,6 +326,7 @@ class Node(Base):
     __table_args__ = (
         Index("idx_node_type", "node_type_id_fk"),
         Index("idx_node_name", "node_name"),
+        Index("idx_node_key", "node_key", unique=True),
         UniqueConstraint("node_type_id_fk", "node_name", name="uq_node_type_name"),
     )
 
@@ -478,6 +491,9 @@ class Edge(Base):
     target_node_id_fk = Column(
         String, ForeignKey("Node.id", ondelete="CASCADE"), nullable=False
     )
+    # Integer surrogates of the Node FKs, kept by SURROGATE_KEY_TRIGGERS
+    source_node_key = Column("source_node_key", Integer, nullable=True)
+    target_node_key = Column("target_node_key", Integer, nullable=True)
     created_by = Column("created_by", String, nullable=True)
     created_on = Column(
         "created_on", String, server_default=text("(datetime('now'))"), nullable=True
@@ -492,6 +508,8 @@ class Edge(Base):
         Index("idx_edge_target", "target_node_id_fk"),
         Index("idx_edge_type", "edge_type_id_fk"),
         Index("idx_edge_source_target", "source_node_id_fk", "target_node_id_fk"),
+        Index("idx_edge_source_key", "source_node_key"),
+        Index("idx_edge_target_key", "target_node_key"),
         UniqueConstraint(
             "edge_type_id_fk",
             "source_node_id_fk",
@@ -692,6 +710,339 @@ class Edge(Base):
         }
 
 
+class GraphChange(Base):
+    __tablename__ = "GraphChange"
+
+    # The highest id is the current Graph Version
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    entity = Column("entity", String, nullable=False)
+    entity_id = Column("entity_id", String, nullable=False)
+    operation = Column("operation", String, nullable=False)
+    changed_on = Column(
+        "changed_on", String, server_default=text("(datetime('now'))"), nullable=True
+    )
+
+    __table_args__ = (Index("idx_graph_change_entity", "entity", "entity_id"),)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "Version": self.id,
+            "Entity": self.entity,
+            "Entity ID": self.entity_id,
+            "Operation": self.operation,
+            "Changed On": self.changed_on,
+        }
+
+
+class MetricResult(Base):
+    __tablename__ = "MetricResult"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    graph_version = Column("graph_version", Integer, nullable=False)
+    family = Column("metric_family", String, nullable=False)
+    payload = Column("metric_payload", Text, nullable=False)
+    duration = Column("duration_seconds", Float, nullable=True)
+    computed_on = Column(
+        "computed_on", String, server_default=text("(datetime('now'))"), nullable=True
+    )
+
+    __table_args__ = (
+        UniqueConstraint(
+            "graph_version", "metric_family", name="uq_metric_result_version_family"
+        ),
+        Index("idx_metric_result_family", "metric_family", "graph_version"),
+    )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "family": self.family,
+            "graph_version": self.graph_version,
+            "metrics": json.loads(str(self.payload)),
+            "duration_seconds": self.duration,
+            "computed_on": self.computed_on,
+        }
+
+
+
+class MetricRun(Base):
+    __tablename__ = "MetricRun"
+
+    # Append-only: one Run per computation of a Graph Version's Metrics
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    graph_version = Column("graph_version", Integer, nullable=False)
+    recorded_on = Column(
+        "recorded_on", String, server_default=text("(datetime('now'))"), nullable=False
+    )
+
+    __table_args__ = (Index("idx_metric_run_recorded_on", "recorded_on"),)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "run_id": self.id,
+            "graph_version": self.graph_version,
+            "recorded_on": self.recorded_on,
+        }
+
+
+class MetricKey(Base):
+    __tablename__ = "MetricKey"
+
+    # Interned (Family, Metric) names so each MetricValue row is three numbers
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    family = Column("metric_family", String, nullable=False)
+    name = Column("metric_name", String, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("metric_family", "metric_name", name="uq_metric_key_family_name"),
+    )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"key_id": self.id, "family": self.family, "name": self.name}
+
+
+class MetricValue(Base):
+    __tablename__ = "MetricValue"
+
+    key_id = Column(
+        "metric_key_id_fk", Integer, ForeignKey("MetricKey.id"), primary_key=True
+    )
+    run_id = Column(
+        "metric_run_id_fk", Integer, ForeignKey("MetricRun.id"), primary_key=True
+    )
+    value = Column("metric_value", Float, nullable=False)
+
+    # Clustered on (Key, Run) so a Metric's history is a single range scan
+    __table_args__ = ({"sqlite_with_rowid": False},)
+
+
+class SnapshotContent(Base):
+    __tablename__ = "SnapshotContent"
+
+    # Content-addressed: the id is the SHA-256 of the Graph records it holds, and
+    # the payload is either complete or a delta against its base
+    id = Column(String, primary_key=True)
+    base_id = Column(
+        "base_content_id_fk", String, ForeignKey("SnapshotContent.id"), nullable=True
+    )
+    depth = Column("delta_depth", Integer, nullable=False, default=0)
+    payload = Column("content_payload", LargeBinary, nullable=False)
+    node_count = Column("node_count", Integer, nullable=False)
+    edge_count = Column("edge_count", Integer, nullable=False)
+    created_on = Column(
+        "created_on", String, server_default=text("(datetime('now'))"), nullable=True
+    )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "content_id": self.id,
+            "base_id": self.base_id,
+            "depth": self.depth,
+            "payload": self.payload,
+        }
+
+
+class GraphSnapshot(Base):
+    __tablename__ = "GraphSnapshot"
+
+    # A labelled Graph Version; Snapshots of identical Graphs share their content
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    label = Column("snapshot_label", String, nullable=False)
+    graph_version = Column("graph_version", Integer, nullable=False)
+    content_id = Column(
+        "snapshot_content_id_fk", String, ForeignKey("SnapshotContent.id"), nullable=False
+    )
+    created_by = Column("created_by", String, nullable=True)
+    created_on = Column(
+        "created_on", String, server_default=text("(datetime('now'))"), nullable=True
+    )
+
+    content = relationship("SnapshotContent")
+
+    __table_args__ = (Index("idx_graph_snapshot_version", "graph_version"),)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "label": self.label,
+            "graph_version": self.graph_version,
+            "content_id": self.content_id,
+            "nodes": self.content.node_count if self.content else None,
+            "edges": self.content.edge_count if self.content else None,
+            "created_on": self.created_on,
+        }
+
+
+# ==================== Graph Change Triggers ====================
+
+# Table -> (logged Entity, Entity ID column, Columns that change the Graph on UPDATE)
+GRAPH_CHANGE_SOURCES = {
+    "NodeType": ("NodeType", "id", ["node_type_identifier", "node_type_name"]),
+    "EdgeType": ("EdgeType", "id", ["edge_type_identifier", "edge_type_name"]),
+    "Node": ("Node", "id", ["node_type_id_fk", "node_identifier", "node_name"]),
+    "Edge": (
+        "Edge",
+        "id",
+        [
+            "edge_type_id_fk",
+            "edge_identifier",
+            "edge_name",
+            "source_node_id_fk",
+            "target_node_id_fk",
+        ],
+    ),
+    "NodePropertyValue": (
+        "Node",
+        "node_id_fk",
+        ["node_id_fk", "node_property_definition_id_fk", "node_property_value"],
+    ),
+    "EdgePropertyValue": (
+        "Edge",
+        "edge_id_fk",
+        ["edge_id_fk", "edge_property_definition_id_fk", "edge_property_value"],
+    ),
+}
+
+
+def _graph_change_trigger_statements() -> List[str]:
+    """CREATE TRIGGER statements that append to GraphChange on every Graph write"""
+    statements = []
+    for table, (entity, id_column, watched) in GRAPH_CHANGE_SOURCES.items():
+        # Property Values are logged as an UPDATE of the owning Node / Edge
+        is_property = table != entity
+        for operation in ("INSERT", "UPDATE", "DELETE"):
+            row = "OLD" if operation == "DELETE" else "NEW"
+            logged_operation = "UPDATE" if is_property else operation
+            when = ""
+            if operation == "UPDATE":
+                changed = " OR ".join(f"NEW.{c} IS NOT OLD.{c}" for c in watched)
+                when = f"WHEN {changed}\n"
+            statements.append(
+                f"CREATE TRIGGER IF NOT EXISTS log_graph_change_{table.lower()}_{operation.lower()}\n"
+                f"AFTER {operation} ON {table}\n"
+                f"{when}"
+                "BEGIN\n"
+                "    INSERT INTO GraphChange (entity, entity_id, operation)\n"
+                f"    VALUES ('{entity}', {row}.{id_column}, '{logged_operation}');\n"
+                "END;"
+            )
+    return statements
+
+
+def _graph_change_compaction_statement() -> str:
+    """CREATE TRIGGER statement for the trigger that trims GraphChange to its newest
+    retained_changes entries; the newest entry, the Graph Version, is always kept"""
+    retained = max(1, GRAPH_CHANGE_CONFIG["retained_changes"])
+    interval = max(1, GRAPH_CHANGE_CONFIG["compaction_interval"])
+    return (
+        "CREATE TRIGGER compact_graph_change\n"
+        "AFTER INSERT ON GraphChange\n"
+        f"WHEN NEW.id % {interval} = 0\n"
+        "BEGIN\n"
+        f"    DELETE FROM GraphChange WHERE id <= NEW.id - {retained};\n"
+        "END;"
+    )
+
+
+# Metric History is append-only; old Runs may be deleted but never rewritten
+METRIC_HISTORY_TRIGGERS = [
+    f"CREATE TRIGGER IF NOT EXISTS {table.lower()}_append_only\n"
+    f"BEFORE UPDATE ON {table}\n"
+    "BEGIN\n"
+    f"    SELECT RAISE(ABORT, '{table} is append-only');\n"
+    "END;"
+    for table in ("MetricRun", "MetricValue")
+]
+
+
+# Integer surrogate keys: each Node gets a key one above the largest in use, and
+# each Edge stores the keys of its Nodes, so the Graph is read and joined on ints.
+# The keys are stored rather than taken from rowid, which SQLite may renumber when
+# it vacuums a table without an INTEGER PRIMARY KEY.
+SURROGATE_KEY_COLUMNS = {
+    "Node": ["node_key"],
+    "Edge": ["source_node_key", "target_node_key"],
+}
+
+SURROGATE_KEY_INDEXES = [
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_node_key ON Node (node_key)",
+    "CREATE INDEX IF NOT EXISTS idx_edge_source_key ON Edge (source_node_key)",
+    "CREATE INDEX IF NOT EXISTS idx_edge_target_key ON Edge (target_node_key)",
+]
+
+_NODE_KEY = "(SELECT node_key FROM Node WHERE Node.id = {})"
+
+SURROGATE_KEY_TRIGGERS = [
+    # Edges written before their Nodes (an import in any order) pick up the keys here
+    "CREATE TRIGGER IF NOT EXISTS assign_node_key\n"
+    "AFTER INSERT ON Node\n"
+    "WHEN NEW.node_key IS NULL\n"
+    "BEGIN\n"
+    "    UPDATE Node SET node_key = (SELECT COALESCE(MAX(node_key), 0) + 1 FROM Node) WHERE rowid = NEW.rowid;\n"
+    f"    UPDATE Edge SET source_node_key = {_NODE_KEY.format('NEW.id')} WHERE source_node_id_fk = NEW.id;\n"
+    f"    UPDATE Edge SET target_node_key = {_NODE_KEY.format('NEW.id')} WHERE target_node_id_fk = NEW.id;\n"
+    "END;",
+] + [
+    f"CREATE TRIGGER IF NOT EXISTS {name}_edge_node_keys\n"
+    f"AFTER {operation} ON Edge\n"
+    "BEGIN\n"
+    "    UPDATE Edge SET\n"
+    f"        source_node_key = {_NODE_KEY.format('NEW.source_node_id_fk')},\n"
+    f"        target_node_key = {_NODE_KEY.format('NEW.target_node_id_fk')}\n"
+    "    WHERE rowid = NEW.rowid;\n"
+    "END;"
+    for name, operation in (
+        ("assign", "INSERT"),
+        ("update", "UPDATE OF source_node_id_fk, target_node_id_fk"),
+    )
+]
+
+# Keys for rows written before the columns existed, as (table, assignment, rows to fill);
+# each UPDATE runs only when a row needs it, so an up-to-date Database is only read
+SURROGATE_KEY_BACKFILL = [
+    ("Node", "node_key = (SELECT COALESCE(MAX(node_key), 0) FROM Node) + rowid", "node_key IS NULL"),
+] + [
+    (
+        "Edge",
+        f"{end}_node_key = {_NODE_KEY.format(f'Edge.{end}_node_id_fk')}",
+        # Edges whose Node is missing keep a NULL key until the Node is written
+        f"{end}_node_key IS NULL AND {end}_node_id_fk IN (SELECT id FROM Node)",
+    )
+    for end in ("source", "target")
+]
+
+# The schema's modified_on triggers fire on any UPDATE; these replace them for Node
+# and Edge so that writing a key leaves modified_on as it was
+MODIFIED_ON_TRIGGERS = {
+    f"update_{table.lower()}_modified_on": (
+        f"CREATE TRIGGER update_{table.lower()}_modified_on\n"
+        f"AFTER UPDATE OF {', '.join(columns)} ON {table}\n"
+        "WHEN NEW.modified_on = OLD.modified_on\n"
+        "BEGIN\n"
+        f"    UPDATE {table} SET modified_on = datetime('now') WHERE id = NEW.id;\n"
+        "END;"
+    )
+    for table, columns in (
+        ("Node", ["id", "node_type_id_fk", "node_identifier", "node_name",
+                  "created_by", "created_on", "modified_by", "modified_on"]),
+        ("Edge", ["id", "edge_type_id_fk", "edge_identifier", "edge_name", "source_node_id_fk",
+                  "target_node_id_fk", "created_by", "created_on", "modified_by", "modified_on"]),
+    )
+}
+
+
+# Databases whose keys and triggers this process has brought up to date, so that
+# constructing a Model does not write to (or wait on a lock of) the Database again
+_migrated_databases: set = set()
+_migrated_databases_lock = threading.Lock()
+
+# Cycle Guards are shared by every Model of a Database in this process
+_cycle_guards: Dict[str, CycleGuard] = {}
+_cycle_guards_lock = threading.Lock()
+
+# Beyond this many logged changes the Cycle Guard is rebuilt rather than patched
+CYCLE_GUARD_MAX_CHANGES = 5000
+
+
 # ==================== Main Model Class ====================
 
 
@@ -709,6 +1060,7 @@ class Model:
                 autocommit=False, autoflush=False, bind=self.engine
             )
             Base.metadata.create_all(bind=self.engine)
+            self._migrate_database()
             logger.info("Database initialized successfully")
         except Exception as e:
             logger.error(f"Database initialization error: {e}")
@@ -717,6 +1069,53 @@ class Model:
     def _ensure_default_data(self):
         pass
 
+    def _migrate_database(self):
+        """Bring the keys and triggers up to date, once per Database per process"""
+        with _migrated_databases_lock:
+            if self.db_path in _migrated_databases:
+                return
+            self._ensure_surrogate_keys()
+            self._ensure_graph_change_triggers()
+            # Every in-memory Database is a new one
+            if self.db_path != ":memory:":
+                _migrated_databases.add(self.db_path)
+
+    def _ensure_surrogate_keys(self):
+        """Add the integer key columns to a Database created before them, then fill any gaps"""
+        with self.engine.begin() as connection:
+            for table, columns in SURROGATE_KEY_COLUMNS.items():
+                existing = {row[1] for row in connection.execute(text(f"PRAGMA table_info({table})"))}
+                for column in columns:
+                    if column not in existing:
+                        connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} INTEGER"))
+            for name, statement in MODIFIED_ON_TRIGGERS.items():
+                existing = connection.execute(
+                    text("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = :name"),
+                    {"name": name},
+                ).scalar()
+                if existing is not None and "UPDATE OF" not in existing:
+                    connection.execute(text(f"DROP TRIGGER {name}"))
+                    connection.execute(text(statement))
+            for statement in SURROGATE_KEY_INDEXES + SURROGATE_KEY_TRIGGERS:
+                connection.execute(text(statement))
+            for table, assignment, condition in SURROGATE_KEY_BACKFILL:
+                if connection.execute(text(f"SELECT 1 FROM {table} WHERE {condition} LIMIT 1")).first():
+                    connection.execute(text(f"UPDATE {table} SET {assignment} WHERE {condition}"))
+
+    def _ensure_graph_change_triggers(self):
+        with self.engine.begin() as connection:
+            for statement in _graph_change_trigger_statements() + METRIC_HISTORY_TRIGGERS:
+                connection.execute(text(statement))
+            # Recreated only when the retention settings changed; SQLite keeps the text
+            # without the closing semicolon
+            compaction = _graph_change_compaction_statement()
+            existing = connection.execute(
+                text("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'compact_graph_change'")
+            ).scalar()
+            if existing != compaction.rstrip(";"):
+                connection.execute(text("DROP TRIGGER IF EXISTS compact_graph_change"))
+                connection.execute(text(compaction))
+
     def _get_session(self):
         return self.SessionLocal()
 
@@ -804,8 +1203,13 @@ class Model:
 
         definition_ids = list(preferred_definition_by_type.values())
 
+        # Plain rows, since an ORM object per value costs more than the query
         property_values = (
-            session.query(NodePropertyValue)
+            session.query(
+                NodePropertyValue.node_id_fk,
+                NodePropertyValue.node_property_definition_id_fk,
+                NodePropertyValue.value,
+            )
             .filter(
                 NodePropertyValue.node_id_fk.in_(node_ids),
                 NodePropertyValue.node_property_definition_id_fk.in_(definition_ids),
@@ -814,14 +1218,9 @@ class Model:
         )
 
         value_by_node_and_definition: Dict[tuple[str, str], Optional[str]] = {}
-        for property_value in property_values:
-            key = (
-                str(property_value.node_id_fk),
-                str(property_value.node_property_definition_id_fk),
-            )
-            resolved_value = (
-                str(property_value.value) if property_value.value is not None else None
-            )
+        for node_id, definition_id, value in property_values:
+            key = (str(node_id), str(definition_id))
+            resolved_value = str(value) if value is not None else None
             value_by_node_and_definition[key] = resolved_value
 
         for node in nodes:
@@ -880,8 +1279,13 @@ class Model:
 
         definition_ids = list(preferred_definition_by_type.values())
 
+        # Plain rows, since an ORM object per value costs more than the query
         property_values = (
-            session.query(EdgePropertyValue)
+            session.query(
+                EdgePropertyValue.edge_id_fk,
+                EdgePropertyValue.edge_property_definition_id_fk,
+                EdgePropertyValue.value,
+            )
             .filter(
                 EdgePropertyValue.edge_id_fk.in_(edge_ids),
                 EdgePropertyValue.edge_property_definition_id_fk.in_(definition_ids),
@@ -890,14 +1294,9 @@ class Model:
         )
 
         value_by_edge_and_definition: Dict[tuple[str, str], Optional[str]] = {}
-        for property_value in property_values:
-            key = (
-                str(property_value.edge_id_fk),
-                str(property_value.edge_property_definition_id_fk),
-            )
-            resolved_value = (
-                str(property_value.value) if property_value.value is not None else None
-            )
+        for edge_id, definition_id, value in property_values:
+            key = (str(edge_id), str(definition_id))
+            resolved_value = str(value) if value is not None else None
             value_by_edge_and_definition[key] = resolved_value
 
         for edge in edges:
@@ -911,6 +1310,172 @@ class Model:
                 (str(edge.id), definition_id)
             )
 
+    @staticmethod
+    def _preferred_description_definitions(session, type_column, definition_column, definition) -> Dict[str, str]:
+        """Type id -> the Property Definition its descriptions are read from
+        ("content" before "description", as the hydrate methods choose)"""
+        rows = (
+            session.query(type_column, definition.id)
+            .join(definition, definition_column == definition.id)
+            .filter(definition.name.in_(["content", "description"]))
+            .order_by(type_column.asc(), definition.name.asc())
+            .all()
+        )
+        preferred: Dict[str, str] = {}
+        for type_id, definition_id in rows:
+            preferred.setdefault(str(type_id), str(definition_id))
+        return preferred
+
+    def get_graph_rows(self) -> Dict[str, Any]:
+        """Get every Node and Edge for building the Graph as plain rows, with each
+        Edge naming its Nodes by their integer node_key.
+
+        Nodes are (node key, id, node type id, identifier, name, description) and
+        Edges are (id, source node key, target node key, edge type id, identifier,
+        description), and graph_version is the Graph Version they belong to. No row is loaded as an ORM object and no query joins on a
+        UUID: Edges carry their Nodes' keys, and descriptions are matched to their
+        rows by id in Python. Every query runs in one read transaction, so the
+        Edges and Nodes come from the same version of the Database. An Edge may
+        still name a key with no Node, if its Node was never written; callers
+        skip it.
+        """
+        session = self._get_session()
+        try:
+            # pysqlite only begins a transaction before a write, so begin the read one here
+            session.connection().exec_driver_sql("BEGIN")
+
+            graph_version = int(session.query(func.max(GraphChange.id)).scalar() or 0)
+
+            node_rows = (
+                session.query(Node.node_key, Node.id, Node.node_type_id_fk, Node.identifier, Node.name)
+                .order_by(Node.node_key)
+                .all()
+            )
+            edge_rows = session.query(
+                Edge.id,
+                Edge.source_node_key,
+                Edge.target_node_key,
+                Edge.edge_type_id_fk,
+                Edge.identifier,
+            ).all()
+
+            node_descriptions = self._graph_row_descriptions(
+                session,
+                {row[1]: row[2] for row in node_rows},
+                NodePropertyValue.node_id_fk,
+                NodePropertyValue.node_property_definition_id_fk,
+                NodePropertyValue.value,
+                NodeTypePropertyAssignment.node_type_id_fk,
+                NodeTypePropertyAssignment.node_property_definition_id_fk,
+                NodePropertyDefinition,
+            )
+            edge_descriptions = self._graph_row_descriptions(
+                session,
+                {row[0]: row[3] for row in edge_rows},
+                EdgePropertyValue.edge_id_fk,
+                EdgePropertyValue.edge_property_definition_id_fk,
+                EdgePropertyValue.value,
+                EdgeTypePropertyAssignment.edge_type_id_fk,
+                EdgeTypePropertyAssignment.edge_property_definition_id_fk,
+                EdgePropertyDefinition,
+            )
+
+            nodes = [
+                (key, node_id, type_id, identifier, name, node_descriptions.get(node_id))
+                for key, node_id, type_id, identifier, name in node_rows
+            ]
+            edges = [
+                (edge_id, source_key, target_key, type_id, identifier, edge_descriptions.get(edge_id))
+                for edge_id, source_key, target_key, type_id, identifier in edge_rows
+            ]
+            return {"nodes": nodes, "edges": edges, "graph_version": graph_version}
+        finally:
+            # Ends the read transaction
+            session.close()
+
+    def _graph_row_descriptions(self, session, types_by_id, value_owner, value_definition, value,
+                                assignment_type, assignment_definition, definition_model) -> Dict[str, Optional[str]]:
+        """Description values by row id, for the rows whose type prefers that definition"""
+        definitions = self._preferred_description_definitions(
+            session, assignment_type, assignment_definition, definition_model
+        )
+        descriptions: Dict[str, Optional[str]] = {}
+        for owner_id, definition_id, description in (
+            session.query(value_owner, value_definition, value)
+            .filter(value_definition.in_(set(definitions.values())))
+        ):
+            if definitions.get(types_by_id.get(owner_id)) == definition_id:
+                descriptions[owner_id] = str(description) if description is not None else None
+        return descriptions
+
+    # ==================== Cycle Detection ====================
+
+    def _get_cycle_guard(self) -> CycleGuard:
+        with _cycle_guards_lock:
+            guard = _cycle_guards.get(self.db_path)
+            if guard is None:
+                guard = CycleGuard(
+                    CYCLE_CONFIG["default_policy"], CYCLE_CONFIG["edge_type_policies"]
+                )
+                _cycle_guards[self.db_path] = guard
+            return guard
+
+    def _sync_cycle_guard(self, guard: CycleGuard, session) -> None:
+        """Bring a Cycle Guard up to date with the GraphChange log.
+
+        Only the Edges changed since the Guard's Version are re-read; a change
+        to any Edge Type (whose name may select a different policy), a long
+        log or one compacted past the Guard's Version rebuilds it. Callers
+        hold guard.lock.
+        """
+        version = int(session.query(func.max(GraphChange.id)).scalar() or 0)
+        if guard.graph_version == version:
+            return
+
+        changes = None
+        if (
+            guard.graph_version is not None
+            and self._graph_change_horizon(session) <= guard.graph_version < version
+        ):
+            changes = (
+                session.query(GraphChange.entity, GraphChange.entity_id)
+                .filter(GraphChange.id > guard.graph_version)
+                .limit(CYCLE_GUARD_MAX_CHANGES + 1)
+                .all()
+            )
+            if len(changes) > CYCLE_GUARD_MAX_CHANGES or any(
+                entity == "EdgeType" for entity, _ in changes
+            ):
+                changes = None
+
+        edge_columns = (
+            Edge.id,
+            Edge.source_node_id_fk,
+            Edge.target_node_id_fk,
+            Edge.edge_type_id_fk,
+        )
+        if changes is None:
+            guard.rebuild(
+                session.query(*edge_columns).all(),
+                dict(session.query(EdgeType.id, EdgeType.name).all()),
+                version,
+            )
+            return
+
+        edge_ids = list({entity_id for entity, entity_id in changes if entity == "Edge"})
+        rows = (
+            session.query(*edge_columns).filter(Edge.id.in_(edge_ids)).all()
+            if edge_ids
+            else []
+        )
+        guard.apply(edge_ids, rows, version)
+
+    def _describe_cycle(self, session, cycle: List[str]) -> str:
+        names = dict(
+            session.query(Node.id, Node.name).filter(Node.id.in_(set(cycle))).all()
+        )
+        return " → ".join(str(names.get(node_id, node_id)) for node_id in cycle)
+
     # ==================== CREATE EDGE, NODE & EDGE_TYPE OPERATIONS ====================
 
     # Create Edge Function
@@ -978,26 +1543,49 @@ class Model:
                     "data": None,
                 }
 
-            new_edge = Edge(
-                id=edge_id,
-                identifier=identifier,
-                name=identifier or "Default",
-                source_node_id_fk=source_node_id,
-                edge_type_id_fk=edge_type_id,
-                target_node_id_fk=target_node_id,
-            )
+            guard = self._get_cycle_guard()
+            with guard.lock:
+                self._sync_cycle_guard(guard, session)
+                policy, cycle = guard.check(
+                    edge_id, source_node_id, target_node_id, edge_type_id
+                )
+                if cycle is not None and policy == "reject":
+                    return {
+                        "success": False,
+                        "message": f"Edge Type '{edge_type.name}' does not allow cycles: {self._describe_cycle(session, cycle)}",
+                        "data": None,
+                    }
 
-            session.add(new_edge)
-            session.flush()
+                try:
+                    new_edge = Edge(
+                        id=edge_id,
+                        identifier=identifier,
+                        name=identifier or "Default",
+                        source_node_id_fk=source_node_id,
+                        edge_type_id_fk=edge_type_id,
+                        target_node_id_fk=target_node_id,
+                    )
 
-            if description is not None:
-                new_edge.description = description
+                    session.add(new_edge)
+                    session.flush()
 
-            session.commit()
+                    if description is not None:
+                        new_edge.description = description
+
+                    session.commit()
+                except Exception:
+                    # The Guard already holds the Edge, so rebuild it on the next write
+                    guard.graph_version = None
+                    raise
+
+            message = "Successfully created Edge"
+            if cycle is not None:
+                message += f" (closes a cycle: {self._describe_cycle(session, cycle)})"
+                logger.warning(f"Edge '{edge_id}' closes a cycle")
 
             return {
                 "success": True,
-                "message": "Successfully created Edge",
+                "message": message,
                 "data": new_edge.to_dict(),
             }
 
@@ -1175,23 +1763,33 @@ class Model:
 
     # ==================== Data Formatting Methods ====================
 
+    @staticmethod
+    def _node_editor_row(node: Node) -> Dict[str, Any]:
+        return {
+            "ID": str(node.id),
+            "Identifier": node.identifier or "",
+            "Name": node.name,
+            "Description": node.description,
+        }
+
+    @staticmethod
+    def _edge_editor_row(edge: Edge) -> Dict[str, Any]:
+        return {
+            "ID": str(edge.id),
+            "Identifier": edge.identifier,
+            "Source": str(edge.source_node_id_fk),
+            "Target": str(edge.target_node_id_fk),
+            "Edge Type": str(edge.edge_type_id_fk),
+            "Description": edge.description,
+        }
+
     def get_nodes_for_editor(self) -> List[Dict[str, Any]]:
         """Get Nodes for the Editor"""
         session = self._get_session()
         try:
             nodes = session.query(Node).all()
             self._hydrate_node_description_cache(session, nodes)
-            result = []
-            for node in nodes:
-                result.append(
-                    {
-                        "ID": str(node.id),
-                        "Identifier": node.identifier or "",
-                        "Name": node.name,
-                        "Description": node.description,
-                    }
-                )
-            return result
+            return [self._node_editor_row(node) for node in nodes]
         finally:
             session.close()
 
@@ -1201,19 +1799,57 @@ class Model:
         try:
             edges = session.query(Edge).all()
             self._hydrate_edge_description_cache(session, edges)
-            result = []
-            for edge in edges:
-                result.append(
-                    {
-                        "ID": str(edge.id),
-                        "Identifier": edge.identifier,
-                        "Source": str(edge.source_node.id),
-                        "Target": str(edge.target_node.id),
-                        "Edge Type": str(edge.edge_type.id),
-                        "Description": edge.description,
-                    }
-                )
-            return result
+            return [self._edge_editor_row(edge) for edge in edges]
+        finally:
+            session.close()
+
+    def _iter_keyset(self, entity, hydrate, to_row, chunk_size: int,
+                     first_chunk_size: Optional[int], after: Optional[str]) -> Iterator[List[Dict[str, Any]]]:
+        """Rows in ID order, one short read per chunk, each starting after the last ID sent.
+        A cursor held open with fetchmany would keep SQLite's shared lock, and so block
+        every edit, until the slowest Browser had read the last chunk"""
+        limit = first_chunk_size or chunk_size
+        while True:
+            session = self._get_session()
+            try:
+                query = session.query(entity).order_by(entity.id)
+                if after is not None:
+                    query = query.filter(entity.id > after)
+                items = query.limit(limit).all()
+                hydrate(session, items)
+                rows = [to_row(item) for item in items]
+            finally:
+                session.close()
+
+            if rows:
+                yield rows
+            if len(rows) < limit:
+                return
+            after = rows[-1]["ID"]
+            limit = chunk_size
+
+    def iter_nodes_for_editor(self, chunk_size: int, first_chunk_size: Optional[int] = None,
+                              after: Optional[str] = None) -> Iterator[List[Dict[str, Any]]]:
+        """Get Nodes for the Editor in chunks, in ID order after the given Node ID"""
+        return self._iter_keyset(Node, self._hydrate_node_description_cache, self._node_editor_row,
+                                 chunk_size, first_chunk_size, after)
+
+    def iter_edges_for_editor(self, chunk_size: int, first_chunk_size: Optional[int] = None,
+                              after: Optional[str] = None) -> Iterator[List[Dict[str, Any]]]:
+        """Get Edges for the Editor in chunks, in ID order after the given Edge ID"""
+        return self._iter_keyset(Edge, self._hydrate_edge_description_cache, self._edge_editor_row,
+                                 chunk_size, first_chunk_size, after)
+
+    def get_node_labels(self, node_ids: List[str]) -> Dict[str, Tuple[Optional[str], str]]:
+        """Get the Identifier and Name of each of the given Nodes"""
+        session = self._get_session()
+        try:
+            rows = (
+                session.query(Node.id, Node.identifier, Node.name)
+                .filter(Node.id.in_(node_ids))
+                .all()
+            )
+            return {str(node_id): (identifier, name) for node_id, identifier, name in rows}
         finally:
             session.close()
 
@@ -1290,6 +1926,11 @@ class Model:
                     "message": f"Unable to find Edge with ID '{edge_id}'.",
                     "data": None,
                 }
+            previous = (
+                edge.source_node_id_fk,
+                edge.target_node_id_fk,
+                edge.edge_type_id_fk,
+            )
 
             if source_node_id is not None:
                 source_node = (
@@ -1334,10 +1975,38 @@ class Model:
             if description is not None:
                 edge.description = description  # type: ignore
 
-            session.commit()
+            guard = self._get_cycle_guard()
+            with guard.lock:
+                self._sync_cycle_guard(guard, session)
+                policy, cycle = None, None
+                current = (
+                    edge.source_node_id_fk,
+                    edge.target_node_id_fk,
+                    edge.edge_type_id_fk,
+                )
+                if current != previous:
+                    policy, cycle = guard.check(edge_id, *current, previous=previous)
+                if cycle is not None and policy == "reject":
+                    type_name = guard.type_names.get(current[2], current[2])
+                    return {
+                        "success": False,
+                        "message": f"Edge Type '{type_name}' does not allow cycles: {self._describe_cycle(session, cycle)}",
+                        "data": None,
+                    }
+
+                try:
+                    session.commit()
+                except Exception:
+                    guard.graph_version = None
+                    raise
+
+            message = "Successfully updated Edge"
+            if cycle is not None:
+                message += f" (closes a cycle: {self._describe_cycle(session, cycle)})"
+                logger.warning(f"Edge '{edge_id}' closes a cycle")
             return {
                 "success": True,
-                "message": "Successfully updated Edge",
+                "message": message,
                 "data": edge.to_dict(),
             }
         except Exception as e:
@@ -1586,7 +2255,11 @@ class Model:
     def batch_update_edges(self, updates: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Batch update multiple edges"""
         session = self.SessionLocal()
+        # Edge writes wait while the batch is checked for cycles and committed
+        guard = self._get_cycle_guard()
+        guard.lock.acquire()
         try:
+            self._sync_cycle_guard(guard, session)
             updated_count = 0
             errors = []
 
@@ -1636,6 +2309,29 @@ class Model:
                             )
                             valid_update = False
 
+                    if valid_update:
+                        previous = (
+                            edge.source_node_id_fk,
+                            edge.target_node_id_fk,
+                            edge.edge_type_id_fk,
+                        )
+                        current = (
+                            update.get("source_node_id", previous[0]),
+                            update.get("target_node_id", previous[1]),
+                            update.get("edge_type_id", previous[2]),
+                        )
+                        if current != previous:
+                            policy, cycle = guard.check(
+                                edge_id, *current, previous=previous
+                            )
+                            if cycle is not None and policy == "reject":
+                                errors.append(
+                                    f"Edge '{edge_id}' would create a cycle: {self._describe_cycle(session, cycle)}"
+                                )
+                                valid_update = False
+                            elif cycle is not None:
+                                logger.warning(f"Edge '{edge_id}' closes a cycle")
+
                     if valid_update:
                         if "source_node_id" in update:
                             edge.source_node_id_fk = update["source_node_id"]
@@ -1664,6 +2360,8 @@ class Model:
                 }
 
         except Exception as e:
+            # The Guard may hold updates that were never committed
+            guard.graph_version = None
             session.rollback()
             return {
                 "success": False,
@@ -1671,6 +2369,7 @@ class Model:
                 "data": None,
             }
         finally:
+            guard.lock.release()
             session.close()
 
     # Batch Update Nodes Function
@@ -1817,6 +2516,456 @@ class Model:
         finally:
             session.close()
 
+    # ==================== Graph Version and Metric Results ====================
+
+    def get_graph_version(self) -> int:
+        """Return the current Graph Version (the id of the latest GraphChange)"""
+        session = self.SessionLocal()
+        try:
+            version = session.query(func.max(GraphChange.id)).scalar()
+            return int(version or 0)
+        finally:
+            session.close()
+
+    @staticmethod
+    def _graph_change_horizon(session) -> int:
+        oldest = session.query(func.min(GraphChange.id)).scalar()
+        return int(oldest) - 1 if oldest is not None else 0
+
+    def get_graph_change_horizon(self) -> int:
+        """Return the oldest Graph Version whose later changes are all still in
+        the GraphChange log, which compaction moves forward"""
+        session = self.SessionLocal()
+        try:
+            return self._graph_change_horizon(session)
+        finally:
+            session.close()
+
+    def get_graph_changes_since(
+        self, graph_version: int, until: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Return the GraphChange entries recorded after the given Graph Version,
+        oldest first, up to and including until and at most limit of them.
+
+        Entries before get_graph_change_horizon() have been compacted away.
+        """
+        session = self.SessionLocal()
+        try:
+            query = session.query(GraphChange).filter(GraphChange.id > graph_version)
+            if until is not None:
+                query = query.filter(GraphChange.id <= until)
+            changes = query.order_by(GraphChange.id.asc()).limit(limit).all()
+            return [change.to_dict() for change in changes]
+        finally:
+            session.close()
+
+    def get_latest_metric_result(self, family: str) -> Optional[Dict[str, Any]]:
+        """Return the most recent stored result for a Metric Family"""
+        session = self.SessionLocal()
+        try:
+            result = (
+                session.query(MetricResult)
+                .filter(MetricResult.family == family)
+                .order_by(MetricResult.graph_version.desc())
+                .first()
+            )
+            return result.to_dict() if result else None
+        finally:
+            session.close()
+
+    def save_metric_result(
+        self,
+        family: str,
+        graph_version: int,
+        metrics: Dict[str, Any],
+        duration: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        session = self.SessionLocal()
+        try:
+            existing = (
+                session.query(MetricResult)
+                .filter(
+                    MetricResult.family == family,
+                    MetricResult.graph_version == graph_version,
+                )
+                .first()
+            )
+            if existing:
+                existing.payload = json.dumps(metrics)  # type: ignore
+                existing.duration = duration  # type: ignore
+                existing.computed_on = func.datetime("now")  # type: ignore
+            else:
+                session.add(
+                    MetricResult(
+                        graph_version=graph_version,
+                        family=family,
+                        payload=json.dumps(metrics),
+                        duration=duration,
+                    )
+                )
+
+            # Only the latest result per Family is ever served
+            session.query(MetricResult).filter(
+                MetricResult.family == family,
+                MetricResult.graph_version < graph_version,
+            ).delete(synchronize_session=False)
+
+            session.commit()
+            return {
+                "success": True,
+                "message": f"Saved {family} Metrics for Graph Version {graph_version}",
+                "data": None,
+            }
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error saving Metric Result: {str(e)}")
+            return {
+                "success": False,
+                "message": f"Error saving Metric Result: {str(e)}",
+                "data": None,
+            }
+        finally:
+            session.close()
+
+    # ==================== Metric History ====================
+
+    def record_metric_values(
+        self, family: str, graph_version: int, metrics: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Append the numeric values of a Metric Family to the History.
+
+        Families computed for the same Graph Version share a MetricRun; a new
+        Run starts when the Version changes or the Family is recomputed.
+        """
+        values = {
+            name: float(value)
+            for name, value in metrics.items()
+            if isinstance(value, (int, float)) and math.isfinite(value)
+        }
+        session = self.SessionLocal()
+        try:
+            run = session.query(MetricRun).order_by(MetricRun.id.desc()).first()
+            if (
+                run is None
+                or run.graph_version != graph_version
+                or session.query(MetricValue)
+                .join(MetricKey, MetricKey.id == MetricValue.key_id)
+                .filter(MetricValue.run_id == run.id, MetricKey.family == family)
+                .first()
+                is not None
+            ):
+                run = MetricRun(graph_version=graph_version)
+                session.add(run)
+                session.flush()
+
+            keys = {
+                key.name: key
+                for key in session.query(MetricKey).filter(MetricKey.family == family)
+            }
+            for name in values.keys() - keys.keys():
+                keys[name] = MetricKey(family=family, name=name)
+                session.add(keys[name])
+            session.flush()
+
+            session.add_all(
+                MetricValue(key_id=keys[name].id, run_id=run.id, value=value)
+                for name, value in values.items()
+            )
+            session.commit()
+            return {
+                "success": True,
+                "message": f"Recorded {len(values)} {family} Metrics in Run {run.id}",
+                "data": run.to_dict(),
+            }
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error recording Metric History: {str(e)}")
+            return {
+                "success": False,
+                "message": f"Error recording Metric History: {str(e)}",
+                "data": None,
+            }
+        finally:
+            session.close()
+
+    def get_metric_keys(self) -> List[Dict[str, Any]]:
+        session = self.SessionLocal()
+        try:
+            keys = session.query(MetricKey).order_by(MetricKey.family, MetricKey.name).all()
+            return [key.to_dict() for key in keys]
+        finally:
+            session.close()
+
+    def get_metric_history(
+        self,
+        family: str,
+        name: str,
+        since: Optional[str] = None,
+        max_points: int = 500,
+    ) -> List[Dict[str, Any]]:
+        """Return a Metric's History, downsampled in SQL to at most max_points
+        time buckets (average, minimum and maximum per bucket)"""
+        session = self.SessionLocal()
+        try:
+            key = (
+                session.query(MetricKey)
+                .filter(MetricKey.family == family, MetricKey.name == name)
+                .first()
+            )
+            if key is None:
+                return []
+
+            epoch = cast(func.strftime("%s", MetricRun.recorded_on), Integer)
+            history = (
+                session.query(MetricValue)
+                .join(MetricRun, MetricRun.id == MetricValue.run_id)
+                .filter(MetricValue.key_id == key.id)
+            )
+            if since:
+                history = history.filter(MetricRun.recorded_on >= since)
+
+            count, first, last = history.with_entities(
+                func.count(), func.min(epoch), func.max(epoch)
+            ).one()
+
+            if count <= max_points:
+                rows = history.with_entities(
+                    MetricRun.recorded_on,
+                    MetricValue.value,
+                    MetricValue.value,
+                    MetricValue.value,
+                    MetricRun.graph_version,
+                ).order_by(MetricRun.id)
+            else:
+                # SQLite integer division groups the Runs into equal time buckets
+                bucket_seconds = max(1, -(-(last - first + 1) // max_points))
+                bucket = epoch // bucket_seconds
+                rows = (
+                    history.with_entities(
+                        func.min(MetricRun.recorded_on),
+                        func.avg(MetricValue.value),
+                        func.min(MetricValue.value),
+                        func.max(MetricValue.value),
+                        func.max(MetricRun.graph_version),
+                    )
+                    .group_by(bucket)
+                    .order_by(bucket)
+                )
+
+            return [
+                {
+                    "recorded_on": recorded_on,
+                    "value": value,
+                    "min": minimum,
+                    "max": maximum,
+                    "graph_version": graph_version,
+                }
+                for recorded_on, value, minimum, maximum, graph_version in rows
+            ]
+        finally:
+            session.close()
+
+    def get_metric_deltas(self) -> List[Dict[str, Any]]:
+        """Return each Metric's latest value and its change from the previous Run"""
+        session = self.SessionLocal()
+        try:
+            ranked = session.query(
+                MetricValue.key_id,
+                MetricValue.value,
+                func.row_number()
+                .over(partition_by=MetricValue.key_id, order_by=MetricValue.run_id.desc())
+                .label("position"),
+            ).subquery()
+            rows = (
+                session.query(MetricKey.family, MetricKey.name, ranked.c.position, ranked.c.value)
+                .join(ranked, ranked.c.key_id == MetricKey.id)
+                .filter(ranked.c.position <= 2)
+                .order_by(MetricKey.family, MetricKey.name, ranked.c.position)
+                .all()
+            )
+
+            deltas: Dict[tuple, Dict[str, Any]] = {}
+            for family, name, position, value in rows:
+                delta = deltas.setdefault(
+                    (family, name),
+                    {"family": family, "name": name, "value": None, "previous": None, "delta": None},
+                )
+                if position == 1:
+                    delta["value"] = value
+                else:
+                    delta["previous"] = value
+                    delta["delta"] = delta["value"] - value
+            return list(deltas.values())
+        finally:
+            session.close()
+
+    # ==================== Graph Snapshots ====================
+
+    def get_graph_records(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Return every Node and Edge with its Type and Property Values by name
+        (the content of a Graph Snapshot) and the Graph Version they were read at"""
+        session = self.SessionLocal()
+        try:
+            graph_version = int(session.query(func.max(GraphChange.id)).scalar() or 0)
+            node_types = dict(session.query(NodeType.id, NodeType.name).all())
+            edge_types = dict(session.query(EdgeType.id, EdgeType.name).all())
+
+            nodes = {
+                str(node_id): {
+                    "identifier": identifier,
+                    "name": name,
+                    "type": node_types.get(node_type_id),
+                    "properties": {},
+                }
+                for node_id, identifier, name, node_type_id in session.query(
+                    Node.id, Node.identifier, Node.name, Node.node_type_id_fk
+                )
+            }
+            edges = {
+                str(edge_id): {
+                    "identifier": identifier,
+                    "name": name,
+                    "type": edge_types.get(edge_type_id),
+                    "source": source,
+                    "target": target,
+                    "properties": {},
+                }
+                for edge_id, identifier, name, edge_type_id, source, target in session.query(
+                    Edge.id,
+                    Edge.identifier,
+                    Edge.name,
+                    Edge.edge_type_id_fk,
+                    Edge.source_node_id_fk,
+                    Edge.target_node_id_fk,
+                )
+            }
+
+            for records, value_query in (
+                (
+                    nodes,
+                    session.query(
+                        NodePropertyValue.node_id_fk,
+                        NodePropertyDefinition.name,
+                        NodePropertyValue.value,
+                    ).join(
+                        NodePropertyDefinition,
+                        NodePropertyDefinition.id
+                        == NodePropertyValue.node_property_definition_id_fk,
+                    ),
+                ),
+                (
+                    edges,
+                    session.query(
+                        EdgePropertyValue.edge_id_fk,
+                        EdgePropertyDefinition.name,
+                        EdgePropertyValue.value,
+                    ).join(
+                        EdgePropertyDefinition,
+                        EdgePropertyDefinition.id
+                        == EdgePropertyValue.edge_property_definition_id_fk,
+                    ),
+                ),
+            ):
+                for owner_id, property_name, value in value_query:
+                    record = records.get(str(owner_id))
+                    if record is not None:
+                        record["properties"][property_name] = value
+
+            return {"graph_version": graph_version, "nodes": nodes, "edges": edges}
+        finally:
+            session.close()
+
+    def get_snapshot_content(self, content_id: str) -> Optional[Dict[str, Any]]:
+        session = self.SessionLocal()
+        try:
+            content = (
+                session.query(SnapshotContent)
+                .filter(SnapshotContent.id == content_id)
+                .first()
+            )
+            return content.to_dict() if content else None
+        finally:
+            session.close()
+
+    def get_latest_snapshot_content(self) -> Optional[Dict[str, Any]]:
+        """Return the content of the most recent Graph Snapshot"""
+        session = self.SessionLocal()
+        try:
+            snapshot = (
+                session.query(GraphSnapshot).order_by(GraphSnapshot.id.desc()).first()
+            )
+            return snapshot.content.to_dict() if snapshot else None
+        finally:
+            session.close()
+
+    def get_graph_snapshots(self) -> List[Dict[str, Any]]:
+        session = self.SessionLocal()
+        try:
+            snapshots = (
+                session.query(GraphSnapshot).order_by(GraphSnapshot.id.desc()).all()
+            )
+            return [snapshot.to_dict() for snapshot in snapshots]
+        finally:
+            session.close()
+
+    def get_graph_snapshot(self, snapshot_id: int) -> Optional[Dict[str, Any]]:
+        session = self.SessionLocal()
+        try:
+            snapshot = (
+                session.query(GraphSnapshot)
+                .filter(GraphSnapshot.id == snapshot_id)
+                .first()
+            )
+            return snapshot.to_dict() if snapshot else None
+        finally:
+            session.close()
+
+    def create_graph_snapshot(
+        self,
+        label: str,
+        graph_version: int,
+        content_id: str,
+        content: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Store a labelled Graph Snapshot, with its content unless a Snapshot
+        with the same content id already holds it"""
+        session = self.SessionLocal()
+        try:
+            exists = (
+                session.query(SnapshotContent.id)
+                .filter(SnapshotContent.id == content_id)
+                .first()
+            )
+            if not exists:
+                if content is None:
+                    return {
+                        "success": False,
+                        "message": f"Unable to find Snapshot Content '{content_id}'.",
+                        "data": None,
+                    }
+                session.add(SnapshotContent(id=content_id, **content))
+
+            snapshot = GraphSnapshot(
+                label=label, graph_version=graph_version, content_id=content_id
+            )
+            session.add(snapshot)
+            session.commit()
+            return {
+                "success": True,
+                "message": f"Successfully created Snapshot '{label}'",
+                "data": snapshot.to_dict(),
+            }
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error creating Graph Snapshot: {str(e)}")
+            return {
+                "success": False,
+                "message": f"Error creating Graph Snapshot: {str(e)}",
+                "data": None,
+            }
+        finally:
+            session.close()
+
     # ==================== UTILITY METHODS ====================
 
     def get_node_types(self):
@@ -1,26 +1,25 @@
 # pages/__init__.py
 
-# Import all page modules to register them with Dash
-from . import index
-from . import dashboards  
-from . import networks
-from . import breakdowns
-from . import edges
-from . import nodes
-from . import edge_types
-from . import help
-from . import reports
-from . import settings
+# Dash executes every page module with a register_page call when the App is
+# created, which registers its Route and Callbacks; page modules are looked up
+# here on first access instead of being imported again eagerly.
+import importlib
 
 __all__ = [
     'index',
-    'dashboards', 
+    'dashboards',
     'networks',
     'breakdowns',
-    'edges', 
+    'edges',
     'nodes',
     'edge_types',
     'help',
     'reports',
     'settings'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -12,14 +12,17 @@ from dash import (
     clientside_callback,
 )
 import json
-import pandas as pd
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 from views.breakdown_view import BreakdownView, DropdownOption
 
 # Import your real utilities
-from utils.network_utils import build_breakdown_from_graph, get_graph_roots, get_network
+from utils.cache_utils import get_graph_version, get_network
+from utils.network_utils import build_breakdown_from_graph, get_graph_roots
 from utils.pdf_utils import generate_breakdown_pdf
+from utils.graph_snapshots import diff_element_ids, diff_snapshots, snapshot_options, summarize_diff
+from utils.columnar import encode_columnar, loads_table
+from utils.lazy_imports import lazy_import
 
 register_page(
     __name__, path="/breakdowns", name="Breakdowns", title="Tracer - Breakdowns"
@@ -27,18 +30,24 @@ register_page(
 
 breakdown_view = BreakdownView()
 
+# Imported on first export, not at startup
+pd = lazy_import('pandas')
+
 
 class BreakdownModel:
     """Real model that fetches data from NetworkX graph"""
 
     def __init__(self):
+        # Loaded on first use, so importing the page does not build the Graph
         self.network = None
-        self._load_network()
+        # The Graph Version self.network was loaded at
+        self.graph_version = None
 
     def _load_network(self):
         """Load the NetworkX graph from cache"""
         try:
-            self.network = get_network()
+            self.graph_version = get_graph_version()
+            self.network = get_network(self.graph_version)
             if self.network:
                 print(
                     f"Loaded network with {self.network.number_of_nodes()} nodes and {self.network.number_of_edges()} edges"
@@ -115,7 +124,7 @@ class BreakdownModel:
 
             # Get the breakdown using your utility function
             breakdown_data = build_breakdown_from_graph(
-                self.network, root_node=root_id_converted
+                self.network, self.graph_version, root_node=root_id_converted
             )
 
             print(
@@ -159,6 +168,7 @@ class BreakdownModel:
                 # Transform the item
                 transformed = {
                     "id": item.get("id"),
+                    "edge_id": item.get("edge_id"),
                     "Element": element,
                     "Relation": item.get("edge_label", item.get("edge_type", "")),
                     "Weight": (
@@ -241,10 +251,12 @@ layout = get_layout()
     [
         Input("breakdowns-dropdown", "value"),
         Input("breakdowns-refresh-btn", "n_clicks"),
+        Input("breakdowns-snapshot-select", "value"),
     ],
     prevent_initial_call=False,
 )
-def update_table_data(selected_graph: Optional[str], refresh_clicks: Optional[int]):
+def update_table_data(selected_graph: Optional[str], refresh_clicks: Optional[int],
+                      snapshot_id: Optional[int] = None):
     """Update the data that will be used by Tabulator"""
     try:
         print(
@@ -264,6 +276,9 @@ def update_table_data(selected_graph: Optional[str], refresh_clicks: Optional[in
             filtered_data = breakdown_controller.get_breakdown_data(selected_graph)
             print(f"Loaded {len(filtered_data)} root items for graph {selected_graph}")
 
+            if snapshot_id:
+                _annotate_changes(filtered_data, diff_snapshots(snapshot_id))
+
             # Pretty print first item for debugging
             if filtered_data:
                 import pprint
@@ -271,7 +286,8 @@ def update_table_data(selected_graph: Optional[str], refresh_clicks: Optional[in
                 print("First item structure:")
                 pprint.pprint(filtered_data[0], depth=3)
 
-            return json.dumps(filtered_data)
+            # Columnar, so each Breakdown key and repeated Relation is sent once
+            return json.dumps(encode_columnar(filtered_data, child_field="_children"))
         except Exception as e:
             print(f"Error in update_table_data: {e}")
             import traceback
@@ -283,6 +299,54 @@ def update_table_data(selected_graph: Optional[str], refresh_clicks: Optional[in
         return json.dumps([])
 
 
+def _annotate_changes(items: List[Dict[str, Any]], diff: Dict[str, Any]) -> None:
+    """Set each row's Change to 'Added' or 'Changed' when its Node, or the Edge
+    linking it to its parent, was added or changed since the Snapshot"""
+    ids = diff_element_ids(diff)
+    added = set(ids["nodes"]["added"]) | set(ids["edges"]["added"])
+    changed = set(ids["nodes"]["changed"]) | set(ids["edges"]["changed"])
+
+    for item in items:
+        keys = {str(item.get("id")), str(item.get("edge_id"))}
+        if keys & added:
+            item["Change"] = "Added"
+        elif keys & changed:
+            item["Change"] = "Changed"
+        else:
+            item["Change"] = ""
+        if item.get("_children"):
+            _annotate_changes(item["_children"], diff)
+
+
+@callback(
+    Output("breakdowns-snapshot-select", "options"),
+    Input("breakdowns-snapshot-select", "id"),
+    prevent_initial_call=False,
+)
+def populate_snapshot_options(_):
+    """Populate the Snapshots to compare the Breakdown with"""
+    try:
+        return snapshot_options()
+    except Exception as e:
+        print(f"Error loading snapshot options: {e}")
+        return []
+
+
+@callback(
+    Output("breakdowns-diff-summary", "children"),
+    Input("breakdowns-snapshot-select", "value"),
+    prevent_initial_call=True,
+)
+def update_diff_summary(snapshot_id: Optional[int]):
+    if not snapshot_id:
+        return ""
+    try:
+        return summarize_diff(diff_snapshots(snapshot_id))
+    except Exception as e:
+        print(f"Error comparing with snapshot: {e}")
+        return f"Unable to compare with the Snapshot: {e}"
+
+
 # Callback to populate dropdown options when component loads
 @callback(
     Output("breakdowns-dropdown", "options"),
@@ -390,7 +454,7 @@ def handle_print_pdf(
         return None
 
     try:
-        data = json.loads(table_data_json)
+        data = loads_table(table_data_json)
 
         if not data:
             return None
@@ -445,7 +509,7 @@ def handle_download_csv(
         return None
 
     try:
-        data = json.loads(table_data_json)
+        data = loads_table(table_data_json)
 
         if not data:
             return None
@@ -524,7 +588,7 @@ clientside_callback(
         
         let data;
         try {
-            data = JSON.parse(dataJson);
+            data = window.decodeColumnar(dataJson);
         } catch (e) {
             console.error('Failed to parse data:', e);
             return window.dash_clientside.no_update;
@@ -565,8 +629,15 @@ clientside_callback(
                     {title: "Weight", field: "Weight", headerFilter: "input", hozAlign: "center"},
                     {title: "Identifier", field: "Identifier", headerFilter: "input"},
                     {title: "Name", field: "Name", headerFilter: "input"},
-                    {title: "Description", field: "Description", headerFilter: "input", minWidth: 250}
+                    {title: "Description", field: "Description", headerFilter: "input", minWidth: 250},
+                    {title: "Change", field: "Change", headerFilter: "input", visible: data.some(row => row.Change !== undefined)}
                 ],
+                rowFormatter: function(row) {
+                    // Rows added or changed since the compared Snapshot
+                    const change = row.getData().Change;
+                    row.getElement().style.backgroundColor =
+                        change === "Added" ? "#e6f4ea" : change === "Changed" ? "#fff4e5" : "";
+                },
                 rowClick: function(e, row) {
                     console.log("Row clicked:", row.getData());
                 }
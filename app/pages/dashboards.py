@@ -2,21 +2,19 @@
 
 # Imports
 import dash
-from dash import html, Input, Output, callback, register_page
+from dash import html, Input, Output, State, callback, register_page
 import dash_bootstrap_components as dbc
-import networkx as nx
-import plotly.graph_objects as go
+from datetime import datetime
 
 # MVC Imports
+from models.model import Model
 from views.dashboard_view import DashboardView
 from utils.cache_utils import get_network  
-from utils.metric_utils import (
-    calculate_completeness_metrics, 
-    calculate_efficiency_metrics, 
-    calculate_robustness_metrics, 
-    calculate_resilience_metrics
-)
-from models.model import Model
+from utils.metric_engine import get_metrics_engine
+from utils.sparse_metrics import calculate_structural_metrics, get_sparse_graph
+from utils.coverage import get_coverage_report, uncovered_rows
+from utils.cytoscape_cache import get_graph_elements, get_graph_version
+from utils.lazy_imports import lazy_import
 
 register_page(
     __name__, 
@@ -25,6 +23,11 @@ register_page(
     title="Tracer - Dashboard"
 )
 
+# Imported when a Figure or export is first built, not at startup
+go = lazy_import('plotly.graph_objects')
+pd = lazy_import('pandas')
+
+model = Model()
 dashboard_view = DashboardView()
 
 layout = dashboard_view.get_layout()
@@ -37,17 +40,16 @@ layout = dashboard_view.get_layout()
 def update_system_health_table(_):
     """Update the descriptive metrics table with network statistics"""
     
-    G = get_network()
+    graph_version = get_graph_version()
+    G = get_network(graph_version)
     
     if G is not None and G.number_of_nodes() > 0:
-        # Calculate network metrics
-        num_edges = G.number_of_edges()
-        num_nodes = G.number_of_nodes()
-        density = nx.density(G) if num_nodes > 1 else 0
-        
-        # Calculate average degree
-        degrees = [G.degree(n) for n in G.nodes()]
-        avg_degree = sum(degrees) / len(degrees) if degrees else 0
+        # Calculate network metrics on the cached CSR Adjacency
+        structure = calculate_structural_metrics(get_sparse_graph(G, graph_version))
+        num_edges = structure['total_edges']
+        num_nodes = structure['total_nodes']
+        density = structure['density']
+        avg_degree = structure['average_degree']
 
         data = [
             {"Metric": "No. of Nodes", "Value": str(num_nodes)},
@@ -71,58 +73,90 @@ def update_system_health_table(_):
     return data, columns
 
 
+@callback(
+    Output("metrics-results-store", "data"),
+    Output("metrics-poll-interval", "disabled"),
+    Output("metrics-computed-on", "children"),
+    Input("metrics-poll-interval", "n_intervals"),
+)
+def poll_metrics_engine(_):
+    """Serve the stored Metric Results and keep polling while any are being computed"""
+    results = get_metrics_engine().get_all_metrics()
+
+    computing = any(r["status"] in ("pending", "stale") for r in results.values())
+    computed_on = [r["computed_on"] for r in results.values() if r["computed_on"]]
+
+    if computed_on:
+        status = f"Metrics computed at {max(computed_on)} UTC"
+        if computing:
+            status += " - updating for the latest Graph Version..."
+    elif computing:
+        status = "Computing Metrics..."
+    else:
+        status = ""
+
+    return results, not computing, status
+
+
+def _get_family_metrics(results, family):
+    """Return the Metrics for a Family, or None when no Result is available yet"""
+    result = (results or {}).get(family)
+    if not result or not result.get("metrics"):
+        return None
+    return result["metrics"]
+
+
+def _empty_family_figure(results, family):
+    result = (results or {}).get(family) or {}
+    if result.get("status") == "error":
+        return create_empty_figure("Unable to compute Metrics")
+    if result.get("status") in ("pending", "stale"):
+        return create_empty_figure("Computing Metrics...")
+    return create_empty_figure("No data available")
+
+
 @callback(
     Output("completeness-metrics", "figure"),
-    Input("completeness-metrics", "id")
+    Input("metrics-results-store", "data")
 )
-def update_completeness_metrics(_):
+def update_completeness_metrics(results):
     """Update completeness metrics visualization"""
-    G = get_network()
-    
-    if G is None or G.number_of_nodes() == 0:
-        return create_empty_figure("No data available")
-    
-    model = Model()
-    session = model._get_session()
-    
-    try:
-        metrics = calculate_completeness_metrics(G, session)
-        
-        fig = go.Figure()
-        
-        # Bar chart for coverage metrics
-        fig.add_trace(go.Bar(
-            x=['Node Coverage', 'Edge Coverage', 'Attribute Completeness'],
-            y=[metrics['node_coverage'], metrics['edge_coverage'], metrics['attribute_completeness']],
-            text=[f"{metrics['node_coverage']}%", f"{metrics['edge_coverage']}%", f"{metrics['attribute_completeness']}%"],
-            textposition='auto',
-            marker_color=['#1f77b4', '#ff7f0e', '#2ca02c']
-        ))
-        
-        fig.update_layout(
-            title="Completeness Metrics (%)",
-            yaxis_title="Percentage",
-            yaxis_range=[0, 100],
-            template="plotly_white"
-        )
-        
-        return fig
-    finally:
-        session.close()
+    metrics = _get_family_metrics(results, "completeness")
+    
+    if metrics is None:
+        return _empty_family_figure(results, "completeness")
+    
+    fig = go.Figure()
+    
+    # Bar chart for coverage metrics
+    fig.add_trace(go.Bar(
+        x=['Node Coverage', 'Edge Coverage', 'Attribute Completeness'],
+        y=[metrics['node_coverage'], metrics['edge_coverage'], metrics['attribute_completeness']],
+        text=[f"{metrics['node_coverage']}%", f"{metrics['edge_coverage']}%", f"{metrics['attribute_completeness']}%"],
+        textposition='auto',
+        marker_color=['#1f77b4', '#ff7f0e', '#2ca02c']
+    ))
+    
+    fig.update_layout(
+        title="Completeness Metrics (%)",
+        yaxis_title="Percentage",
+        yaxis_range=[0, 100],
+        template="plotly_white"
+    )
+    
+    return fig
 
 
 @callback(
     Output("efficiency-metrics", "figure"),
-    Input("efficiency-metrics", "id")
+    Input("metrics-results-store", "data")
 )
-def update_efficiency_metrics(_):
+def update_efficiency_metrics(results):
     """Update efficiency metrics visualization"""
-    G = get_network()
-    
-    if G is None or G.number_of_nodes() == 0:
-        return create_empty_figure("No data available")
+    metrics = _get_family_metrics(results, "efficiency")
     
-    metrics = calculate_efficiency_metrics(G)
+    if metrics is None:
+        return _empty_family_figure(results, "efficiency")
     
     fig = go.Figure()
     
@@ -145,16 +179,14 @@ def update_efficiency_metrics(_):
 
 @callback(
     Output("robustness-metrics", "figure"),
-    Input("robustness-metrics", "id")
+    Input("metrics-results-store", "data")
 )
-def update_robustness_metrics(_):
+def update_robustness_metrics(results):
     """Update robustness metrics visualization"""
-    G = get_network()
-    
-    if G is None or G.number_of_nodes() == 0:
-        return create_empty_figure("No data available")
+    metrics = _get_family_metrics(results, "robustness")
     
-    metrics = calculate_robustness_metrics(G)
+    if metrics is None:
+        return _empty_family_figure(results, "robustness")
     
     fig = go.Figure()
     
@@ -179,16 +211,14 @@ def update_robustness_metrics(_):
 
 @callback(
     Output("resilience-metrics", "figure"),
-    Input("resilience-metrics", "id")
+    Input("metrics-results-store", "data")
 )
-def update_resilience_metrics(_):
+def update_resilience_metrics(results):
     """Update resilience metrics visualization"""
-    G = get_network()
+    metrics = _get_family_metrics(results, "resilience")
     
-    if G is None or G.number_of_nodes() == 0:
-        return create_empty_figure("No data available")
-    
-    metrics = calculate_resilience_metrics(G)
+    if metrics is None:
+        return _empty_family_figure(results, "resilience")
     
     fig = go.Figure()
     
@@ -205,7 +235,7 @@ def update_resilience_metrics(_):
     ))
     
     fig.update_layout(
-        title=f"Resilience Metrics (Connected: {metrics['is_connected']})",
+        title=f"Resilience Metrics (Connected: {metrics['is_connected']}, Mode: {metrics.get('mode', 'exact').title()})",
         yaxis_title="Count",
         template="plotly_white"
     )
@@ -213,6 +243,163 @@ def update_resilience_metrics(_):
     return fig
 
 
+@callback(
+    Output("cycle-metrics", "figure"),
+    Input("metrics-results-store", "data")
+)
+def update_cycle_metrics(results):
+    """Update cycle metrics visualization"""
+    metrics = _get_family_metrics(results, "cycles")
+    
+    if metrics is None:
+        return _empty_family_figure(results, "cycles")
+    
+    fig = go.Figure()
+    
+    metric_names = ['Cyclic Components', 'Largest Component', 'Nodes in Cycles', 'Cyclic Edges', 'Self Loops']
+    metric_values = [metrics['cyclic_components'], metrics['largest_cycle_component'],
+                     metrics['nodes_in_cycles'], metrics['cyclic_edges'], metrics['self_loops']]
+    
+    fig.add_trace(go.Bar(
+        x=metric_names,
+        y=metric_values,
+        text=[str(v) for v in metric_values],
+        textposition='auto',
+        marker_color=['#d62728', '#ff7f0e', '#9467bd', '#8c564b', '#e377c2']
+    ))
+    
+    fig.update_layout(
+        title=f"Cycle Metrics (DAG: {metrics['is_dag']})",
+        yaxis_title="Count",
+        template="plotly_white"
+    )
+    
+    return fig
+
+
+@callback(
+    Output("metrics-trend-key", "options"),
+    Output("metrics-trend-key", "value"),
+    Output("metrics-delta-table", "data"),
+    Output("metrics-delta-table", "columns"),
+    Input("metrics-results-store", "data"),
+    State("metrics-trend-key", "value"),
+)
+def update_metric_history(_, selected_key):
+    """List the recorded Metrics and their change since the previous Run"""
+    keys = model.get_metric_keys()
+    options = [
+        {"label": f"{k['family'].title()} - {k['name'].replace('_', ' ').title()}", "value": f"{k['family']}|{k['name']}"}
+        for k in keys
+    ]
+    if selected_key is None and options:
+        selected_key = options[0]["value"]
+
+    data = [
+        {
+            "Family": d["family"].title(),
+            "Metric": d["name"].replace("_", " ").title(),
+            "Value": round(d["value"], 4),
+            "Previous": round(d["previous"], 4) if d["previous"] is not None else "",
+            "Change": f"{d['delta']:+.4g}" if d["delta"] is not None else "",
+        }
+        for d in model.get_metric_deltas()
+    ]
+    columns = [{"name": c, "id": c} for c in ("Family", "Metric", "Value", "Previous", "Change")]
+
+    return options, selected_key, data, columns
+
+
+@callback(
+    Output("metrics-trend-chart", "figure"),
+    Input("metrics-trend-key", "value"),
+    Input("metrics-results-store", "data"),
+)
+def update_metric_trend(selected_key, _):
+    """Plot a Metric's recorded History (downsampled for long histories)"""
+    if not selected_key:
+        return create_empty_figure("No Metric History recorded")
+
+    family, name = selected_key.split("|", 1)
+    history = model.get_metric_history(family, name)
+    if not history:
+        return create_empty_figure("No Metric History recorded")
+
+    times = [h["recorded_on"] for h in history]
+    fig = go.Figure()
+
+    # Show the range of each time bucket when the History is downsampled
+    if any(h["min"] != h["max"] for h in history):
+        fig.add_trace(go.Scatter(x=times, y=[h["max"] for h in history], mode="lines", line=dict(width=0), showlegend=False, hoverinfo="skip"))
+        fig.add_trace(go.Scatter(x=times, y=[h["min"] for h in history], mode="lines", line=dict(width=0), fill="tonexty",
+                                 fillcolor="rgba(31, 119, 180, 0.2)", name="Range", hoverinfo="skip"))
+
+    fig.add_trace(go.Scatter(
+        x=times,
+        y=[h["value"] for h in history],
+        mode="lines+markers",
+        name=name.replace("_", " ").title(),
+        customdata=[h["graph_version"] for h in history],
+        hovertemplate="%{x}<br>%{y}<br>Graph Version %{customdata}<extra></extra>",
+        marker_color="#1f77b4",
+    ))
+
+    fig.update_layout(
+        title=f"{family.title()} - {name.replace('_', ' ').title()}",
+        xaxis_title="Recorded (UTC)",
+        template="plotly_white"
+    )
+
+    return fig
+
+
+def _coverage_report():
+    graph_version = get_graph_version()
+    G, _ = get_graph_elements(graph_version)
+    return G, get_coverage_report(G, graph_version)
+
+
+@callback(
+    Output("coverage-table", "data"),
+    Output("coverage-table", "columns"),
+    Input("metrics-results-store", "data"),
+)
+def update_coverage_table(_):
+    """Coverage of every layer of every Chain"""
+    _, report = _coverage_report()
+    data = []
+    for result in report:
+        if "error" in result:
+            data.append({"Chain": result["chain"], "Layer": result["error"]})
+            continue
+        for step in result["steps"][:-1]:
+            data.append({
+                "Chain": result["chain"],
+                "Layer": step["layer"],
+                "Nodes": step["nodes"],
+                "Covered": step["covered"],
+                "Coverage (%)": step["coverage"],
+            })
+    columns = [{"name": c, "id": c} for c in ("Chain", "Layer", "Nodes", "Covered", "Coverage (%)")]
+    return data, columns
+
+
+@callback(
+    Output("coverage-download", "data"),
+    Input("coverage-download-btn", "n_clicks"),
+    prevent_initial_call=True,
+)
+def download_uncovered_nodes(n_clicks):
+    """Export the Nodes left uncovered by each Chain"""
+    if n_clicks:
+        G, report = _coverage_report()
+        df = pd.DataFrame(uncovered_rows(report, G), columns=["Chain", "Coverage (%)", "Node ID", "Identifier", "Name"])
+        return dict(
+            content=df.to_csv(index=False),
+            filename=f"{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}_uncovered_nodes.csv",
+        )
+
+
 def create_empty_figure(message="No data available"):
     """Create an empty figure with a message"""
     fig = go.Figure()
@@ -12,7 +12,6 @@ from dash import (
     no_update,
 )  # , clientside_callback, ClientsideFunction
 from datetime import datetime
-import pandas as pd
 
 # from reportlab.lib import colors
 # from reportlab.lib.pagesizes import A4, letter, landscape
@@ -28,11 +27,15 @@ import uuid
 from models.model import Model
 from utils.pdf_utils import generate_table_pdf
 from utils.toast_utils import ToastFactory
+from utils.lazy_imports import lazy_import
 from views.edge_type_view import EdgeTypeView
 
 # Register Page
 dash.register_page(__name__, path="/edge-types")
 
+# Imported on first export, not at startup
+pd = lazy_import('pandas')
+
 # Initialize Model and View
 model = Model()
 view = EdgeTypeView()
@@ -2,28 +2,59 @@
 
 # Iport Libraries
 import dash
-from dash import html, dcc, callback, Input, Output, no_update, State
+from dash import html, dcc, callback, clientside_callback, Input, Output, no_update, State
 import dash_bootstrap_components as dbc
 from datetime import datetime
 import json
-import pandas as pd
-from typing import Any, Dict, List, Tuple, Optional
+from typing import Any, Dict, Iterator, List, Tuple, Optional
 import uuid
 
 # Import Model and View
 from models.model import Model
 from utils.pdf_utils import generate_table_pdf
 from utils.toast_utils import ToastFactory
+from utils.columnar import register_table
+from utils.lazy_imports import lazy_import
 from views.edge_view import EdgeView
 
 dash.register_page(__name__, path="/edges")
 
+# Imported on first export, not at startup
+pd = lazy_import('pandas')
+
 # Initialize Model and View
 model = Model()
 view = EdgeView()
 
 # ==================== HELPER FUNCTIONS ====================
 
+def _label(identifier: Optional[str], name: str) -> str:
+    """'<Identifier> - <Name>', or the Name alone when there is no Identifier"""
+    identifier_str = str(identifier) if identifier is not None else ""
+    if identifier_str.strip():
+        return f"{identifier_str} - {name}"
+    return str(name)
+
+
+def _display_edge(
+    edge: Dict[str, Any], node_uuid_to_label: Dict[str, str], edge_type_uuid_to_label: Dict[str, str]
+) -> Dict[str, Any]:
+    source_uuid = edge["Source"]
+    edge_type_uuid = edge["Edge Type"]
+    target_uuid = edge["Target"]
+    return {
+        "ID": edge["ID"],
+        "Identifier": edge["Identifier"],
+        "Source_UUID": source_uuid,
+        "Source": node_uuid_to_label.get(source_uuid, source_uuid),
+        "Edge_Type_UUID": edge_type_uuid,
+        "Edge Type": edge_type_uuid_to_label.get(edge_type_uuid, edge_type_uuid),
+        "Target_UUID": target_uuid,
+        "Target": node_uuid_to_label.get(target_uuid, target_uuid),
+        "Description": edge["Description"],
+    }
+
+
 def get_edges_from_db() -> List[Dict[str, Any]]:
     """Get Edges from the Database with display names for the table"""
     try:
@@ -38,45 +69,42 @@ def get_edges_from_db() -> List[Dict[str, Any]]:
             str(et["value"]): str(et["label"]) for et in edge_types_for_dropdown
         }
 
-        display_edges = []
-        for edge in raw_edges:
-            source_uuid = edge["Source"]
-            edge_type_uuid = edge["Edge Type"]
-            target_uuid = edge["Target"]
-
-
-            display_edge = {
-                "ID": edge["ID"],
-                "Identifier": edge["Identifier"],
-                "Source_UUID": source_uuid,
-                "Source": node_uuid_to_label.get(source_uuid, source_uuid),
-                "Edge_Type_UUID": edge_type_uuid,
-                "Edge Type": edge_type_uuid_to_label.get(edge_type_uuid, edge_type_uuid),
-                "Target_UUID": target_uuid,
-                "Target": node_uuid_to_label.get(target_uuid, target_uuid),
-                "Description": edge["Description"],
-            }
-            display_edges.append(display_edge)
-
-        return display_edges
-
+        return [
+            _display_edge(edge, node_uuid_to_label, edge_type_uuid_to_label)
+            for edge in raw_edges
+        ]
     except Exception as e:
         print(f"Error getting edges from database: {e}")
         return []
 
 
+def iter_edges_from_db(
+    first_chunk_rows: int, chunk_rows: int, after: Optional[str] = None
+) -> Iterator[List[Dict[str, Any]]]:
+    """Get Edges from the Database for the table in chunks, labelling only the
+    Nodes each chunk refers to so the first chunk is not held up by the rest"""
+    edge_type_uuid_to_label = {
+        str(et["value"]): str(et["label"]) for et in get_edge_types_for_dropdown()
+    }
+    for raw_edges in model.iter_edges_for_editor(chunk_rows, first_chunk_rows, after):
+        node_ids = list({edge["Source"] for edge in raw_edges} | {edge["Target"] for edge in raw_edges})
+        node_uuid_to_label = {
+            node_id: _label(identifier, name)
+            for node_id, (identifier, name) in model.get_node_labels(node_ids).items()
+        }
+        yield [
+            _display_edge(edge, node_uuid_to_label, edge_type_uuid_to_label)
+            for edge in raw_edges
+        ]
+
+
 def get_nodes_for_dropdown() -> List[Dict[str, str]]:
     """Get Nodes for the Dropdowns"""
     try:
         nodes = model.get_nodes()
         result = []
         for node in nodes:
-            identifier_str = str(node.identifier) if node.identifier is not None else ""
-            if identifier_str.strip():
-                label = f"{identifier_str} - {node.name}"
-            else:
-                label = str(node.name)
-            result.append({"label": label, "value": str(node.id)})
+            result.append({"label": _label(node.identifier, node.name), "value": str(node.id)})
         result.sort(key=lambda item: item["label"].lower())
         return result
     except Exception as e:
@@ -90,14 +118,7 @@ def get_edge_types_for_dropdown() -> List[Dict[str, str]]:
         edge_types = model.get_edge_types()
         result = []
         for edge_type in edge_types:
-            identifier_str = (
-                str(edge_type.identifier) if edge_type.identifier is not None else ""
-            )
-            if identifier_str.strip():
-                label = f"{identifier_str} - {edge_type.name}"
-            else:
-                label = str(edge_type.name)
-            result.append({"label": label, "value": str(edge_type.id)})
+            result.append({"label": _label(edge_type.identifier, edge_type.name), "value": str(edge_type.id)})
         result.sort(key=lambda item: item["label"].lower())
         return result
     except Exception as e:
@@ -105,12 +126,14 @@ def get_edge_types_for_dropdown() -> List[Dict[str, str]]:
         return []
 
 
+register_table("edges", get_edges_from_db, iter_edges_from_db)
+
+
 # ==================== LAYOUT ====================
 
 
 def layout():
-    """Main layout - delegates to view"""
-    current_edges = get_edges_from_db()
+    """Main layout - delegates to view; the rows are streamed from /api/tables/edges/stream"""
     nodes_for_dropdown = get_nodes_for_dropdown()
     edge_types_for_dropdown = get_edge_types_for_dropdown()
 
@@ -122,13 +145,29 @@ def layout():
     }
 
     return view.create_layout(
-        current_edges, node_label_to_label, edge_type_label_to_label
+        [], node_label_to_label, edge_type_label_to_label
     )
 
 
 # ==================== CALLBACKS ====================
 
 
+# Stream the rows in columnar chunks once the table is shown, rather than inside the layout
+clientside_callback(
+    """
+    function(tableId) {
+        return window.streamColumnarTable('/api/tables/edges/stream', 'edges-table').catch(function(error) {
+            console.error(error);
+            return window.dash_clientside.no_update;
+        });
+    }
+    """,
+    Output("edges-table", "data", allow_duplicate=True),
+    Input("edges-table", "id"),
+    prevent_initial_call="initial_duplicate",
+)
+
+
 # Populate dropdown options when modal opens
 @callback(
     [
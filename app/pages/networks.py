@@ -1,7 +1,6 @@
 # pages/networks.py
 import dash
 from dash import callback, Input, Output, State, no_update, clientside_callback, dcc
-import networkx as nx
 import json
 from typing import Any, Dict, List, Optional
 from sqlalchemy.orm import joinedload
@@ -9,67 +8,35 @@ from sqlalchemy.orm import joinedload
 # Import View and Model
 from views.network_view import NetworkView
 from models.model import Model, Node, Edge
-from utils.network_utils import build_networkx_from_database, get_graph_roots
+from utils.cache_utils import get_network
+from utils.network_utils import get_graph_roots
+from api.graph_api import cytoscape_descriptor
+from pkg.config import GRAPH_VIEW_CONFIG
+from utils.cytoscape_cache import focus_view_key, get_graph_version
+from utils.graph_snapshots import (
+    diff_element_ids,
+    diff_snapshots,
+    snapshot_options,
+    summarize_diff,
+    take_graph_snapshot,
+)
 
 # Register the Page
 dash.register_page(__name__, path="/network")
 
 
-def networkx_to_cytoscape(G: nx.Graph) -> dict:
-    elements = []
-
-    # Add nodes from NetworkX graph
-    for node_id, node_data in G.nodes(data=True):
-        # Create label: "Identifier - Name" if identifier exists, otherwise just "Name"
-        identifier = node_data.get("identifier", "")
-        name = node_data.get("name", "")
-        if identifier and name:
-            label = f"{identifier} - {name}"
-        elif name:
-            label = name
-        elif identifier:
-            label = identifier
-        else:
-            label = "Unnamed"
-
-        elements.append(
-            {
-                "group": "nodes",
-                "data": {
-                    "id": str(node_id),
-                    "label": label,
-                    "name": name,
-                    "identifier": identifier,
-                    "description": node_data.get("description", ""),
-                },
-            }
-        )
-
-    # Add edges from NetworkX graph
-    for source, target, edge_data in G.edges(data=True):
-        elements.append(
-            {
-                "group": "edges",
-                "data": {
-                    "id": str(edge_data.get("edge_id", f"{source}-{target}")),
-                    "identifier": edge_data.get("identifier", ""),
-                    "source": str(source),
-                    "label": edge_data.get("relationship_type", "connects to"),
-                    "target": str(target),
-                    "description": edge_data.get("description", ""),
-                },
-            }
-        )
-
-    return {"elements": elements}
-
-
 # ==================== LAYOUT ====================
 
 
-def layout():
-    print("[layout] Creating network layout with empty initial data")
-    return NetworkView.create_layout({"elements": []})
+def layout(focus=None, hops=None, **kwargs):
+    # The Elements are fetched (and revalidated with an ETag) by the browser;
+    # /network?focus=<Node ID>&hops=<k> opens on a Node's neighbourhood only
+    try:
+        root = focus_view_key(focus, int(hops or 1)) if focus else None
+        return NetworkView.create_layout(cytoscape_descriptor(root), GRAPH_VIEW_CONFIG["poll_interval_ms"])
+    except Exception as e:
+        print(f"Error loading network: {e}")
+        return NetworkView.create_layout({"elements": []}, GRAPH_VIEW_CONFIG["poll_interval_ms"])
 
 
 # ==================== CALLBACKS ====================
@@ -83,7 +50,7 @@ def layout():
 def update_root_selector_options(_):
     """Update the root node selector options when the graph is loaded"""
     try:
-        G = build_networkx_from_database()
+        G = get_network()
         root_nodes = get_graph_roots(G) if G else []
 
         # Create options list
@@ -121,56 +88,50 @@ def update_root_selector_state(options):
 
 
 @callback(
-    Output("cytoscape-data-div", "children"),
-    Input("cytoscape-data-div", "id"),
-    prevent_initial_call=False,
+    Output("cytoscape-data-div", "children", allow_duplicate=True),
+    Input("filter-graph-select", "value"),
+    prevent_initial_call=True,
 )
-def load_cytoscape_data(_):
+def filter_by_root_node(selected_root):
+    """Filter the network to show only the subgraph from selected root node"""
     try:
-        G = build_networkx_from_database()
-        cytoscape_data = networkx_to_cytoscape(G) if G else {"elements": []}
-        return json.dumps(cytoscape_data)
+        return json.dumps(cytoscape_descriptor(selected_root))
     except Exception as e:
-        print(f"Error loading network: {e}")
+        print(f"Error filtering by root node: {e}")
         return json.dumps({"elements": []})
 
 
 @callback(
     Output("cytoscape-data-div", "children", allow_duplicate=True),
-    Input("filter-graph-select", "value"),
+    Input("network-poll-interval", "n_intervals"),
+    State("cytoscape-data-div", "children"),
     prevent_initial_call=True,
 )
-def filter_by_root_node(selected_root):
-    """Filter the network to show only the subgraph from selected root node"""
+def poll_graph_version(_, network_data_json):
+    """Replace the descriptor when another user changes the Graph, so the open View is patched"""
     try:
-        G = build_networkx_from_database()
-        if not G or not selected_root or selected_root == "all":
-            # Show full graph
-            cytoscape_data = networkx_to_cytoscape(G) if G else {"elements": []}
-        else:
-            # Filter to show only the subgraph starting from the selected root
-            if selected_root in G:
-                # Get all descendants of the root node
-                descendants = nx.descendants(G, selected_root)
-                descendants.add(selected_root)  # Include the root itself
-
-                # Create subgraph with only these nodes
-                subgraph = G.subgraph(descendants)
-                cytoscape_data = networkx_to_cytoscape(subgraph)
-            else:
-                cytoscape_data = {"elements": []}
-
-        return json.dumps(cytoscape_data)
+        network_data = json.loads(network_data_json or "{}")
+        if "src" not in network_data or network_data.get("graph_version") == get_graph_version():
+            return no_update
+        return json.dumps(cytoscape_descriptor(network_data.get("root")))
     except Exception as e:
-        print(f"Error filtering by root node: {e}")
-        return json.dumps({"elements": []})
+        print(f"Error polling the graph version: {e}")
+        return no_update
 
 
 # Register clientside callback to trigger Cytoscape rendering with filter information
 clientside_callback(
     """
     function(networkDataJson, filteredValue, layoutAlgorithm, labelFilter, elementFilter, edgeTypeFilter) {
-        return window.cytoscapeCallback(networkDataJson, filteredValue, layoutAlgorithm, labelFilter, elementFilter, edgeTypeFilter);
+        // Patch the graph already drawn when possible, otherwise redraw it
+        return window.patchNetworkData(networkDataJson, labelFilter, elementFilter, edgeTypeFilter).then(function(patched) {
+            if (patched) {
+                return '';
+            }
+            return window.resolveNetworkData(networkDataJson).then(function(elementsJson) {
+                return window.cytoscapeCallback(elementsJson, filteredValue, layoutAlgorithm, labelFilter, elementFilter, edgeTypeFilter);
+            });
+        });
     }
     """,
     Output("cytoscape-trigger", "children"),
@@ -190,7 +151,9 @@ clientside_callback(
     function(layoutAlgorithm, networkDataJson, filteredValue, labelFilter, elementFilter, edgeTypeFilter) {
         if (layoutAlgorithm && networkDataJson) {
             // Layout changes always require full recreation
-            return window.cytoscapeCallback(networkDataJson, filteredValue, layoutAlgorithm, labelFilter, elementFilter, edgeTypeFilter);
+            return window.resolveNetworkData(networkDataJson).then(function(elementsJson) {
+                return window.cytoscapeCallback(elementsJson, filteredValue, layoutAlgorithm, labelFilter, elementFilter, edgeTypeFilter);
+            });
         }
         return window.dash_clientside.no_update;
     }
@@ -220,14 +183,15 @@ def update_network_stats(network_data_json):
             return "No network data available"
 
         network_data = json.loads(network_data_json)
-        elements = network_data.get("elements", [])
-
-        nodes = [e for e in elements if e.get("group") == "nodes"]
-        edges = [e for e in elements if e.get("group") == "edges"]
 
-        # Calculate some basic stats
-        node_count = len(nodes)
-        edge_count = len(edges)
+        if "src" in network_data:
+            # Descriptor of the cached Elements carries the counts
+            node_count = network_data.get("nodes", 0)
+            edge_count = network_data.get("edges", 0)
+        else:
+            elements = network_data.get("elements", [])
+            node_count = len([e for e in elements if e.get("group") == "nodes"])
+            edge_count = len([e for e in elements if e.get("group") == "edges"])
 
         if node_count == 0:
             return "Network: 0 nodes, 0 edges"
@@ -306,13 +270,16 @@ clientside_callback(
                 
                 return new Promise((resolve) => {
                     window.searchTimeout = setTimeout(() => {
-                        const result = window.smartCytoscapeCallback(networkDataJson, filterValue || "", layoutAlgorithm, labelFilter, elementFilter, edgeTypeFilter);
-                        resolve(result);
+                        window.resolveNetworkData(networkDataJson).then((elementsJson) => {
+                            resolve(window.smartCytoscapeCallback(elementsJson, filterValue || "", layoutAlgorithm, labelFilter, elementFilter, edgeTypeFilter));
+                        });
                     }, 300); // Reduced to 300ms for faster response
                 });
             } else {
                 // Fallback to original callback if smart callback not available
-                return window.cytoscapeCallback(networkDataJson, filterValue || "", layoutAlgorithm, labelFilter, elementFilter, edgeTypeFilter);
+                return window.resolveNetworkData(networkDataJson).then(function(elementsJson) {
+                    return window.cytoscapeCallback(elementsJson, filterValue || "", layoutAlgorithm, labelFilter, elementFilter, edgeTypeFilter);
+                });
             }
         }
         return window.dash_clientside.no_update;
@@ -477,7 +444,9 @@ clientside_callback(
     """
     function(elementFilter, edgeTypeFilter, networkDataJson, filteredValue, layoutAlgorithm, labelFilter) {
         if (networkDataJson) {
-            return window.cytoscapeCallback(networkDataJson, filteredValue, layoutAlgorithm, labelFilter, elementFilter, edgeTypeFilter);
+            return window.resolveNetworkData(networkDataJson).then(function(elementsJson) {
+                return window.cytoscapeCallback(elementsJson, filteredValue, layoutAlgorithm, labelFilter, elementFilter, edgeTypeFilter);
+            });
         }
         return window.dash_clientside.no_update;
     }
@@ -502,7 +471,9 @@ clientside_callback(
     """
     function(labelFilter, networkDataJson, filteredValue, layoutAlgorithm, elementFilter, edgeTypeFilter) {
         if (labelFilter !== null && networkDataJson) {
-            return window.cytoscapeCallback(networkDataJson, filteredValue, layoutAlgorithm, labelFilter, elementFilter, edgeTypeFilter);
+            return window.resolveNetworkData(networkDataJson).then(function(elementsJson) {
+                return window.cytoscapeCallback(elementsJson, filteredValue, layoutAlgorithm, labelFilter, elementFilter, edgeTypeFilter);
+            });
         }
         return window.dash_clientside.no_update;
     }
@@ -518,3 +489,79 @@ clientside_callback(
     ],
     prevent_initial_call=True,
 )
+
+
+# ==================== SNAPSHOT CALLBACKS ====================
+
+
+@callback(
+    Output("network-snapshot-select", "options"),
+    Input("network-snapshot-select", "id"),
+    prevent_initial_call=False,
+)
+def update_snapshot_options(_):
+    try:
+        return snapshot_options()
+    except Exception as e:
+        print(f"Error loading snapshots: {e}")
+        return []
+
+
+@callback(
+    [
+        Output("network-snapshot-select", "options", allow_duplicate=True),
+        Output("network-snapshot-label", "value"),
+        Output("toast-store", "data", allow_duplicate=True),
+    ],
+    Input("network-snapshot-create-btn", "n_clicks"),
+    State("network-snapshot-label", "value"),
+    prevent_initial_call=True,
+)
+def create_snapshot(n_clicks, label):
+    """Snapshot the Graph under the entered label"""
+    if not n_clicks:
+        return no_update, no_update, no_update
+    label = (label or "").strip()
+    if not label:
+        return no_update, no_update, {"type": "warning", "message": "Enter a label for the Snapshot"}
+
+    result = take_graph_snapshot(label)
+    if not result["success"]:
+        return no_update, no_update, {"type": "error", "message": result["message"]}
+    return snapshot_options(), "", {"type": "success", "message": result["message"]}
+
+
+@callback(
+    [
+        Output("network-diff-store", "data"),
+        Output("network-diff-summary", "children"),
+    ],
+    [
+        Input("network-snapshot-select", "value"),
+        Input("cytoscape-data-div", "children"),
+    ],
+    prevent_initial_call=True,
+)
+def update_snapshot_diff(snapshot_id, _):
+    """Diff the selected Snapshot against the current Graph (recomputed as the Graph changes)"""
+    if not snapshot_id:
+        return None, ""
+    try:
+        diff = diff_snapshots(snapshot_id)
+        return diff_element_ids(diff), summarize_diff(diff)
+    except Exception as e:
+        print(f"Error diffing snapshot: {e}")
+        return None, f"Unable to compare with the Snapshot: {e}"
+
+
+clientside_callback(
+    """
+    function(diff) {
+        highlightDiff(diff);
+        return window.dash_clientside.no_update;
+    }
+    """,
+    Output("cytoscape-trigger", "children", allow_duplicate=True),
+    Input("network-diff-store", "data"),
+    prevent_initial_call=True,
+)
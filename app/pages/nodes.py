@@ -2,22 +2,26 @@
 
 # Import Libraries
 import dash
-from dash import html, dcc, callback, Input, Output, no_update, State
+from dash import html, dcc, callback, clientside_callback, Input, Output, no_update, State
 import dash_bootstrap_components as dbc
 from datetime import datetime
 import json
-import pandas as pd
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional
 import uuid
 
 # Import Model and View
 from models.model import Model
 from utils.pdf_utils import generate_table_pdf
 from utils.toast_utils import ToastFactory
+from utils.columnar import register_table
+from utils.lazy_imports import lazy_import
 from views.node_view import NodeView
 
 dash.register_page(__name__, path="/nodes")
 
+# Imported on first export, not at startup
+pd = lazy_import('pandas')
+
 # Initialize Model and View
 model = Model()
 view = NodeView()
@@ -34,18 +38,43 @@ def get_nodes_data() -> List[Dict[str, Any]]:
         return []
 
 
+def iter_nodes_data(
+    first_chunk_rows: int, chunk_rows: int, after: Optional[str] = None
+) -> Iterator[List[Dict[str, Any]]]:
+    """Get nodes from database for display in chunks"""
+    return model.iter_nodes_for_editor(chunk_rows, first_chunk_rows, after)
+
+
+register_table("nodes", get_nodes_data, iter_nodes_data)
+
+
 # ==================== LAYOUT ====================
 
 
 def layout():
-    """Main layout - delegates to view"""
-    current_nodes = get_nodes_data()
-    return view.create_layout(current_nodes)
+    """Main layout - delegates to view; the rows are streamed from /api/tables/nodes/stream"""
+    return view.create_layout([])
 
 
 # ==================== CALLBACKS ====================
 
 
+# Stream the rows in columnar chunks once the table is shown, rather than inside the layout
+clientside_callback(
+    """
+    function(tableId) {
+        return window.streamColumnarTable('/api/tables/nodes/stream', 'nodes-table').catch(function(error) {
+            console.error(error);
+            return window.dash_clientside.no_update;
+        });
+    }
+    """,
+    Output("nodes-table", "data", allow_duplicate=True),
+    Input("nodes-table", "id"),
+    prevent_initial_call="initial_duplicate",
+)
+
+
 # Handle changes to Table Data (Cell Edits)
 @callback(
     [
@@ -1,6 +1,7 @@
 # config.py
 
 import os
+import tempfile
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -23,4 +24,165 @@ APP_CONFIG = {
 
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 LOG_DIR = BASE_DIR / "logs"
-LOG_DIR.mkdir(parents=True, exist_ok=True)
\ No newline at end of file
+LOG_DIR.mkdir(parents=True, exist_ok=True)
+METRICS_CONFIG = {
+    # "exact", "approximate" or "auto" (approximate above the Node threshold)
+    "resilience_mode": os.getenv("METRICS_RESILIENCE_MODE", "auto").lower(),
+    "approximation_node_threshold": int(os.getenv("METRICS_APPROX_NODE_THRESHOLD", "2000")),
+    "path_samples": int(os.getenv("METRICS_PATH_SAMPLES", "256")),
+    "path_relative_error": float(os.getenv("METRICS_PATH_RELATIVE_ERROR", "0.02")),
+    "diameter_sweeps": int(os.getenv("METRICS_DIAMETER_SWEEPS", "8")),
+    "min_cut_trials": int(os.getenv("METRICS_MIN_CUT_TRIALS", "16")),
+    "connectivity_pairs": int(os.getenv("METRICS_CONNECTIVITY_PAIRS", "16")),
+    "time_budget_seconds": float(os.getenv("METRICS_TIME_BUDGET_SECONDS", "10")),
+    "seed": int(os.getenv("METRICS_SEED", "42")),
+    # Metric Families run in parallel Worker Processes sharing a Graph Snapshot file
+    "max_workers": int(os.getenv("METRICS_MAX_WORKERS", "4")),
+    "snapshot_dir": Path(os.getenv("METRICS_SNAPSHOT_DIR", Path(tempfile.gettempdir()) / "tracer-graph-snapshots")),
+    "family_timeouts": {
+        "completeness": float(os.getenv("METRICS_TIMEOUT_COMPLETENESS", "60")),
+        "efficiency": float(os.getenv("METRICS_TIMEOUT_EFFICIENCY", "60")),
+        "robustness": float(os.getenv("METRICS_TIMEOUT_ROBUSTNESS", "300")),
+        "resilience": float(os.getenv("METRICS_TIMEOUT_RESILIENCE", "300")),
+        "cycles": float(os.getenv("METRICS_TIMEOUT_CYCLES", "60")),
+    },
+    # A failed Family is retried for the same Graph Version after this delay, doubled on
+    # each further failure up to the maximum
+    "retry_backoff_seconds": float(os.getenv("METRICS_RETRY_BACKOFF_SECONDS", "30")),
+    "retry_backoff_max_seconds": float(os.getenv("METRICS_RETRY_BACKOFF_MAX_SECONDS", "900")),
+}
+
+GRAPH_VIEW_CONFIG = {
+    # Graphs larger than the threshold are sent as a level-of-detail View
+    "lod_node_threshold": int(os.getenv("GRAPH_LOD_NODE_THRESHOLD", "2000")),
+    "lod_node_budget": int(os.getenv("GRAPH_LOD_NODE_BUDGET", "300")),
+    # (Graph Version, Root) Views kept so open Graphs pages can be patched
+    "patch_history": int(os.getenv("GRAPH_PATCH_HISTORY", "16")),
+    "poll_interval_ms": int(os.getenv("GRAPH_POLL_INTERVAL_MS", "5000")),
+}
+
+GRAPH_QUERY_CONFIG = {
+    # Limits for /api/graph/path?mode=all; larger requests are clamped to them
+    "max_path_depth": int(os.getenv("GRAPH_QUERY_MAX_PATH_DEPTH", "12")),
+    "max_paths": int(os.getenv("GRAPH_QUERY_MAX_PATHS", "500")),
+    # Edge Type filtered CSR Adjacencies kept per Graph Version
+    "cached_adjacencies": int(os.getenv("GRAPH_QUERY_CACHED_ADJACENCIES", "16")),
+}
+
+IMPACT_CONFIG = {
+    # How a change propagates along an Edge: "downstream" (source to target),
+    # "upstream" (target to source), "both" or "none"
+    "default_propagation": os.getenv("IMPACT_DEFAULT_PROPAGATION", "downstream").lower(),
+    # Per Edge Type name or id, e.g. "Verifies=upstream,References=none"
+    "edge_type_rules": {
+        name.strip(): direction.strip().lower()
+        for name, _, direction in (
+            rule.partition("=") for rule in os.getenv("IMPACT_EDGE_TYPE_RULES", "").split(",") if "=" in rule
+        )
+    },
+}
+
+GRAPH_CHANGE_CONFIG = {
+    # The GraphChange log keeps this many of its newest entries; older ones are
+    # deleted every compaction_interval changes
+    "retained_changes": int(os.getenv("GRAPH_CHANGE_RETAINED", "100000")),
+    "compaction_interval": int(os.getenv("GRAPH_CHANGE_COMPACTION_INTERVAL", "1000")),
+    # Most changes read for one page of /api/impact/since/<version>
+    "page_size": int(os.getenv("GRAPH_CHANGE_PAGE_SIZE", "5000")),
+}
+
+COVERAGE_CONFIG = {
+    # Chains of Node Type layers separated by ";", each "Goal>Strategy>Solution",
+    # optionally restricted to Edge Types with "@SupportedBy,InContextOf".
+    # Without chains, every pair of Node Types joined by an Edge is measured.
+    "chains": os.getenv("COVERAGE_CHAINS", ""),
+    "max_uncovered": int(os.getenv("COVERAGE_MAX_UNCOVERED", "1000")),
+}
+
+CYCLE_CONFIG = {
+    # What an Edge write that would close a cycle does: "reject" it, "flag" it
+    # (stored, and listed by the Cycle Metrics) or "allow" it silently
+    "default_policy": os.getenv("CYCLE_DEFAULT_POLICY", "flag").lower(),
+    # Per Edge Type name or id, e.g. "SupportedBy=reject,References=allow"
+    "edge_type_policies": {
+        name.strip(): policy.strip().lower()
+        for name, _, policy in (
+            rule.partition("=") for rule in os.getenv("CYCLE_EDGE_TYPE_POLICIES", "").split(",") if "=" in rule
+        )
+    },
+}
+
+SNAPSHOT_CONFIG = {
+    # Snapshots are stored as deltas against the previous one, with a complete
+    # Snapshot once a delta chain reaches this depth
+    "max_delta_depth": int(os.getenv("SNAPSHOT_MAX_DELTA_DEPTH", "16")),
+    # Decoded Snapshots kept in memory for diffing
+    "cache_size": int(os.getenv("SNAPSHOT_CACHE_SIZE", "8")),
+    # Added, removed and changed items listed per diff section
+    "max_diff_items": int(os.getenv("SNAPSHOT_MAX_DIFF_ITEMS", "1000")),
+}
+
+GRAPH_CACHE_CONFIG = {
+    # Server Workers share the Graph through the per-Version Snapshot files in
+    # METRICS_CONFIG["snapshot_dir"]; Flask-Caching needs a store shared the same way
+    "flask_cache_type": os.getenv("FLASK_CACHE_TYPE", "FileSystemCache"),
+    "flask_cache_dir": Path(os.getenv("FLASK_CACHE_DIR", Path(tempfile.gettempdir()) / "tracer-flask-cache")),
+    "flask_cache_timeout": int(os.getenv("FLASK_CACHE_TIMEOUT", "3600")),
+}
+
+INSTRUMENTATION_CONFIG = {
+    # Time every Dash Callback and Flask Route and expose the results at /metrics
+    "enabled": os.getenv("INSTRUMENTATION_ENABLED", "True").lower() == "true",
+    # Requests slower than this are written with their full context to slow_requests.log
+    "slow_threshold_ms": float(os.getenv("SLOW_REQUEST_THRESHOLD_MS", "500")),
+    # Longest Callback Input/State value written to the slow request log
+    "max_context_chars": int(os.getenv("SLOW_REQUEST_MAX_CONTEXT_CHARS", "2000")),
+    # Slowest SQL statements kept per request for the slow request log
+    "slow_query_count": int(os.getenv("SLOW_REQUEST_QUERY_COUNT", "5")),
+    # A statement shape repeated this often within one request is logged as a possible N+1
+    "n_plus_one_threshold": int(os.getenv("N_PLUS_ONE_THRESHOLD", "20")),
+    # Serve the Query profile at /api/debug/queries; unauthenticated, so off unless debugging
+    "query_debug_endpoint": os.getenv("QUERY_DEBUG_ENDPOINT", "False").lower() == "true",
+    "duration_buckets": (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+    "size_buckets": (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216),
+    "query_buckets": (0, 1, 2, 5, 10, 25, 50, 100, 250, 1000),
+}
+
+ASSET_CONFIG = {
+    # Serve the fingerprinted Bundles built by `python -m utils.asset_pipeline build` when present,
+    # otherwise the CDN and /assets Script Tags
+    "use_bundle": os.getenv("ASSET_BUNDLE", "True").lower() == "true",
+    # Build the Bundles at startup when vendor/ is present and they are missing or out of date
+    "build_on_startup": os.getenv("ASSET_BUILD_ON_STARTUP", "True").lower() == "true",
+    # Refuse to start rather than fall back to the CDNs (for deployments without Internet access)
+    "require_bundle": os.getenv("ASSET_REQUIRE_BUNDLE", "False").lower() == "true",
+    # Third-party libraries written by `python -m utils.asset_pipeline fetch`
+    "vendor_dir": BASE_DIR / "vendor",
+    "dist_dir": Path(os.getenv("ASSET_DIST_DIR", BASE_DIR / "dist")),
+    "url_path": "/dist",
+    # Bundle names carry their content hash, so Browsers may keep them for a year
+    "max_age": int(os.getenv("ASSET_MAX_AGE", str(365 * 24 * 3600))),
+}
+
+COMPRESSION_CONFIG = {
+    # Compress Callback, API and static responses for Browsers that accept gzip or br
+    "enabled": os.getenv("COMPRESSION_ENABLED", "True").lower() == "true",
+    # Smaller bodies gain less than the compression costs
+    "min_bytes": int(os.getenv("COMPRESSION_MIN_BYTES", "1024")),
+    "gzip_level": int(os.getenv("COMPRESSION_GZIP_LEVEL", "6")),
+    "brotli_quality": int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5")),
+    # Compressed static files (Dash component suites, /assets) kept in memory per process
+    "static_cache_entries": int(os.getenv("COMPRESSION_STATIC_CACHE_ENTRIES", "64")),
+    "mimetypes": (
+        "text/html", "text/css", "text/plain", "text/javascript", "application/javascript",
+        "application/json", "image/svg+xml", "application/xml", "text/xml",
+    ),
+    # Callback responses larger than this before compression are logged and counted
+    "payload_budget_bytes": int(os.getenv("PAYLOAD_BUDGET_BYTES", str(1024 * 1024))),
+}
+
+TABLE_STREAM_CONFIG = {
+    # A small first chunk reaches the Browser quickly; the rest follow in larger chunks
+    "first_chunk_rows": int(os.getenv("TABLE_STREAM_FIRST_CHUNK_ROWS", "500")),
+    "chunk_rows": int(os.getenv("TABLE_STREAM_CHUNK_ROWS", "5000")),
+}
@@ -0,0 +1,59 @@
+# tests/test_cache_utils.py
+
+"""The Graph Version poll and the Graph cache in utils/cache_utils.py"""
+
+# Import Libraries
+import sqlite3
+
+import pytest
+
+import models.model as model_module
+from models.model import Model
+from pkg.config import METRICS_CONFIG
+from utils import cache_utils, network_utils
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    """An empty Database for the Model() calls in cache_utils and network_utils,
+    with the module caches reset around each test"""
+    db_path = str(tmp_path / "tracer.db")
+    monkeypatch.setattr(model_module, "DEFAULT_DB_PATH", db_path)
+    monkeypatch.setitem(METRICS_CONFIG, "snapshot_dir", tmp_path / "snapshots")
+    for name in ("_model", "_cached_network", "_version_connection", "_data_version", "_graph_version"):
+        monkeypatch.setattr(cache_utils, name, None)
+    yield db_path
+    if cache_utils._version_connection is not None:
+        cache_utils._version_connection.close()
+
+
+def test_unchanged_data_version_skips_the_graph_version_query(database, monkeypatch):
+    queries = []
+    query = Model.get_graph_version
+    monkeypatch.setattr(Model, "get_graph_version", lambda self: queries.append(1) or query(self))
+
+    assert cache_utils.get_graph_version() == 0
+    assert cache_utils.get_graph_version() == 0
+    # Constructing a Model does not write to an up-to-date Database
+    Model(database).close()
+    assert cache_utils.get_graph_version() == 0
+    assert len(queries) == 1
+
+    with sqlite3.connect(database) as connection:
+        connection.execute("INSERT INTO NodeType (id, node_type_name) VALUES ('t', 'Type')")
+    assert cache_utils.get_graph_version() == 1
+    assert len(queries) == 2
+
+
+def test_empty_graph_is_cached(database, monkeypatch):
+    builds = []
+    build = network_utils.build_networkx_from_database
+    monkeypatch.setattr(
+        network_utils, "build_networkx_from_database", lambda **kwargs: builds.append(1) or build(**kwargs)
+    )
+
+    G = cache_utils.get_network()
+    assert G.number_of_nodes() == 0
+    # Served from memory, not rebuilt nor re-read from its Snapshot
+    assert cache_utils.get_network() is G
+    assert len(builds) == 1
@@ -0,0 +1,253 @@
+# utils/approx_metrics.py
+
+"""Sampled Estimates with Error Bounds for the expensive Resilience Metrics"""
+
+# Import Libraries
+import logging
+import math
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+import networkx as nx
+from networkx.algorithms.connectivity import local_node_connectivity
+
+logger = logging.getLogger('TracerApp')
+
+# z-score for a two-sided 95% Confidence Interval
+Z_95 = 1.96
+
+
+def _estimate(value, lower, upper, samples: int, exact: bool = False, **extra) -> Dict[str, Any]:
+    estimate = {
+        'value': value,
+        'lower': lower,
+        'upper': upper,
+        'samples': samples,
+        'exact': exact,
+    }
+    estimate.update(extra)
+    return estimate
+
+
+def _bfs_distances(U: nx.Graph, source: Any) -> Dict[Any, int]:
+    return nx.single_source_shortest_path_length(U, source)
+
+
+# ==================== Average Shortest Path ====================
+
+
+def estimate_average_shortest_path(
+    U: nx.Graph,
+    max_samples: int = 256,
+    relative_error: float = 0.02,
+    time_budget: Optional[float] = None,
+    seed: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Pivot-sampled BFS estimate of the Average Shortest Path Length.
+
+    U must be a connected, undirected Graph. Each pivot contributes the mean
+    distance to every other Node; the estimate is the mean over pivots and the
+    bounds are a 95% Confidence Interval (with finite population correction).
+    Sampling stops once the interval is within relative_error of the estimate,
+    max_samples pivots have been used, or the time budget runs out.
+    """
+    n = U.number_of_nodes()
+    if n < 2:
+        return _estimate(0.0, 0.0, 0.0, 0, exact=True)
+
+    rng = random.Random(seed)
+    deadline = time.perf_counter() + time_budget if time_budget else None
+    nodes = list(U.nodes())
+    pivots = nodes if n <= max_samples else rng.sample(nodes, max_samples)
+
+    pivot_means: List[float] = []
+    for pivot in pivots:
+        distances = _bfs_distances(U, pivot)
+        pivot_means.append(sum(distances.values()) / (n - 1))
+
+        k = len(pivot_means)
+        if k >= 8 and k < n:
+            mean = sum(pivot_means) / k
+            half_width = _confidence_half_width(pivot_means, n)
+            if mean > 0 and half_width / mean <= relative_error:
+                break
+        if deadline and time.perf_counter() > deadline:
+            break
+
+    k = len(pivot_means)
+    mean = sum(pivot_means) / k
+    if k == n:
+        return _estimate(mean, mean, mean, k, exact=True)
+
+    half_width = _confidence_half_width(pivot_means, n)
+    return _estimate(mean, max(1.0, mean - half_width), mean + half_width, k, confidence=0.95)
+
+
+def _confidence_half_width(samples: List[float], population: int) -> float:
+    k = len(samples)
+    if k < 2:
+        return math.inf
+    mean = sum(samples) / k
+    variance = sum((s - mean) ** 2 for s in samples) / (k - 1)
+    correction = (population - k) / (population - 1) if population > 1 else 0.0
+    return Z_95 * math.sqrt(variance / k * correction)
+
+
+# ==================== Diameter ====================
+
+
+def estimate_diameter(
+    U: nx.Graph,
+    sweeps: int = 8,
+    time_budget: Optional[float] = None,
+    seed: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Double-sweep bounds on the Diameter of a connected, undirected Graph.
+
+    Each sweep runs a BFS from a start Node u and a second BFS from the Node
+    farthest from u. The second eccentricity is a lower bound on the Diameter
+    and twice any eccentricity is an upper bound. The estimate is the best
+    lower bound, which is exact on trees and usually exact in practice.
+    """
+    n = U.number_of_nodes()
+    if n < 2:
+        return _estimate(0, 0, 0, 0, exact=True)
+
+    rng = random.Random(seed)
+    deadline = time.perf_counter() + time_budget if time_budget else None
+    nodes = list(U.nodes())
+
+    lower, upper = 0, math.inf
+    # Start from a highest-degree Node (a good centre) and then random Nodes
+    start = max(nodes, key=U.degree)
+    used = 0
+    for sweep in range(max(1, sweeps)):
+        distances = _bfs_distances(U, start)
+        far_node, eccentricity = max(distances.items(), key=lambda item: item[1])
+        upper = min(upper, 2 * eccentricity)
+
+        far_distances = _bfs_distances(U, far_node)
+        far_eccentricity = max(far_distances.values())
+        lower = max(lower, far_eccentricity)
+        upper = min(upper, 2 * far_eccentricity)
+        used += 1
+
+        # A single double sweep is exact on trees
+        if lower == upper or U.number_of_edges() == n - 1:
+            upper = lower
+            break
+        if deadline and time.perf_counter() > deadline:
+            break
+        # Continue from the far end of the last sweep or a random restart
+        start = max(far_distances.items(), key=lambda item: item[1])[0] if sweep % 2 == 0 else rng.choice(nodes)
+
+    return _estimate(lower, lower, int(upper), used, exact=lower == upper)
+
+
+# ==================== Connectivity ====================
+
+
+def estimate_edge_connectivity(
+    U: nx.Graph,
+    trials: int = 16,
+    time_budget: Optional[float] = None,
+    seed: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Randomized (Karger) Min-Cut estimate of the Edge Connectivity.
+
+    U must be connected. A Bridge makes the answer exactly 1. Otherwise every
+    contraction trial gives a cut that is an upper bound, as does the minimum
+    degree, and the reported confidence is the probability that at least one
+    trial found a minimum cut.
+    """
+    n = U.number_of_nodes()
+    if n < 2:
+        return _estimate(0, 0, 0, 0, exact=True)
+    if nx.has_bridges(U):
+        return _estimate(1, 1, 1, 0, exact=True)
+
+    rng = random.Random(seed)
+    deadline = time.perf_counter() + time_budget if time_budget else None
+    edges = list(U.edges())
+    upper = min(d for _, d in U.degree())
+
+    used = 0
+    for _ in range(max(1, trials)):
+        upper = min(upper, _karger_cut(edges, n, rng))
+        used += 1
+        if upper <= 2 or (deadline and time.perf_counter() > deadline):
+            break
+
+    # Each contraction succeeds with probability at least 2 / (n (n - 1))
+    success = 2.0 / (n * (n - 1))
+    confidence = 1.0 - (1.0 - success) ** used
+    return _estimate(upper, 2, upper, used, exact=upper == 2, confidence=round(confidence, 6))
+
+
+def _karger_cut(edges: List[tuple], n: int, rng: random.Random) -> int:
+    parent: Dict[Any, Any] = {}
+
+    def find(x):
+        root = parent.setdefault(x, x)
+        while root != parent[root]:
+            parent[root] = parent[parent[root]]
+            root = parent[root]
+        return root
+
+    order = edges[:]
+    rng.shuffle(order)
+    components = n
+    for u, v in order:
+        if components <= 2:
+            break
+        ru, rv = find(u), find(v)
+        if ru != rv:
+            parent[ru] = rv
+            components -= 1
+
+    return sum(1 for u, v in edges if find(u) != find(v))
+
+
+def estimate_node_connectivity(
+    U: nx.Graph,
+    articulation_points: Optional[int] = None,
+    pairs: int = 16,
+    time_budget: Optional[float] = None,
+    seed: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Sampled estimate of the Node Connectivity of a connected Graph.
+
+    An Articulation Point makes the answer exactly 1. Otherwise the local
+    Node Connectivity of sampled non-adjacent pairs and the minimum degree
+    are upper bounds, and 2 is the lower bound.
+    """
+    n = U.number_of_nodes()
+    if n < 2:
+        return _estimate(0, 0, 0, 0, exact=True)
+    if articulation_points is None:
+        articulation_points = sum(1 for _ in nx.articulation_points(U))
+    if articulation_points > 0:
+        return _estimate(1, 1, 1, 0, exact=True)
+
+    rng = random.Random(seed)
+    deadline = time.perf_counter() + time_budget if time_budget else None
+    nodes = list(U.nodes())
+    min_degree_node = min(nodes, key=U.degree)
+    upper = U.degree(min_degree_node)
+
+    used = 0
+    for _ in range(max(1, pairs) * 4):
+        if used >= pairs or upper <= 2:
+            break
+        # Pairs through the minimum degree Node are the most likely to be tight
+        u = min_degree_node if used == 0 else rng.choice(nodes)
+        v = rng.choice(nodes)
+        if u == v or U.has_edge(u, v):
+            continue
+        upper = min(upper, local_node_connectivity(U, u, v))
+        used += 1
+        if deadline and time.perf_counter() > deadline:
+            break
+
+    return _estimate(upper, min(2, upper), upper, used, exact=upper <= 2)
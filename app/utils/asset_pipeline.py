@@ -0,0 +1,420 @@
+# utils/asset_pipeline.py
+
+"""Vendored, bundled and fingerprinted front-end Assets.
+
+`fetch` downloads the third-party Scripts and Stylesheets (and the fonts their
+CSS refers to) into vendor/ and records their SHA-256 in vendor.lock.json, so
+the copies can be committed and the App runs without a CDN. `build` checks the
+copies against the lock, then concatenates them with the App's own Scripts
+and Stylesheets into one Script and one Stylesheet Bundle. The Bundles are
+written to dist/ under content-hash names, alongside precompressed .gz and .br
+variants and a manifest.json that the App reads at startup.
+
+The App runs `build` itself at startup (ensure_bundles) when vendor/ is present
+and the Bundles are missing or older than their sources. Without vendor/ it
+falls back to the CDN and /assets Script Tags and logs a warning, or with
+ASSET_REQUIRE_BUNDLE=True refuses to start.
+
+Minifying uses rjsmin and rcssmin, and the .br variants use brotli. Each of
+these is used when it is installed.
+
+Run from the app directory:
+
+    python -m utils.asset_pipeline fetch
+    python -m utils.asset_pipeline build
+"""
+
+# Import Libraries
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import posixpath
+import re
+import sys
+import urllib.request
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urljoin, urlparse
+
+from dash_bootstrap_components import themes
+
+from pkg.config import ASSET_CONFIG, BASE_DIR
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+try:
+    import rcssmin
+except ImportError:
+    rcssmin = None
+
+logger = logging.getLogger('TracerApp')
+
+ASSETS_DIR = BASE_DIR / "assets"
+LOCK_FILE = "vendor.lock.json"
+MANIFEST_FILE = "manifest.json"
+BUNDLE_NAME = "tracer"
+
+# Text files worth precompressing; fonts and images are compressed already
+_COMPRESSIBLE = ('.js', '.css', '.svg', '.json')
+_CSS_URL = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+_CHARSET = re.compile(r"""@charset\s+["'][^"']*["']\s*;""", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class Asset:
+    """A Script or Stylesheet: vendored from url under vendor/, or the App's own under assets/"""
+
+    name: str
+    url: Optional[str] = None
+
+    @property
+    def vendored(self) -> bool:
+        return self.url is not None
+
+    @property
+    def path(self) -> Path:
+        return (ASSET_CONFIG["vendor_dir"] if self.vendored else ASSETS_DIR) / self.name
+
+    @property
+    def src(self) -> str:
+        """Where the page loads the Asset from when there is no Bundle"""
+        return self.url or f"/assets/{self.name}"
+
+
+# In load order; Dash no longer adds the files under assets/js and assets/css by itself
+SCRIPTS = [
+    Asset("cytoscape@3.26.0/cytoscape.min.js", "https://unpkg.com/cytoscape@3.26.0/dist/cytoscape.min.js"),
+    Asset("cytoscape-fcose@2.2.0/cytoscape-fcose.js", "https://unpkg.com/cytoscape-fcose@2.2.0/cytoscape-fcose.js"),
+    Asset("cytoscape-dagre@2.5.0/cytoscape-dagre.js", "https://unpkg.com/cytoscape-dagre@2.5.0/cytoscape-dagre.js"),
+    Asset("dagre@0.8.5/dagre.min.js", "https://unpkg.com/dagre@0.8.5/dist/dagre.min.js"),
+    # Klay Layout
+    Asset("cytoscape-klay@3.1.4/cytoscape-klay.js", "https://unpkg.com/cytoscape-klay@3.1.4/cytoscape-klay.js"),
+    Asset("klayjs@0.4.1/klay.js", "https://unpkg.com/klayjs@0.4.1/klay.js"),
+    # COLA Layout
+    Asset("cytoscape-cola@2.4.0/cytoscape-cola.js", "https://unpkg.com/cytoscape-cola@2.4.0/cytoscape-cola.js"),
+    Asset("webcola@3.4.0/cola.min.js", "https://unpkg.com/webcola@3.4.0/WebCola/cola.min.js"),
+    Asset("cytoscape-svg@0.4.0/cytoscape-svg.js", "https://cdn.jsdelivr.net/npm/cytoscape-svg@0.4.0/cytoscape-svg.js"),
+    Asset("js/cytoscape_config.js"),
+    Asset("js/cytoscape_utils.js"),
+    Asset("js/cytoscape_styles.js"),
+    Asset("js/cytoscape_events.js"),
+    Asset("js/cytoscape_search.js"),
+    Asset("js/cytoscape_callback.js"),
+    Asset("js/columnar.js"),
+    Asset("tabulator-tables@6.3.1/tabulator.min.js", "https://unpkg.com/tabulator-tables@6.3.1/dist/js/tabulator.min.js"),
+    Asset("jspdf@2.5.1/jspdf.umd.min.js", "https://cdnjs.cloudflare.com/ajax/libs/jspdf/2.5.1/jspdf.umd.min.js"),
+    Asset(
+        "jspdf-autotable@3.5.31/jspdf.plugin.autotable.min.js",
+        "https://cdnjs.cloudflare.com/ajax/libs/jspdf-autotable/3.5.31/jspdf.plugin.autotable.min.js",
+    ),
+]
+
+STYLESHEETS = [
+    Asset("bootstrap/bootstrap.min.css", themes.BOOTSTRAP),
+    Asset(
+        "bootstrap-icons@1.11.3/font/bootstrap-icons.min.css",
+        "https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.3/font/bootstrap-icons.min.css",
+    ),
+    Asset(
+        "tabulator-tables@6.3.1/tabulator_bootstrap5.min.css",
+        "https://unpkg.com/tabulator-tables@6.3.1/dist/css/tabulator_bootstrap5.min.css",
+    ),
+    Asset("css/app.css"),
+    Asset("css/tabulator.css"),
+]
+
+
+def _sha256(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def _is_relative(url: str) -> bool:
+    """Whether a url() reference points at a file next to the Stylesheet"""
+    return not url.startswith(('data:', 'http:', 'https:', '//', '/', '#'))
+
+
+def _relative_urls(css: str) -> List[str]:
+    return [url.strip() for _, url in _CSS_URL.findall(css) if _is_relative(url.strip())]
+
+
+def _strip_query(url: str) -> str:
+    return url.split('#', 1)[0].split('?', 1)[0]
+
+
+# ==================== Fetch ====================
+
+
+def _download(url: str) -> bytes:
+    with urllib.request.urlopen(url, timeout=60) as response:
+        return response.read()
+
+
+def fetch_vendor_assets() -> Dict[str, Dict[str, Any]]:
+    """Download every vendored Asset and the files its CSS refers to, and write the lock file"""
+    vendor_dir = ASSET_CONFIG["vendor_dir"]
+    lock: Dict[str, Dict[str, Any]] = {}
+
+    def save(name: str, url: str) -> bytes:
+        content = _download(url)
+        path = vendor_dir / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+        lock[name] = {'url': url, 'sha256': _sha256(content), 'bytes': len(content)}
+        logger.info(f"Vendored {url} as {name} ({len(content)} bytes)")
+        return content
+
+    for asset in SCRIPTS + STYLESHEETS:
+        if not asset.vendored:
+            continue
+        content = save(asset.name, asset.url)
+        if asset.name.endswith('.css'):
+            for reference in _relative_urls(content.decode('utf-8')):
+                target = _strip_query(reference)
+                name = posixpath.normpath(posixpath.join(posixpath.dirname(asset.name), target))
+                if name not in lock and not name.startswith('..'):
+                    save(name, urljoin(asset.url, target))
+
+    (vendor_dir / LOCK_FILE).write_text(json.dumps(lock, indent=2, sort_keys=True) + "\n")
+    return lock
+
+
+# ==================== Build ====================
+
+
+def _read_lock() -> Dict[str, Dict[str, Any]]:
+    lock_path = ASSET_CONFIG["vendor_dir"] / LOCK_FILE
+    if not lock_path.exists():
+        raise FileNotFoundError(f"{lock_path} is missing; run `python -m utils.asset_pipeline fetch` first")
+    return json.loads(lock_path.read_text())
+
+
+def _read_source(asset_path: Path, name: str, lock: Dict[str, Dict[str, Any]], vendored: bool) -> bytes:
+    if not asset_path.exists():
+        raise FileNotFoundError(f"{asset_path} is missing; run `python -m utils.asset_pipeline fetch` first")
+    content = asset_path.read_bytes()
+    if vendored:
+        entry = lock.get(name)
+        if entry is None or entry['sha256'] != _sha256(content):
+            raise ValueError(f"{asset_path} does not match {LOCK_FILE}; fetch it again")
+    return content
+
+
+def _fingerprinted(name: str, content: bytes) -> str:
+    stem, dot, suffix = Path(name).name.partition('.')
+    return f"{stem}.{_sha256(content)[:12]}{dot}{suffix}"
+
+
+class _BundleWriter:
+    """Writes fingerprinted files and their compressed variants to dist/"""
+
+    def __init__(self, dist_dir: Path):
+        self.dist_dir = dist_dir
+        self.files: Dict[str, Dict[str, int]] = {}
+
+    def write(self, name: str, content: bytes) -> str:
+        filename = _fingerprinted(name, content)
+        self.dist_dir.mkdir(parents=True, exist_ok=True)
+        (self.dist_dir / filename).write_bytes(content)
+        sizes = {'bytes': len(content)}
+        if filename.endswith(_COMPRESSIBLE):
+            # mtime=0 keeps the .gz identical between builds of the same content
+            compressed = gzip.compress(content, compresslevel=9, mtime=0)
+            (self.dist_dir / f"{filename}.gz").write_bytes(compressed)
+            sizes['gzip_bytes'] = len(compressed)
+            if brotli is not None:
+                compressed = brotli.compress(content, quality=11)
+                (self.dist_dir / f"{filename}.br").write_bytes(compressed)
+                sizes['br_bytes'] = len(compressed)
+        self.files[filename] = sizes
+        return filename
+
+
+def _bundle_scripts(lock: Dict[str, Dict[str, Any]]) -> bytes:
+    parts = []
+    for asset in SCRIPTS:
+        source = _read_source(asset.path, asset.name, lock, asset.vendored).decode('utf-8')
+        if rjsmin is not None and not asset.name.endswith('.min.js'):
+            source = rjsmin.jsmin(source, keep_bang_comments=True)
+        # A leading semicolon stops one file's missing terminator running into the next file
+        parts.append(f";/* {asset.name} */\n{source.strip()}\n")
+    return "".join(parts).encode('utf-8')
+
+
+def _bundle_stylesheets(lock: Dict[str, Dict[str, Any]], writer: _BundleWriter) -> bytes:
+    parts = []
+    for asset in STYLESHEETS:
+        css = _read_source(asset.path, asset.name, lock, asset.vendored).decode('utf-8')
+        css = _CHARSET.sub("", css)
+
+        # The Bundle is served from dist/, so files the CSS refers to are copied there under their hash
+        def rewrite(match: re.Match) -> str:
+            quote, url = match.groups()
+            if not _is_relative(url.strip()):
+                return match.group(0)
+            target = _strip_query(url.strip())
+            name = posixpath.normpath(posixpath.join(posixpath.dirname(asset.name), target))
+            referenced = asset.path.parent / target
+            content = _read_source(referenced, name, lock, asset.vendored)
+            return f"url({quote}{writer.write(name, content)}{quote})"
+
+        css = _CSS_URL.sub(rewrite, css)
+        if rcssmin is not None and not asset.name.endswith('.min.css'):
+            css = rcssmin.cssmin(css, keep_bang_comments=True)
+        parts.append(f"/* {asset.name} */\n{css.strip()}\n")
+    return ('@charset "UTF-8";\n' + "".join(parts)).encode('utf-8')
+
+
+def build_bundles() -> Dict[str, Any]:
+    """Write the Script and Stylesheet Bundles and the manifest to dist/, removing earlier builds"""
+    dist_dir = ASSET_CONFIG["dist_dir"]
+    lock = _read_lock()
+    writer = _BundleWriter(dist_dir)
+
+    script = writer.write(f"{BUNDLE_NAME}.min.js", _bundle_scripts(lock))
+    stylesheet = writer.write(f"{BUNDLE_NAME}.min.css", _bundle_stylesheets(lock, writer))
+    manifest = {
+        'built_on': datetime.now().isoformat(timespec='seconds'),
+        'scripts': [script],
+        'stylesheets': [stylesheet],
+        'files': writer.files,
+        'minified': {'js': rjsmin is not None, 'css': rcssmin is not None},
+    }
+    (dist_dir / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2) + "\n")
+
+    kept = {MANIFEST_FILE}
+    for filename in writer.files:
+        kept.update({filename, f"{filename}.gz", f"{filename}.br"})
+    for path in dist_dir.iterdir():
+        if path.is_file() and path.name not in kept:
+            path.unlink()
+    return manifest
+
+
+# ==================== Serving ====================
+
+_manifest: Optional[Dict[str, Any]] = None
+
+
+def load_manifest() -> Optional[Dict[str, Any]]:
+    """The manifest of the current build, or None when Bundles are disabled or not built"""
+    global _manifest
+    if _manifest is None and ASSET_CONFIG["use_bundle"]:
+        manifest_path = ASSET_CONFIG["dist_dir"] / MANIFEST_FILE
+        try:
+            manifest = json.loads(manifest_path.read_text())
+        except (OSError, ValueError):
+            return None
+        if all((ASSET_CONFIG["dist_dir"] / name).exists() for name in manifest.get('files', {})):
+            _manifest = manifest
+        else:
+            logger.warning(f"{manifest_path} refers to missing files; serving the unbundled Assets")
+    return _manifest
+
+
+def _bundle_sources() -> List[Path]:
+    """Files a build reads: the lock, which covers every vendored file, and the App's own Assets"""
+    return [ASSET_CONFIG["vendor_dir"] / LOCK_FILE] + [
+        asset.path for asset in SCRIPTS + STYLESHEETS if not asset.vendored
+    ]
+
+
+def _bundles_stale() -> bool:
+    manifest_path = ASSET_CONFIG["dist_dir"] / MANIFEST_FILE
+    if not manifest_path.exists():
+        return True
+    built = manifest_path.stat().st_mtime
+    return any(path.exists() and path.stat().st_mtime > built for path in _bundle_sources())
+
+
+def _fall_back_to_cdn(reason: str) -> None:
+    hosts = sorted({urlparse(asset.url).netloc for asset in SCRIPTS + STYLESHEETS if asset.vendored})
+    message = (
+        f"Front-end Bundles unavailable: {reason}. Pages will load their libraries from "
+        f"{', '.join(hosts)} and will not work without Internet access. Run "
+        "`python -m utils.asset_pipeline fetch` where the CDNs are reachable and commit app/vendor."
+    )
+    if ASSET_CONFIG["require_bundle"]:
+        raise RuntimeError(f"{message} (ASSET_REQUIRE_BUNDLE is set)")
+    logger.warning("=" * 78)
+    logger.warning(message)
+    logger.warning("=" * 78)
+
+
+def ensure_bundles() -> Optional[Dict[str, Any]]:
+    """Build the Bundles at startup when they are missing or out of date, and
+    return the manifest; warns (or raises, with require_bundle) when the page
+    will fall back to the CDNs"""
+    global _manifest
+    if not ASSET_CONFIG["use_bundle"]:
+        _fall_back_to_cdn("ASSET_BUNDLE is disabled")
+        return None
+
+    if ASSET_CONFIG["build_on_startup"] and _bundles_stale():
+        if not (ASSET_CONFIG["vendor_dir"] / LOCK_FILE).exists():
+            _fall_back_to_cdn(f"{ASSET_CONFIG['vendor_dir']} has not been vendored")
+            return None
+        try:
+            build_bundles()
+            _manifest = None
+            logger.info(f"Built the front-end Bundles in {ASSET_CONFIG['dist_dir']}")
+        except (OSError, ValueError) as e:
+            _fall_back_to_cdn(f"building them failed ({e})")
+            return None
+
+    manifest = load_manifest()
+    if manifest is None:
+        _fall_back_to_cdn(f"{ASSET_CONFIG['dist_dir'] / MANIFEST_FILE} is missing or incomplete")
+    return manifest
+
+
+def page_scripts() -> List[Dict[str, str]]:
+    manifest = load_manifest()
+    if manifest:
+        return [{"src": f"{ASSET_CONFIG['url_path']}/{name}"} for name in manifest['scripts']]
+    return [{"src": asset.src} for asset in SCRIPTS]
+
+
+def page_stylesheets() -> List[str]:
+    manifest = load_manifest()
+    if manifest:
+        return [f"{ASSET_CONFIG['url_path']}/{name}" for name in manifest['stylesheets']]
+    return [asset.src for asset in STYLESHEETS]
+
+
+def bundle_file(filename: str) -> Optional[Path]:
+    """Path of a file in the current build; None for anything else under dist/"""
+    manifest = load_manifest()
+    if not manifest or filename not in manifest['files']:
+        return None
+    return ASSET_CONFIG["dist_dir"] / filename
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('command', choices=('fetch', 'build'))
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.command == 'fetch':
+        fetched = fetch_vendor_assets()
+        print(f"Vendored {len(fetched)} files into {ASSET_CONFIG['vendor_dir']}")
+        sys.exit(0)
+
+    built = build_bundles()
+    for name, sizes in built['files'].items():
+        compressed = ", ".join(f"{key.split('_')[0]} {value}" for key, value in sizes.items() if key != 'bytes')
+        print(f"{name:<48} {sizes['bytes']:>9} bytes" + (f" ({compressed})" if compressed else ""))
+    if not all(built['minified'].values()):
+        print("rjsmin or rcssmin is not installed; parts of the Bundles are not minified", file=sys.stderr)
@@ -1,19 +1,126 @@
-# utils/network_cache.py
+# utils/cache_utils.py
 
-"""Centralized cache for the NetworkX Graph"""
+"""Cross-process cache for the NetworkX Graph
 
-_cached_network = None
+Each Server Worker keeps the Graph of the latest Graph Version in memory. A
+Worker that sees a new Version loads the Snapshot written by whichever process
+built that Version first, so the Graph is built from the Database once per
+change however many Workers (and Metric Workers) there are.
+"""
+
+# Import Libraries
+import logging
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Optional, Tuple
+
+import networkx as nx
+
+from utils.metric_scheduler import _build_graph_snapshot, load_graph_snapshot, snapshot_path
+
+logger = logging.getLogger('TracerApp')
+
+_lock = threading.RLock()
+# Serialises loading a Graph Version within this Worker
+_load_lock = threading.Lock()
+_model = None
+
+# (Graph Version, Graph) of the latest Graph this Worker has loaded
+_cached_network: Optional[Tuple[int, nx.MultiDiGraph]] = None
+
+# The Graph Version is re-read only when PRAGMA data_version shows a commit
+_version_connection: Optional[sqlite3.Connection] = None
+_data_version: Optional[int] = None
+_graph_version: Optional[int] = None
+
+
+def _get_model():
+    global _model
+    if _model is None:
+        from models.model import Model
+        _model = Model()
+    return _model
 
-def get_network():
-    global _cached_network
-    return _cached_network
 
-def update_network_cache(graph):
+def _read_data_version() -> Optional[int]:
+    """SQLite changes PRAGMA data_version whenever another connection, in this
+    or any other process, commits to the Database"""
+    global _version_connection
+    try:
+        if _version_connection is None:
+            _version_connection = sqlite3.connect(_get_model().db_path, check_same_thread=False)
+        return _version_connection.execute("PRAGMA data_version").fetchone()[0]
+    except sqlite3.Error as e:
+        logger.warning(f"Unable to read the Database data_version: {e}")
+        _version_connection = None
+        return None
+
+
+def get_graph_version() -> int:
+    """The current Graph Version, queried only after the Database has changed"""
+    global _data_version, _graph_version
+    with _lock:
+        data_version = _read_data_version()
+        if data_version is None or data_version != _data_version or _graph_version is None:
+            _graph_version = _get_model().get_graph_version()
+            _data_version = data_version
+        return _graph_version
+
+
+def get_network(graph_version: Optional[int] = None) -> nx.MultiDiGraph:
+    """The Graph for a Graph Version (by default the current one); when the
+    Database changed before it was read, the Graph of the newer Version, which
+    is cached under that Version"""
     global _cached_network
-    _cached_network = graph
-    print(f"[update_network_cache] Cached network with {graph.number_of_nodes()} nodes")
+    if graph_version is None:
+        graph_version = get_graph_version()
+
+    with _lock:
+        if _cached_network is not None and _cached_network[0] == graph_version:
+            return _cached_network[1]
+
+    # The threads of a Worker wait here for one load, not on _lock, which stays
+    # free for get_graph_version and invalidate_network_cache however long it takes
+    with _load_lock:
+        with _lock:
+            if _cached_network is not None and _cached_network[0] == graph_version:
+                return _cached_network[1]
+
+        start = time.perf_counter()
+        path = snapshot_path(graph_version)
+        snapshot = None
+        if path.exists():
+            try:
+                snapshot = load_graph_snapshot(path)
+            except (OSError, EOFError, pickle.UnpicklingError) as e:
+                # Pruned or replaced while being read
+                logger.warning(f"Unable to load the Graph Snapshot {path.name}: {e}")
+        if snapshot is None:
+            try:
+                # Builds the Graph, or waits for the process already building it
+                snapshot = _build_graph_snapshot(path, graph_version)
+            except Exception:
+                # Logged by the build; a failed build is retried on the next call, not cached
+                return nx.MultiDiGraph()
+
+        G = snapshot['graph']
+        # Snapshots written before they were labelled hold the Version they are named for
+        built_version = snapshot.get('graph_version', graph_version)
+        logger.info(
+            f"Graph Version {built_version} with {G.number_of_nodes()} Nodes and "
+            f"{G.number_of_edges()} Edges ready in {time.perf_counter() - start:.3f}s"
+        )
+        with _lock:
+            _cached_network = (built_version, G)
+        return G
+
 
 def invalidate_network_cache():
-    global _cached_network
-    _cached_network = None
-    print("[invalidate_network_cache] Cache cleared")
\ No newline at end of file
+    """Drop this Worker's Graph; the next call re-reads the Graph Version"""
+    global _cached_network, _data_version
+    with _lock:
+        _cached_network = None
+        _data_version = None
+    logger.info("Network cleared from Cache.")
@@ -0,0 +1,164 @@
+# utils/columnar.py
+
+"""Columnar encoding of table rows for the Browser.
+
+The Editor tables and Breakdowns are lists of dicts that repeat every key on
+every row, and most of their values repeat too (a Source Node, an Edge Type,
+a Relation). Here each column is sent once. A column whose values repeat is
+dictionary encoded: its distinct values are listed once, and each row holds
+a code into that list. The codes are packed as little-endian unsigned
+integers, 1, 2 or 4 bytes wide, in base64. Other columns are plain value
+arrays. Tree data (Tabulator's _children) is flattened in pre-order with a
+packed parent column. assets/js/columnar.js decodes the payload back into
+Tabulator rows.
+"""
+
+# Import Libraries
+import base64
+import json
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+FORMAT = "columnar"
+VERSION = 1
+
+# A column is dictionary encoded when at most this share of its values are distinct
+DICTIONARY_RATIO = 0.5
+
+_MISSING = object()
+
+# Table name -> function returning its rows, registered by the pages that show the table
+TABLE_LOADERS: Dict[str, Callable[[], List[Dict[str, Any]]]] = {}
+
+# Table name -> function yielding its rows in ID order as chunks of
+# (first chunk size, chunk size, ID to start after)
+ChunkLoader = Callable[[int, int, Optional[str]], Iterator[List[Dict[str, Any]]]]
+TABLE_CHUNK_LOADERS: Dict[str, ChunkLoader] = {}
+
+
+def register_table(name: str, loader: Callable[[], List[Dict[str, Any]]],
+                   chunks: Optional[ChunkLoader] = None) -> None:
+    """Serve a table's rows at /api/tables/<name> and, given chunks, stream
+    them at /api/tables/<name>/stream"""
+    TABLE_LOADERS[name] = loader
+    if chunks is not None:
+        TABLE_CHUNK_LOADERS[name] = chunks
+
+
+def _pack(codes: Sequence[int]) -> Dict[str, Any]:
+    largest = max(codes, default=0)
+    width = 1 if largest < 1 << 8 else 2 if largest < 1 << 16 else 4
+    packed = np.asarray(codes, dtype=f"<u{width}").tobytes()
+    return {"codes": base64.b64encode(packed).decode("ascii"), "width": width}
+
+
+def _unpack(encoded: Dict[str, Any]) -> List[int]:
+    packed = base64.b64decode(encoded["codes"])
+    return np.frombuffer(packed, dtype=f"<u{encoded['width']}").tolist()
+
+
+def _flatten(rows: List[Dict[str, Any]], child_field: str) -> Tuple[List[Dict[str, Any]], List[int]]:
+    """Rows in pre-order with each row's parent position plus one (0 for top-level rows)"""
+    flat: List[Dict[str, Any]] = []
+    parents: List[int] = []
+    stack = [(row, 0) for row in reversed(rows)]
+    while stack:
+        row, parent = stack.pop()
+        flat.append(row)
+        parents.append(parent)
+        position = len(flat)
+        for child in reversed(row.get(child_field) or []):
+            stack.append((child, position))
+    return flat, parents
+
+
+def _encode_column(name: str, values: List[Any]) -> Dict[str, Any]:
+    missing = any(value is _MISSING for value in values)
+    scalar = all(value is None or isinstance(value, (str, int, float, bool)) or value is _MISSING
+                 for value in values)
+
+    if scalar:
+        dictionary: Dict[Any, int] = {}
+        codes = []
+        for value in values:
+            if value is _MISSING:
+                codes.append(-1)
+                continue
+            # 1, 1.0 and True hash alike, so keep their types apart in the dictionary
+            key = (type(value), value)
+            code = dictionary.get(key)
+            if code is None:
+                code = dictionary[key] = len(dictionary)
+            codes.append(code)
+
+        # Rows without the key carry the code just past the dictionary, which the decoder skips
+        if missing or len(dictionary) <= len(values) * DICTIONARY_RATIO:
+            absent = len(dictionary)
+            column = {"name": name, "dictionary": [value for _, value in dictionary]}
+            column.update(_pack([absent if code < 0 else code for code in codes]))
+            return column
+
+    if missing:
+        raise ValueError(f"Column '{name}' holds non-scalar values and is missing from some rows")
+    return {"name": name, "values": values}
+
+
+def encode_columnar(rows: List[Dict[str, Any]], child_field: Optional[str] = None) -> Dict[str, Any]:
+    """Encode rows (and, with child_field, their nested children) column by column"""
+    parents = None
+    if child_field:
+        rows, parents = _flatten(rows, child_field)
+
+    names: Dict[str, None] = {}
+    for row in rows:
+        for key in row:
+            if key != child_field:
+                names.setdefault(key)
+
+    payload: Dict[str, Any] = {
+        "format": FORMAT,
+        "version": VERSION,
+        "length": len(rows),
+        "columns": [_encode_column(name, [row.get(name, _MISSING) for row in rows]) for name in names],
+    }
+    if child_field:
+        payload["child_field"] = child_field
+        payload["parents"] = _pack(parents)
+    return payload
+
+
+def decode_columnar(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Rows back from encode_columnar, as the Browser decodes them"""
+    rows: List[Dict[str, Any]] = [{} for _ in range(payload["length"])]
+    for column in payload["columns"]:
+        name = column["name"]
+        if "dictionary" in column:
+            dictionary = column["dictionary"]
+            for row, code in zip(rows, _unpack(column)):
+                if code < len(dictionary):
+                    row[name] = dictionary[code]
+        else:
+            for row, value in zip(rows, column["values"]):
+                row[name] = value
+
+    if "parents" not in payload:
+        return rows
+    child_field = payload["child_field"]
+    top_level = []
+    for row, parent in zip(rows, _unpack(payload["parents"])):
+        if parent:
+            rows[parent - 1].setdefault(child_field, []).append(row)
+        else:
+            top_level.append(row)
+    return top_level
+
+
+def loads_table(data: Optional[str]) -> List[Dict[str, Any]]:
+    """Rows from a JSON string holding either a columnar payload or a plain list of rows"""
+    if not data:
+        return []
+    parsed = json.loads(data)
+    if isinstance(parsed, dict) and parsed.get("format") == FORMAT:
+        return decode_columnar(parsed)
+    return parsed
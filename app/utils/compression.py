@@ -0,0 +1,161 @@
+# utils/compression.py
+
+"""gzip and brotli compression of Dash Callback, API and static responses.
+
+Dash's own compress option needs flask-compress. Here one after_request hook
+compresses any response above COMPRESSION_CONFIG["min_bytes"] for Browsers
+that accept it, preferring br when brotli is installed. Static files carry an
+ETag or a cache lifetime and do not change between requests, so each one is
+compressed once per process and then served from memory. Streamed responses
+and responses that are already encoded (the precompressed /dist Bundles)
+pass through unchanged; streams that should be compressed, such as the table
+chunks from /api/tables, encode themselves with compress_stream.
+"""
+
+# Import Libraries
+import gzip
+import logging
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Iterable, Iterator, Optional, Tuple
+
+from flask import g, request
+
+from pkg.config import COMPRESSION_CONFIG
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger('TracerApp')
+
+# Statuses whose bodies must not be re-encoded
+_SKIP_STATUSES = (204, 206, 304)
+
+
+class CompressedCache:
+    """Compressed static bodies keyed by path, ETag and encoding, least recently used first out"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str, str], bytes]" = OrderedDict()
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def put(self, key: Tuple[str, str, str], body: bytes) -> None:
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+static_cache = CompressedCache(COMPRESSION_CONFIG["static_cache_entries"])
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=COMPRESSION_CONFIG["brotli_quality"])
+    return gzip.compress(body, compresslevel=COMPRESSION_CONFIG["gzip_level"])
+
+
+def accepted_encoding() -> Optional[str]:
+    """The encoding to send this request's response in, or None to send it uncompressed"""
+    if not COMPRESSION_CONFIG["enabled"]:
+        return None
+    if brotli is not None and request.accept_encodings["br"]:
+        return "br"
+    if request.accept_encodings["gzip"]:
+        return "gzip"
+    return None
+
+
+def compress_stream(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+    """Compress a streamed body, flushing after each chunk so the Browser can decode it on arrival"""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=COMPRESSION_CONFIG["brotli_quality"])
+        for chunk in chunks:
+            yield compressor.process(chunk) + compressor.flush()
+        yield compressor.finish()
+        return
+
+    # wbits 31 writes the gzip header and trailer
+    compressor = zlib.compressobj(COMPRESSION_CONFIG["gzip_level"], zlib.DEFLATED, 31)
+    for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+def _read_body(response, read: bool = True) -> Optional[bytes]:
+    """The response body, closing the file a send_file response was reading from"""
+    iterable = response.response
+    response.direct_passthrough = False
+    data = response.get_data() if read else None
+    if hasattr(iterable, "close"):
+        iterable.close()
+    return data
+
+
+def _compress_response(response):
+    if (
+        response.status_code < 200
+        or response.status_code in _SKIP_STATUSES
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in COMPRESSION_CONFIG["mimetypes"]
+    ):
+        return response
+    # Generators are streamed as they are produced; files (send_file) can be read whole
+    if response.is_streamed and not response.direct_passthrough:
+        return response
+    if response.content_length is not None and response.content_length < COMPRESSION_CONFIG["min_bytes"]:
+        return response
+
+    # The representation depends on Accept-Encoding even when this client gets it uncompressed
+    response.vary.add("Accept-Encoding")
+    encoding = accepted_encoding()
+    if encoding is None:
+        return response
+
+    # Static files have an ETag (send_file) or a cache lifetime (Dash's fingerprinted component suites)
+    etag, _ = response.get_etag()
+    cacheable = request.method == "GET" and (etag or response.cache_control.max_age)
+    key = (request.full_path, etag or "", encoding) if cacheable else None
+    body = static_cache.get(key) if key else None
+    if body is None:
+        data = _read_body(response)
+        if len(data) < COMPRESSION_CONFIG["min_bytes"]:
+            return response
+        body = compress(data, encoding)
+        if key:
+            static_cache.put(key, body)
+    else:
+        data = _read_body(response, read=False)
+
+    g.tracer_uncompressed_bytes = len(data) if data is not None else response.content_length
+    response.set_data(body)
+    response.headers["Content-Encoding"] = encoding
+    if etag:
+        # Weak, so If-None-Match still matches the ETag of the uncompressed file
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def install_compression(server) -> None:
+    """Compress the Server's responses; install after the request instrumentation,
+    whose after_request hook then sees the compressed size"""
+    if not COMPRESSION_CONFIG["enabled"]:
+        logger.info("Response compression is disabled")
+        return
+    server.after_request(_compress_response)
@@ -0,0 +1,230 @@
+# utils/coverage.py
+
+"""Traceability Coverage between Node Type layers, computed with sparse boolean matrix products"""
+
+# Import Libraries
+import logging
+import threading
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+from scipy import sparse
+
+from models.model import Model
+from pkg.config import COVERAGE_CONFIG
+from utils.sparse_metrics import SparseGraph, get_sparse_graph
+
+logger = logging.getLogger('TracerApp')
+
+
+class CoverageChain:
+    """Node Type layers a trace must pass through, e.g. Goal > Strategy > Solution"""
+
+    def __init__(self, layers: List[str], edge_types: Optional[FrozenSet[str]] = None):
+        if len(layers) < 2:
+            raise ValueError("A Coverage Chain needs at least two Node Types")
+        self.layers = layers
+        self.edge_types = edge_types or None
+
+    @property
+    def label(self) -> str:
+        label = " > ".join(self.layers)
+        if self.edge_types:
+            label += f" @ {', '.join(sorted(self.edge_types))}"
+        return label
+
+
+def parse_coverage_chains(spec: str) -> List[CoverageChain]:
+    """Parse "Goal>Strategy>Solution@SupportedBy;Requirement>Evidence" """
+    chains = []
+    for text in spec.split(';'):
+        if not text.strip():
+            continue
+        layers, _, edge_types = text.partition('@')
+        chains.append(CoverageChain(
+            [layer.strip() for layer in layers.split('>') if layer.strip()],
+            frozenset(t.strip() for t in edge_types.split(',') if t.strip()),
+        ))
+    return chains
+
+
+class CoverageEngine:
+    """Coverage of each Node Type layer of a Chain by the layers after it.
+
+    A Node of layer i is covered when it reaches a Node of the last layer by
+    Edges that step from each layer to the next. The reachability matrix of
+    layer i is the boolean product of the layer-to-layer Adjacency blocks
+    M_i @ M_{i+1} @ ... @ M_{k-1}, built from the last layer backwards.
+    """
+
+    def __init__(self, G: nx.MultiDiGraph, S: SparseGraph, node_types: List[Any]):
+        self.sparse = S
+
+        # Node Types may be named by id, identifier or name
+        self.type_names: Dict[str, str] = {}
+        self._type_keys: Dict[str, str] = {}
+        for node_type in node_types:
+            self.type_names[node_type.id] = node_type.name
+            for key in (node_type.id, node_type.identifier, node_type.name):
+                if key:
+                    self._type_keys[str(key)] = node_type.id
+
+        type_ids = sorted(self.type_names)
+        type_index = {t: i for i, t in enumerate(type_ids)}
+        self.type_ids = type_ids
+        self.node_types = np.fromiter(
+            (type_index.get(d.get('node_type_id'), -1) for _, d in G.nodes(data=True)),
+            dtype=np.int64, count=S.number_of_nodes,
+        )
+
+        # Edge Types may be named by id or name
+        self.edge_type_keys = [
+            (str(d.get('edge_type_id') or ''), str(d.get('relationship_type') or ''))
+            for _, _, d in G.edges(data=True)
+        ]
+
+    def resolve_type(self, key: str) -> str:
+        if key not in self._type_keys:
+            raise ValueError(f"Unknown Node Type '{key}'")
+        return self._type_keys[key]
+
+    def _layer_mask(self, type_id: str) -> np.ndarray:
+        return self.node_types == self.type_ids.index(type_id)
+
+    def _edge_mask(self, edge_types: Optional[FrozenSet[str]]) -> np.ndarray:
+        if not edge_types:
+            return np.ones(self.sparse.number_of_edges, dtype=bool)
+        return np.fromiter(
+            (type_id in edge_types or name in edge_types for type_id, name in self.edge_type_keys),
+            dtype=bool, count=len(self.edge_type_keys),
+        )
+
+    def default_chains(self) -> List[CoverageChain]:
+        """One-step Chains for every (source Type, target Type) pair joined by an Edge"""
+        S = self.sparse
+        source_types, target_types = self.node_types[S.sources], self.node_types[S.targets]
+        typed = (source_types >= 0) & (target_types >= 0) & (source_types != target_types)
+        pairs = np.unique(np.stack([source_types[typed], target_types[typed]], axis=1), axis=0)
+        return [
+            CoverageChain([self.type_names[self.type_ids[a]], self.type_names[self.type_ids[b]]])
+            for a, b in pairs.tolist()
+        ]
+
+    def evaluate(self, chain: CoverageChain) -> Dict[str, Any]:
+        """Coverage of every layer of a Chain, the Nodes left uncovered and the
+        first-to-last layer coverage matrix"""
+        S = self.sparse
+        type_ids = [self.resolve_type(layer) for layer in chain.layers]
+        edge_mask = self._edge_mask(chain.edge_types)
+        adjacency = sparse.csr_matrix(
+            (np.ones(int(edge_mask.sum()), dtype=bool), (S.sources[edge_mask], S.targets[edge_mask])),
+            shape=(S.number_of_nodes, S.number_of_nodes),
+        )
+
+        layers = [np.flatnonzero(self._layer_mask(t)) for t in type_ids]
+        reach = sparse.identity(len(layers[-1]), dtype=bool, format='csr')
+        reaches = [reach]
+        for i in range(len(layers) - 2, -1, -1):
+            step = adjacency[layers[i]][:, layers[i + 1]]
+            reach = (step @ reach).astype(bool)
+            reach.eliminate_zeros()
+            reaches.insert(0, reach)
+
+        steps = []
+        for layer, type_id, reach in zip(layers, type_ids, reaches):
+            covered = int(np.count_nonzero(reach.getnnz(axis=1)))
+            steps.append({
+                'layer': self.type_names[type_id],
+                'nodes': len(layer),
+                'covered': covered,
+                'coverage': round(100.0 * covered / len(layer), 2) if len(layer) else None,
+            })
+
+        uncovered = layers[0][reaches[0].getnnz(axis=1) == 0]
+        return {
+            'chain': chain.label,
+            'layers': [self.type_names[t] for t in type_ids],
+            'nodes': steps[0]['nodes'],
+            'covered': steps[0]['covered'],
+            'coverage': steps[0]['coverage'],
+            'steps': steps,
+            'uncovered': [S.node_ids[i] for i in uncovered],
+            'matrix': reaches[0],
+            'sources': [S.node_ids[i] for i in layers[0]],
+            'targets': [S.node_ids[i] for i in layers[-1]],
+        }
+
+    def report(self, chains: Optional[List[CoverageChain]] = None) -> List[Dict[str, Any]]:
+        """Evaluate the configured Chains (or the default ones); a Chain naming
+        an unknown Node Type is reported with its error"""
+        if chains is None:
+            chains = parse_coverage_chains(COVERAGE_CONFIG['chains']) or self.default_chains()
+        results = []
+        for chain in chains:
+            try:
+                results.append(self.evaluate(chain))
+            except ValueError as e:
+                results.append({'chain': chain.label, 'error': str(e)})
+        return results
+
+
+def coverage_matrix_pairs(result: Dict[str, Any]) -> List[Tuple[Any, Any]]:
+    """(first layer Node, last layer Node) pairs of a Chain's coverage matrix"""
+    coo = result['matrix'].tocoo()
+    return [(result['sources'][i], result['targets'][j]) for i, j in zip(coo.row.tolist(), coo.col.tolist())]
+
+
+def summarize_coverage(report: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """JSON-safe form of a report, with the uncovered lists capped"""
+    limit = COVERAGE_CONFIG['max_uncovered']
+    summary = []
+    for result in report:
+        if 'error' in result:
+            summary.append(result)
+            continue
+        summary.append({
+            **{k: v for k, v in result.items() if k not in ('matrix', 'sources', 'targets', 'uncovered')},
+            'uncovered': result['uncovered'][:limit],
+            'uncovered_count': len(result['uncovered']),
+        })
+    return summary
+
+
+# ==================== Per-Version Cache ====================
+
+_report_cache: Dict[Tuple, List[Dict[str, Any]]] = {}
+_report_cache_lock = threading.Lock()
+
+
+def get_coverage_report(G: nx.MultiDiGraph, graph_version: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Return the Coverage report for G, computing it only once per Graph Version"""
+    key = (graph_version, id(G), G.number_of_nodes(), G.number_of_edges())
+    with _report_cache_lock:
+        cached = _report_cache.get(key)
+        if cached is not None:
+            return cached
+
+    engine = CoverageEngine(G, get_sparse_graph(G, graph_version), Model().get_node_types())
+    report = engine.report()
+    with _report_cache_lock:
+        _report_cache.clear()
+        _report_cache[key] = report
+    logger.info(f"Computed Coverage for {len(report)} Chains")
+    return report
+
+
+def uncovered_rows(report: List[Dict[str, Any]], G: nx.MultiDiGraph) -> List[Dict[str, Any]]:
+    """One export row per uncovered Node of every Chain"""
+    rows = []
+    for result in report:
+        for node_id in result.get('uncovered', []):
+            data = G.nodes[node_id] if node_id in G else {}
+            rows.append({
+                'Chain': result['chain'],
+                'Coverage (%)': result['coverage'],
+                'Node ID': node_id,
+                'Identifier': data.get('identifier', ''),
+                'Name': data.get('name', ''),
+            })
+    return rows
@@ -0,0 +1,264 @@
+# utils/cycle_detection.py
+
+"""Online Cycle Detection by incremental Topological Order maintenance (Pearce-Kelly)"""
+
+# Import Libraries
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger('TracerApp')
+
+POLICIES = ('reject', 'flag', 'allow')
+
+
+class IncrementalTopologicalOrder:
+    """Keeps a topological order of a DAG while Edges are added and removed.
+
+    Adding u -> v where u already precedes v costs nothing. Otherwise only the
+    Nodes positioned between v and u are searched and reordered (Pearce and
+    Kelly, 2006), which is far below a full traversal in the amortised case.
+    An Edge that would close a cycle is not added; add_edge returns the cycle.
+
+    Edges are tracked by id, so parallel Edges and moves are supported, and
+    Edges refused because of a cycle can be kept aside as flagged.
+    """
+
+    def __init__(self):
+        self.position: Dict[Any, int] = {}
+        self._successors: Dict[Any, Dict[Any, int]] = {}
+        self._predecessors: Dict[Any, Dict[Any, int]] = {}
+        self.edges: Dict[str, Tuple[Any, Any]] = {}
+        # Edges on a cycle that were kept (policy 'flag') rather than rejected
+        self.flagged: Dict[str, Tuple[Any, Any]] = {}
+        self._next_position = 0
+
+    @classmethod
+    def from_edges(cls, edges: Iterable[Tuple[str, Any, Any]], nodes: Iterable[Any] = ()) -> "IncrementalTopologicalOrder":
+        """Build the order in one pass: Nodes are placed in DFS reverse
+        postorder, so only back Edges need the incremental search (and those
+        are flagged, as each closes a cycle)"""
+        order = cls()
+        edges = list(edges)
+        successors: Dict[Any, List[Any]] = {node: [] for node in nodes}
+        for _, u, v in edges:
+            successors.setdefault(u, []).append(v)
+            successors.setdefault(v, [])
+
+        postorder, visited = [], set()
+        for start in successors:
+            if start in visited:
+                continue
+            visited.add(start)
+            stack = [(start, iter(successors[start]))]
+            while stack:
+                node, children = stack[-1]
+                child = next(children, None)
+                if child is None:
+                    stack.pop()
+                    postorder.append(node)
+                elif child not in visited:
+                    visited.add(child)
+                    stack.append((child, iter(successors[child])))
+
+        for node in reversed(postorder):
+            order.add_node(node)
+        for edge_id, u, v in edges:
+            if order.add_edge(edge_id, u, v) is not None:
+                order.flagged[edge_id] = (u, v)
+        return order
+
+    # ==================== Nodes and Edges ====================
+
+    def add_node(self, node: Any) -> None:
+        if node not in self.position:
+            self.position[node] = self._next_position
+            self._next_position += 1
+            self._successors[node] = {}
+            self._predecessors[node] = {}
+
+    def _link(self, u: Any, v: Any) -> None:
+        self._successors[u][v] = self._successors[u].get(v, 0) + 1
+        self._predecessors[v][u] = self._predecessors[v].get(u, 0) + 1
+
+    def _unlink(self, u: Any, v: Any) -> None:
+        for links, a, b in ((self._successors, u, v), (self._predecessors, v, u)):
+            links[a][b] -= 1
+            if not links[a][b]:
+                del links[a][b]
+
+    def add_edge(self, edge_id: str, u: Any, v: Any) -> Optional[List[Any]]:
+        """Add an Edge, or return the cycle it would close (u, v, ..., u)"""
+        self.add_node(u)
+        self.add_node(v)
+        if u == v:
+            return [u, u]
+
+        lower, upper = self.position[v], self.position[u]
+        if lower < upper:
+            # v precedes u: search forward from v for u within the affected region
+            forward, parent = self._search(v, self._successors, lambda p: p <= upper, target=u)
+            if u in parent:
+                path = [u]
+                while path[-1] != v:
+                    path.append(parent[path[-1]])
+                return [u] + path[::-1]
+            backward, _ = self._search(u, self._predecessors, lambda p: p >= lower)
+            self._reorder(backward, forward)
+
+        self._link(u, v)
+        self.edges[edge_id] = (u, v)
+        return None
+
+    def remove_edge(self, edge_id: str) -> Optional[Tuple[Any, Any]]:
+        """Remove an Edge (ordered or flagged); the order stays valid as is"""
+        if edge_id in self.flagged:
+            return self.flagged.pop(edge_id)
+        ends = self.edges.pop(edge_id, None)
+        if ends is not None:
+            self._unlink(*ends)
+        return ends
+
+    def readmit_flagged(self) -> int:
+        """Add back flagged Edges whose cycles have since been broken"""
+        readmitted = 0
+        for edge_id, (u, v) in list(self.flagged.items()):
+            del self.flagged[edge_id]
+            if self.add_edge(edge_id, u, v) is None:
+                readmitted += 1
+            else:
+                self.flagged[edge_id] = (u, v)
+        return readmitted
+
+    # ==================== Pearce-Kelly ====================
+
+    def _search(self, start: Any, links: Dict[Any, Dict[Any, int]], within,
+                target: Any = None) -> Tuple[List[Any], Dict[Any, Any]]:
+        """Depth-first search over Nodes whose position satisfies within"""
+        visited, parent = [start], {start: None}
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            for other in links[node]:
+                if other in parent or not within(self.position[other]):
+                    continue
+                parent[other] = node
+                if other == target:
+                    return visited, parent
+                visited.append(other)
+                stack.append(other)
+        return visited, parent
+
+    def _reorder(self, backward: List[Any], forward: List[Any]) -> None:
+        """Move the Nodes that reach u before those reachable from v, reusing
+        the same set of positions"""
+        backward.sort(key=self.position.__getitem__)
+        forward.sort(key=self.position.__getitem__)
+        nodes = backward + forward
+        for node, position in zip(nodes, sorted(self.position[node] for node in nodes)):
+            self.position[node] = position
+
+    def is_valid(self) -> bool:
+        return all(self.position[u] < self.position[v] for u, v in self.edges.values())
+
+
+class CycleGuard:
+    """One Topological Order per Edge Type, deciding whether an Edge write
+    that closes a cycle among Edges of its Type is rejected, flagged or allowed.
+
+    The Guard is kept in step with the database through the GraphChange log:
+    graph_version is the last change it has applied.
+    """
+
+    def __init__(self, default_policy: str = 'flag', edge_type_policies: Optional[Dict[str, str]] = None):
+        self.default_policy = default_policy
+        self.edge_type_policies = dict(edge_type_policies or {})
+        for policy in [default_policy, *self.edge_type_policies.values()]:
+            if policy not in POLICIES:
+                raise ValueError(f"Unknown cycle policy '{policy}'")
+
+        self.graph_version: Optional[int] = None
+        self.type_names: Dict[str, str] = {}
+        self.orders: Dict[str, IncrementalTopologicalOrder] = {}
+        self.edge_types: Dict[str, str] = {}
+        # Held by the Model from the check of a write until the write is committed
+        self.lock = threading.RLock()
+
+    def policy_for(self, edge_type_id: str) -> str:
+        """Policy for an Edge Type, matched on its name, then its id"""
+        for key in (self.type_names.get(edge_type_id), edge_type_id):
+            if key is not None and key in self.edge_type_policies:
+                return self.edge_type_policies[key]
+        return self.default_policy
+
+    def rebuild(self, edges: Iterable[Tuple[str, str, str, str]], type_names: Dict[str, str],
+                graph_version: int) -> None:
+        """Build the Orders from (Edge id, source, target, Edge Type id) rows"""
+        self.type_names = dict(type_names)
+        by_type: Dict[str, List[Tuple[str, str, str]]] = {}
+        self.edge_types = {}
+        for edge_id, source, target, edge_type_id in edges:
+            if self.policy_for(edge_type_id) == 'allow':
+                continue
+            by_type.setdefault(edge_type_id, []).append((edge_id, source, target))
+            self.edge_types[edge_id] = edge_type_id
+        self.orders = {
+            edge_type_id: IncrementalTopologicalOrder.from_edges(type_edges)
+            for edge_type_id, type_edges in by_type.items()
+        }
+        self.graph_version = graph_version
+
+        flagged = sum(len(order.flagged) for order in self.orders.values())
+        if flagged:
+            logger.warning(f"{flagged} stored Edges close a cycle among Edges of their Edge Type")
+
+    def remove(self, edge_id: str) -> Optional[Tuple[str, str]]:
+        edge_type_id = self.edge_types.pop(edge_id, None)
+        if edge_type_id is None:
+            return None
+        return self.orders[edge_type_id].remove_edge(edge_id)
+
+    def add(self, edge_id: str, source: str, target: str, edge_type_id: str,
+            reject: bool = False) -> Optional[List[str]]:
+        """Add an Edge and return the cycle it closes, if any. A cyclic Edge is
+        flagged, or left out altogether with reject=True"""
+        if self.policy_for(edge_type_id) == 'allow':
+            return None
+        order = self.orders.setdefault(edge_type_id, IncrementalTopologicalOrder())
+        cycle = order.add_edge(edge_id, source, target)
+        if cycle is not None and not reject:
+            order.flagged[edge_id] = (source, target)
+        if cycle is None or not reject:
+            self.edge_types[edge_id] = edge_type_id
+        return cycle
+
+    def apply(self, removed: Iterable[str], edges: Iterable[Tuple[str, str, str, str]],
+              graph_version: int) -> None:
+        """Apply logged Edge changes: the removed (or changed) Edge ids and the
+        current rows of those Edges that still exist"""
+        touched = set()
+        for edge_id in removed:
+            if edge_id in self.edge_types:
+                touched.add(self.edge_types[edge_id])
+                self.remove(edge_id)
+        for edge_id, source, target, edge_type_id in edges:
+            self.add(edge_id, source, target, edge_type_id)
+        # Removing an Edge may break the cycle a flagged Edge closed
+        for edge_type_id in touched:
+            if self.orders[edge_type_id].flagged:
+                self.orders[edge_type_id].readmit_flagged()
+        self.graph_version = graph_version
+
+    def check(self, edge_id: str, source: str, target: str, edge_type_id: str,
+              previous: Optional[Tuple[str, str, str]] = None) -> Tuple[str, Optional[List[str]]]:
+        """Apply a pending write of an Edge (replacing its previous source,
+        target and Edge Type) and return its policy with the cycle it closes.
+
+        A rejected write leaves the Guard as it was.
+        """
+        policy = self.policy_for(edge_type_id)
+        self.remove(edge_id)
+        cycle = self.add(edge_id, source, target, edge_type_id, reject=policy == 'reject')
+        if cycle is not None and policy == 'reject' and previous is not None:
+            self.add(edge_id, *previous)
+        return policy, cycle
@@ -0,0 +1,292 @@
+# utils/cytoscape_cache.py
+
+"""Pre-encoded Cytoscape Element JSON cached per (Graph Version, Root)"""
+
+# Import Libraries
+import gzip
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+
+from pkg.config import GRAPH_VIEW_CONFIG
+from utils.graph_aggregation import GraphHierarchy, diff_elements, get_graph_hierarchy
+from utils.graph_queries import GraphQueryError, get_graph_query_service
+from utils import cache_utils
+from utils.network_utils import networkx_to_cytoscape
+from utils.reachability import get_reachability_index
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger('TracerApp')
+
+ALL_ROOTS = "all"
+# View keys of the form "focus:<hops>:<Node ID>" select a Node's neighbourhood instead of a Root
+FOCUS_PREFIX = "focus:"
+MAX_ENTRIES = 32
+
+
+class CytoscapePayload:
+    """The encoded Elements for one (Graph Version, Root), compressed on demand"""
+
+    def __init__(self, graph_version: int, root: str, body: bytes, node_count: int, edge_count: int,
+                 lod: bool = False, elements: Optional[list] = None):
+        self.graph_version = graph_version
+        self.lod = lod
+        self.root = root
+        self.body = body
+        self.elements = elements or []
+        self.node_count = node_count
+        self.edge_count = edge_count
+        self.etag = hashlib.sha1(body).hexdigest()[:20]
+        self._encoded: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def encode(self, encoding: Optional[str]) -> bytes:
+        if not encoding:
+            return self.body
+        with self._lock:
+            if encoding not in self._encoded:
+                if encoding == 'br':
+                    self._encoded[encoding] = brotli.compress(self.body, quality=5)
+                elif encoding == 'gzip':
+                    self._encoded[encoding] = gzip.compress(self.body, compresslevel=6)
+                else:
+                    raise ValueError(f"Unsupported Content Encoding '{encoding}'")
+            return self._encoded[encoding]
+
+    def representation_etag(self, encoding: Optional[str]) -> str:
+        """Each Content Encoding is a distinct representation with its own ETag"""
+        return f"{self.etag}-{encoding}" if encoding else self.etag
+
+    def descriptor(self, src: str) -> Dict[str, Any]:
+        """What the Graphs page stores instead of the Elements themselves"""
+        return {
+            'src': src,
+            'graph_version': self.graph_version,
+            'root': self.root,
+            'etag': self.etag,
+            'nodes': self.node_count,
+            'edges': self.edge_count,
+            'lod': self.lod,
+        }
+
+
+def focus_view_key(node_id: str, hops: int = 1) -> str:
+    return f"{FOCUS_PREFIX}{int(hops)}:{node_id}"
+
+
+def _parse_focus_view_key(root: str) -> Tuple[str, int]:
+    hops, _, node_id = root[len(FOCUS_PREFIX):].partition(':')
+    if not hops.isdigit() or not node_id:
+        raise GraphQueryError(f"View key '{root}' is not of the form '{FOCUS_PREFIX}<hops>:<Node ID>'")
+    return node_id, int(hops)
+
+
+def choose_encoding(accept_encodings) -> Optional[str]:
+    """Pick brotli (when installed) or gzip from a Werkzeug Accept-Encoding header"""
+    if brotli is not None and accept_encodings['br']:
+        return 'br'
+    if accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+
+# ==================== Cache ====================
+
+_payloads: "OrderedDict[Tuple[int, str], CytoscapePayload]" = OrderedDict()
+_payloads_lock = threading.Lock()
+
+# The Graph, full Element list and Element fingerprints of the latest Version, shared by every Root
+_graph_entry: Optional[Tuple[int, nx.MultiDiGraph, list, List[int]]] = None
+
+# Element id -> fingerprint for recently served (Graph Version, Root) Views
+_views: "OrderedDict[Tuple[int, str], Dict[str, int]]" = OrderedDict()
+
+
+def _fingerprint(element: Dict[str, Any]) -> int:
+    return hash(json.dumps(element, sort_keys=True, separators=(',', ':')))
+
+
+def _get_graph_entry(graph_version: int) -> Tuple[nx.MultiDiGraph, list, List[int]]:
+    global _graph_entry
+    if _graph_entry is None or _graph_entry[0] != graph_version:
+        G = cache_utils.get_network(graph_version)
+        if G is None:
+            G = nx.MultiDiGraph()
+        elements = networkx_to_cytoscape(G)['elements']
+        _graph_entry = (graph_version, G, elements, [_fingerprint(e) for e in elements])
+    return _graph_entry[1], _graph_entry[2], _graph_entry[3]
+
+
+def get_graph_elements(graph_version: int) -> Tuple[nx.MultiDiGraph, list]:
+    """The Graph and its full Element list (in Index order) for a Graph Version"""
+    G, elements, _ = _get_graph_entry(graph_version)
+    return G, elements
+
+
+def _remember_view(graph_version: int, root: str, fingerprints: Dict[str, int]) -> None:
+    with _payloads_lock:
+        _views[(graph_version, root)] = fingerprints
+        _views.move_to_end((graph_version, root))
+        while len(_views) > GRAPH_VIEW_CONFIG['patch_history']:
+            _views.popitem(last=False)
+
+
+def _build_payload(graph_version: int, root: str) -> CytoscapePayload:
+    G, elements, fingerprints = _get_graph_entry(graph_version)
+    index = get_reachability_index(G, graph_version)
+
+    node_indices = edge_indices = None
+    node_count, edge_count = G.number_of_nodes(), G.number_of_edges()
+    focused = root.startswith(FOCUS_PREFIX)
+    if focused:
+        node_id, hops = _parse_focus_view_key(root)
+        try:
+            node_indices, edge_indices = get_graph_query_service(G, graph_version).ego_indices(node_id, hops)
+        except GraphQueryError as e:
+            logger.warning(f"Unable to focus the View: {e}")
+            node_indices = edge_indices = np.zeros(0, dtype=np.int64)
+        node_count, edge_count = len(node_indices), len(edge_indices)
+    elif root != ALL_ROOTS:
+        bits = index.descendant_bits(root)
+        node_indices, edge_indices = index.node_indices(bits), index.edge_indices(bits)
+        node_count, edge_count = len(node_indices), len(edge_indices)
+
+    data: Dict[str, Any] = {'graph_version': graph_version, 'root': root}
+    # A focused View is already bounded by its hop count
+    lod = not focused and node_count > GRAPH_VIEW_CONFIG['lod_node_threshold']
+    if lod:
+        # Too large to render, so send a coarse View whose Clusters expand on demand
+        hierarchy = get_lod_hierarchy(G, graph_version, root)
+        expanded = hierarchy.default_expanded(GRAPH_VIEW_CONFIG['lod_node_budget'])
+        data['elements'] = hierarchy.elements(elements, expanded)
+        data['lod'] = {
+            'root': root,
+            'graph_version': graph_version,
+            'expanded': [index.sparse.node_ids[i] for i in sorted(expanded)],
+        }
+    else:
+        if node_indices is not None:
+            # Node and Edge Elements are in Index order, so the Root's subgraph is a bitset selection
+            n = G.number_of_nodes()
+            selected = node_indices.tolist() + (n + edge_indices).tolist()
+        else:
+            selected = range(len(elements))
+        data['elements'] = [elements[i] for i in selected]
+        _remember_view(graph_version, root, {elements[i]['data']['id']: fingerprints[i] for i in selected})
+
+    body = json.dumps(data, separators=(',', ':')).encode('utf-8')
+    logger.info(
+        f"Encoded {len(data['elements'])} Cytoscape Elements ({len(body)} bytes) "
+        f"for Graph Version {graph_version}, Root '{root}'"
+    )
+    return CytoscapePayload(graph_version, root, body, node_count, edge_count, lod=lod, elements=data['elements'])
+
+
+def get_element_patch(from_version: int, from_root: str, root: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Elements to add, remove and update to turn a View the browser already
+    shows into the current one, or None when it has to be reloaded in full"""
+    payload = get_cytoscape_payload(root)
+    with _payloads_lock:
+        old = _views.get((from_version, from_root or ALL_ROOTS))
+        new = _views.get((payload.graph_version, payload.root))
+    if payload.lod or old is None:
+        return None
+    if new is None:
+        # The cached Payload outlived its View
+        new = {e['data']['id']: _fingerprint(e) for e in payload.elements}
+        _remember_view(payload.graph_version, payload.root, new)
+
+    patch = {
+        'graph_version': payload.graph_version,
+        'root': payload.root,
+        'etag': payload.etag,
+        'add': [],
+        'remove': [element_id for element_id in old if element_id not in new],
+        'update': [],
+    }
+    for element in payload.elements:
+        element_id = element['data']['id']
+        if element_id not in old:
+            patch['add'].append(element)
+        elif old[element_id] != new[element_id]:
+            patch['update'].append({'data': element['data'], 'classes': element.get('classes', '')})
+    return patch
+
+
+def get_lod_hierarchy(G: nx.MultiDiGraph, graph_version: int, root: str) -> GraphHierarchy:
+    index = get_reachability_index(G, graph_version)
+    if root == ALL_ROOTS:
+        return get_graph_hierarchy(index.sparse, graph_version, root_indices=index.root_indices)
+    return get_graph_hierarchy(index.sparse, graph_version, root=root)
+
+
+def get_lod_patch(graph_version: int, root: str, expanded: List[str], node_id: str,
+                  collapse: bool = False) -> Dict[str, Any]:
+    """Elements to add, remove and update when a Cluster of the client's View
+    is expanded (or collapsed), so the browser merges them in place"""
+    G, elements = get_graph_elements(graph_version)
+    index = get_reachability_index(G, graph_version)
+    hierarchy = get_lod_hierarchy(G, graph_version, root or ALL_ROOTS)
+    interned = index.sparse.index
+
+    before = {interned[i] for i in expanded if i in interned}
+    after = set(before)
+    if node_id in interned:
+        if collapse:
+            after.discard(interned[node_id])
+        else:
+            after.add(interned[node_id])
+
+    patch = diff_elements(hierarchy.elements(elements, before), hierarchy.elements(elements, after))
+    patch['graph_version'] = graph_version
+    patch['expanded'] = [index.sparse.node_ids[i] for i in sorted(after)]
+    return patch
+
+
+def get_graph_version() -> int:
+    return cache_utils.get_graph_version()
+
+
+def get_cytoscape_payload(root: Optional[str] = None) -> CytoscapePayload:
+    """Return the encoded Elements for the current Graph Version and a Root
+    (or all Roots), building them only on a cache miss; a malformed focus View
+    key raises GraphQueryError"""
+    root = root or ALL_ROOTS
+    if root.startswith(FOCUS_PREFIX):
+        _parse_focus_view_key(root)
+    graph_version = get_graph_version()
+    key = (graph_version, root)
+
+    with _payloads_lock:
+        payload = _payloads.get(key)
+        if payload is not None:
+            _payloads.move_to_end(key)
+            return payload
+
+    payload = _build_payload(graph_version, root)
+    with _payloads_lock:
+        # Entries for older Versions can never be served again
+        for stale in [k for k in _payloads if k[0] < graph_version]:
+            del _payloads[stale]
+        _payloads[key] = payload
+        while len(_payloads) > MAX_ENTRIES:
+            _payloads.popitem(last=False)
+    return payload
+
+
+def clear_cytoscape_cache() -> None:
+    global _graph_entry
+    with _payloads_lock:
+        _payloads.clear()
+        _views.clear()
+        _graph_entry = None
@@ -0,0 +1,225 @@
+# utils/graph_aggregation.py
+
+"""Level-of-detail Views: Subtrees collapsed into Cluster Nodes with weighted Meta-Edges"""
+
+# Import Libraries
+import logging
+import threading
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from scipy.sparse.csgraph import breadth_first_order
+
+from utils.sparse_metrics import SparseGraph
+
+logger = logging.getLogger('TracerApp')
+
+
+class GraphHierarchy:
+    """Spanning forest over the interned Nodes reachable from the start Nodes.
+
+    Every Node is given the single parent that first reached it, so each Node
+    heads a Cluster made of its spanning subtree. A View is the set of
+    expanded Clusters: a Node is visible when its parent is visible and
+    expanded, and every hidden Node is represented by its nearest visible
+    ancestor.
+    """
+
+    def __init__(self, S: SparseGraph, starts: Iterable[int], include_unreached: bool = False):
+        self.sparse = S
+        n = S.number_of_nodes
+        parent = np.full(n, -1, dtype=np.int64)
+        claimed = np.zeros(n, dtype=bool)
+        order: List[np.ndarray] = []
+        tops: List[int] = []
+
+        for start in starts:
+            if claimed[start]:
+                continue
+            reached, predecessors = breadth_first_order(S.adjacency, int(start), directed=True)
+            # Earlier starts keep the Nodes they claimed
+            reached = reached[~claimed[reached]]
+            parent[reached[1:]] = predecessors[reached[1:]]
+            claimed[reached] = True
+            order.append(reached)
+            tops.append(int(start))
+
+        if include_unreached:
+            # Nodes no start reaches (isolated or only on cycles) head their own trees
+            indptr, indices = S.adjacency.indptr, S.adjacency.indices
+            for start in np.flatnonzero(~claimed):
+                if claimed[start]:
+                    continue
+                claimed[start] = True
+                tops.append(int(start))
+                reached, queue = [int(start)], deque([int(start)])
+                while queue:
+                    u = queue.popleft()
+                    for v in indices[indptr[u]:indptr[u + 1]]:
+                        if not claimed[v]:
+                            claimed[v] = True
+                            parent[v] = u
+                            reached.append(int(v))
+                            queue.append(int(v))
+                order.append(np.array(reached, dtype=np.int64))
+
+        self.parent = parent
+        self.in_region = claimed
+        self.tops = np.array(tops, dtype=np.int64)
+        self.order = np.concatenate(order) if order else np.zeros(0, dtype=np.int64)
+
+        # Depth and subtree size follow from the (parents first) BFS order
+        depth = np.full(n, -1, dtype=np.int64)
+        depth[self.tops] = 0
+        parents = parent.tolist()
+        depth_list = depth.tolist()
+        for v in self.order.tolist():
+            p = parents[v]
+            if p >= 0:
+                depth_list[v] = depth_list[p] + 1
+        self.depth = np.array(depth_list, dtype=np.int64)
+
+        size = np.where(claimed, 1, 0)
+        size_list = size.tolist()
+        for v in reversed(self.order.tolist()):
+            p = parents[v]
+            if p >= 0:
+                size_list[p] += size_list[v]
+        self.subtree_size = np.array(size_list, dtype=np.int64)
+        self.child_count = np.bincount(parent[parent >= 0], minlength=n)
+
+        by_depth = self.order[np.argsort(self.depth[self.order], kind='stable')]
+        boundaries = np.flatnonzero(np.diff(self.depth[by_depth])) + 1
+        self.levels = np.split(by_depth, boundaries) if len(by_depth) else []
+
+        children_order = np.argsort(parent, kind='stable')
+        children_order = children_order[parent[children_order] >= 0]
+        self._children_start = np.searchsorted(parent[children_order], np.arange(n))
+        self._children = children_order
+
+    def children(self, i: int) -> np.ndarray:
+        start = self._children_start[i]
+        return self._children[start:start + self.child_count[i]]
+
+    def default_expanded(self, budget: int) -> Set[int]:
+        """Expand Clusters breadth-first while the View stays within budget Nodes"""
+        visible = len(self.tops)
+        expanded: Set[int] = set()
+        queue = deque(self.tops.tolist())
+        while queue:
+            i = queue.popleft()
+            k = int(self.child_count[i])
+            if k == 0 or visible + k > budget:
+                continue
+            expanded.add(i)
+            visible += k
+            queue.extend(self.children(i).tolist())
+        return expanded
+
+    def view(self, expanded: Set[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """Visible Node mask and the visible representative of every Node"""
+        n = self.sparse.number_of_nodes
+        expanded_mask = np.zeros(n, dtype=bool)
+        if expanded:
+            expanded_mask[list(expanded)] = True
+
+        visible = np.zeros(n, dtype=bool)
+        representative = np.arange(n)
+        if self.levels:
+            visible[self.levels[0]] = True
+        for level in self.levels[1:]:
+            p = self.parent[level]
+            shown = visible[p] & expanded_mask[p]
+            visible[level] = shown
+            representative[level] = np.where(shown, level, representative[p])
+        return visible, representative
+
+    def elements(self, full_elements: List[Dict[str, Any]], expanded: Set[int]) -> List[Dict[str, Any]]:
+        """Cytoscape Elements for a View: visible Nodes (collapsed ones as
+        Clusters), real Edges between visible Nodes and Meta-Edges for the rest"""
+        S = self.sparse
+        n = S.number_of_nodes
+        visible, representative = self.view(expanded)
+
+        elements = []
+        for i in np.flatnonzero(visible).tolist():
+            data = dict(full_elements[i]['data'])
+            hidden = 0 if i in expanded else int(self.subtree_size[i]) - 1
+            data['hidden'] = hidden
+            data['expanded'] = bool(i in expanded and self.child_count[i] > 0)
+            element = {'group': 'nodes', 'data': data}
+            if hidden:
+                data['label'] = f"{data['label']} (+{hidden})"
+                element['classes'] = 'cluster'
+            elements.append(element)
+
+        sources, targets = S.sources, S.targets
+        in_region = self.in_region[sources] & self.in_region[targets]
+        real = in_region & visible[sources] & visible[targets]
+        elements.extend(full_elements[n + j] for j in np.flatnonzero(real).tolist())
+
+        meta_sources = representative[sources[in_region & ~real]]
+        meta_targets = representative[targets[in_region & ~real]]
+        between = meta_sources != meta_targets
+        pairs, counts = np.unique(
+            meta_sources[between] * n + meta_targets[between], return_counts=True
+        )
+        for pair, count in zip(pairs.tolist(), counts.tolist()):
+            source, target = S.node_ids[pair // n], S.node_ids[pair % n]
+            elements.append({
+                'group': 'edges',
+                'data': {
+                    'id': f"meta:{source}:{target}",
+                    'source': str(source),
+                    'target': str(target),
+                    'label': f"{count} edges" if count > 1 else "1 edge",
+                    'weight': count,
+                    'meta': True,
+                },
+                'classes': 'meta-edge',
+            })
+        return elements
+
+
+def diff_elements(old: List[Dict[str, Any]], new: List[Dict[str, Any]]) -> Dict[str, List]:
+    """Add / Remove / Update sets that turn the old Elements into the new ones"""
+    old_by_id = {e['data']['id']: e for e in old}
+    new_by_id = {e['data']['id']: e for e in new}
+    return {
+        'add': [e for i, e in new_by_id.items() if i not in old_by_id],
+        'remove': [i for i in old_by_id if i not in new_by_id],
+        'update': [
+            {'data': e['data'], 'classes': e.get('classes', '')}
+            for i, e in new_by_id.items()
+            if i in old_by_id and (old_by_id[i]['data'] != e['data'] or old_by_id[i].get('classes') != e.get('classes'))
+        ],
+    }
+
+
+# ==================== Per-Version Cache ====================
+
+_hierarchies: Dict[Tuple, GraphHierarchy] = {}
+_hierarchies_lock = threading.Lock()
+
+
+def get_graph_hierarchy(S: SparseGraph, graph_version: int, root: Optional[Any] = None,
+                        root_indices: Optional[Iterable[int]] = None) -> GraphHierarchy:
+    """Spanning forest for one Root, or for all Roots (root None) of a Graph Version"""
+    key = (graph_version, id(S), root)
+    with _hierarchies_lock:
+        cached = _hierarchies.get(key)
+        if cached is not None:
+            return cached
+
+    if root is None:
+        hierarchy = GraphHierarchy(S, root_indices if root_indices is not None else [], include_unreached=True)
+    else:
+        hierarchy = GraphHierarchy(S, [S.index[root]] if root in S.index else [])
+
+    with _hierarchies_lock:
+        for stale in [k for k in _hierarchies if k[0] != graph_version or k[1] != id(S)]:
+            del _hierarchies[stale]
+        _hierarchies[key] = hierarchy
+    logger.info(f"Built Graph Hierarchy with {len(hierarchy.tops)} top-level Clusters")
+    return hierarchy
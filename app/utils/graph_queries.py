@@ -0,0 +1,292 @@
+# utils/graph_queries.py
+
+"""Neighbourhood, Path and Impact Queries over the in-memory Graph, cached per Graph Version"""
+
+# Import Libraries
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+from scipy import sparse
+
+from pkg.config import GRAPH_QUERY_CONFIG
+from utils.sparse_metrics import SparseGraph, get_sparse_graph
+
+logger = logging.getLogger('TracerApp')
+
+# Query results kept per Graph Version
+MAX_CACHED_QUERIES = 256
+
+DIRECTIONS = ('downstream', 'upstream', 'both')
+
+
+def frontier_hops(adjacency: sparse.csr_matrix, starts: Iterable[int], max_depth: Optional[int] = None) -> np.ndarray:
+    """Hop count from the nearest start Node to every Node (-1 where unreached).
+
+    Every start is expanded in the same frontier, so a batch of starts costs a
+    single traversal.
+    """
+    hops = np.full(adjacency.shape[0], -1, dtype=np.int64)
+    frontier = np.unique(np.asarray(list(starts), dtype=np.int64))
+    hops[frontier] = 0
+    depth = 0
+    while len(frontier) and (max_depth is None or depth < max_depth):
+        depth += 1
+        reached = np.unique(adjacency[frontier].indices)
+        frontier = reached[hops[reached] < 0]
+        hops[frontier] = depth
+    return hops
+
+
+class GraphQueryError(ValueError):
+    """A query with invalid parameters or limits"""
+
+
+class UnknownNodeError(GraphQueryError):
+    """A query that names a Node missing from the Graph"""
+
+
+class GraphQueryService:
+    """Answers Graph queries with CSR traversals instead of NetworkX, and keeps
+    an LRU of results that lives as long as its Graph Version.
+
+    Edge Types are filtered by EdgeType id; traversals follow Edge direction
+    ('downstream'), reverse it ('upstream') or ignore it ('both').
+    """
+
+    def __init__(self, G: nx.MultiDiGraph, S: SparseGraph):
+        self.sparse = S
+        n = S.number_of_nodes
+        self.edge_ids = [str(d.get('edge_id', k)) for _, _, k, d in G.edges(keys=True, data=True)]
+
+        edge_type_ids = [str(d.get('edge_type_id') or '') for _, _, d in G.edges(data=True)]
+        self.edge_type_ids = sorted(set(edge_type_ids))
+        type_index = {t: i for i, t in enumerate(self.edge_type_ids)}
+        self.edge_types = np.fromiter(
+            (type_index[t] for t in edge_type_ids), dtype=np.int64, count=len(edge_type_ids)
+        )
+
+        # Edges grouped by source Node, to recover the Edge behind each hop of a path
+        self._edges_by_source = np.argsort(S.sources, kind='stable')
+        self._edges_start = np.searchsorted(S.sources[self._edges_by_source], np.arange(n + 1))
+
+        self._adjacency: "OrderedDict[Tuple, sparse.csr_matrix]" = OrderedDict()
+        self._queries: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # ==================== Helpers ====================
+
+    def _node_index(self, node_id: Any) -> int:
+        i = self.sparse.index.get(node_id)
+        if i is None:
+            raise UnknownNodeError(f"Node '{node_id}' does not exist")
+        return i
+
+    def _edge_mask(self, edge_types: Optional[FrozenSet[str]]) -> np.ndarray:
+        if edge_types is None:
+            return np.ones(self.sparse.number_of_edges, dtype=bool)
+        wanted = [i for i, t in enumerate(self.edge_type_ids) if t in edge_types]
+        return np.isin(self.edge_types, wanted)
+
+    def _get_adjacency(self, direction: str, edge_types: Optional[FrozenSet[str]]) -> sparse.csr_matrix:
+        """CSR Adjacency for a direction, restricted to some Edge Types, from an
+        LRU of the most recently used filters"""
+        if direction not in DIRECTIONS:
+            raise GraphQueryError(f"Unknown direction '{direction}'")
+        if edge_types is not None:
+            # Types missing from the Graph select no Edges, so they do not make a new entry
+            edge_types = edge_types.intersection(self.edge_type_ids)
+        key = (direction, edge_types)
+        with self._lock:
+            if key in self._adjacency:
+                self._adjacency.move_to_end(key)
+                return self._adjacency[key]
+
+        S = self.sparse
+        mask = self._edge_mask(edge_types)
+        sources, targets = S.sources[mask], S.targets[mask]
+        if direction == 'upstream':
+            sources, targets = targets, sources
+        elif direction == 'both':
+            sources, targets = np.concatenate([sources, targets]), np.concatenate([targets, sources])
+        n = S.number_of_nodes
+        adjacency = sparse.csr_matrix(
+            (np.ones(len(sources), dtype=np.int8), (sources, targets)), shape=(n, n)
+        )
+        with self._lock:
+            self._adjacency[key] = adjacency
+            while len(self._adjacency) > GRAPH_QUERY_CONFIG['cached_adjacencies']:
+                self._adjacency.popitem(last=False)
+        return adjacency
+
+    def _cached(self, key: Tuple, compute):
+        with self._lock:
+            if key in self._queries:
+                self._queries.move_to_end(key)
+                return self._queries[key]
+        result = compute()
+        with self._lock:
+            self._queries[key] = result
+            while len(self._queries) > MAX_CACHED_QUERIES:
+                self._queries.popitem(last=False)
+        return result
+
+    def _hops(self, start: int, adjacency: sparse.csr_matrix, max_depth: Optional[int]) -> np.ndarray:
+        return frontier_hops(adjacency, [start], max_depth)
+
+    def _induced_edges(self, node_mask: np.ndarray, edge_types: Optional[FrozenSet[str]]) -> np.ndarray:
+        S = self.sparse
+        return np.flatnonzero(node_mask[S.sources] & node_mask[S.targets] & self._edge_mask(edge_types))
+
+    def _hop_edge(self, u: int, v: int, edge_mask: np.ndarray) -> Optional[int]:
+        """An Edge u -> v (or v -> u) allowed by the mask"""
+        for a, b in ((u, v), (v, u)):
+            candidates = self._edges_by_source[self._edges_start[a]:self._edges_start[a + 1]]
+            for j in candidates[self.sparse.targets[candidates] == b]:
+                if edge_mask[j]:
+                    return int(j)
+        return None
+
+    def _path_result(self, path: List[int], edge_types: Optional[FrozenSet[str]]) -> Dict[str, List]:
+        edge_mask = self._edge_mask(edge_types)
+        edges = [self._hop_edge(u, v, edge_mask) for u, v in zip(path, path[1:])]
+        return {
+            'nodes': [self.sparse.node_ids[i] for i in path],
+            'edges': [self.edge_ids[j] for j in edges if j is not None],
+        }
+
+    # ==================== Queries ====================
+
+    def ego_indices(self, node_id: Any, k: int = 1, direction: str = 'both',
+                    edge_types: Optional[Iterable[str]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Node and Edge indices within k hops of a Node"""
+        if k < 0:
+            raise GraphQueryError("k must not be negative")
+        edge_types = frozenset(edge_types) if edge_types else None
+        start = self._node_index(node_id)
+
+        def compute():
+            hops = self._hops(start, self._get_adjacency(direction, edge_types), k)
+            mask = hops >= 0
+            return np.flatnonzero(mask), self._induced_edges(mask, edge_types)
+
+        return self._cached(('ego', start, k, direction, edge_types), compute)
+
+    def ego_network(self, node_id: Any, k: int = 1, direction: str = 'both',
+                    edge_types: Optional[Iterable[str]] = None) -> Dict[str, List]:
+        """Nodes and Edges within k hops of a Node"""
+        nodes, edges = self.ego_indices(node_id, k, direction, edge_types)
+        return {
+            'nodes': [self.sparse.node_ids[i] for i in nodes],
+            'edges': [self.edge_ids[j] for j in edges],
+        }
+
+    def shortest_path(self, source: Any, target: Any, directed: bool = True,
+                      edge_types: Optional[Iterable[str]] = None) -> Optional[Dict[str, List]]:
+        """Fewest-hop path between two Nodes, or None when there is none"""
+        edge_types = frozenset(edge_types) if edge_types else None
+        s, t = self._node_index(source), self._node_index(target)
+
+        def compute():
+            adjacency = self._get_adjacency('downstream' if directed else 'both', edge_types)
+            indptr, indices = adjacency.indptr, adjacency.indices
+            predecessor = {s: -1}
+            frontier = [s]
+            while frontier and t not in predecessor:
+                next_frontier = []
+                for u in frontier:
+                    for v in indices[indptr[u]:indptr[u + 1]].tolist():
+                        if v not in predecessor:
+                            predecessor[v] = u
+                            next_frontier.append(v)
+                frontier = next_frontier
+            if t not in predecessor:
+                return None
+            path = [t]
+            while predecessor[path[-1]] >= 0:
+                path.append(predecessor[path[-1]])
+            return self._path_result(path[::-1], edge_types)
+
+        return self._cached(('shortest_path', s, t, directed, edge_types), compute)
+
+    def all_simple_paths(self, source: Any, target: Any, max_depth: int = 6, max_paths: int = 50,
+                         edge_types: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Directed simple paths of at most max_depth Edges, stopping after max_paths"""
+        if max_depth < 1 or max_paths < 1:
+            raise GraphQueryError("max_depth and max_paths must be positive")
+        edge_types = frozenset(edge_types) if edge_types else None
+        s, t = self._node_index(source), self._node_index(target)
+
+        def compute():
+            adjacency = self._get_adjacency('downstream', edge_types)
+            indptr, indices = adjacency.indptr, adjacency.indices
+            # Only Nodes that still reach the target within the remaining depth are worth visiting
+            to_target = self._hops(t, self._get_adjacency('upstream', edge_types), max_depth)
+
+            paths, truncated = [], False
+            path, on_path = [s], {s}
+            stack = [iter(indices[indptr[s]:indptr[s + 1]].tolist())]
+            while stack:
+                v = next(stack[-1], None)
+                if v is None:
+                    stack.pop()
+                    on_path.discard(path.pop())
+                    continue
+                remaining = max_depth - len(path)
+                if v in on_path or to_target[v] < 0 or to_target[v] > remaining:
+                    continue
+                if v == t:
+                    paths.append(self._path_result(path + [v], edge_types))
+                    if len(paths) >= max_paths:
+                        truncated = True
+                        break
+                    continue
+                path.append(v)
+                on_path.add(v)
+                stack.append(iter(indices[indptr[v]:indptr[v + 1]].tolist()))
+            return {'paths': paths, 'truncated': truncated}
+
+        return self._cached(('all_simple_paths', s, t, max_depth, max_paths, edge_types), compute)
+
+    def impact(self, node_id: Any, direction: str = 'downstream', max_depth: Optional[int] = None,
+               edge_types: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Nodes affected by a change to a Node (downstream) or that affect it
+        (upstream), with their distance in hops"""
+        edge_types = frozenset(edge_types) if edge_types else None
+        start = self._node_index(node_id)
+
+        def compute():
+            hops = self._hops(start, self._get_adjacency(direction, edge_types), max_depth)
+            reached = np.flatnonzero(hops > 0)
+            reached = reached[np.argsort(hops[reached], kind='stable')]
+            return {
+                'nodes': [self.sparse.node_ids[i] for i in reached],
+                'hops': hops[reached].tolist(),
+            }
+
+        return self._cached(('impact', start, direction, max_depth, edge_types), compute)
+
+
+# ==================== Per-Version Cache ====================
+
+_service_cache: Dict[int, GraphQueryService] = {}
+_service_cache_lock = threading.Lock()
+
+
+def get_graph_query_service(G: nx.MultiDiGraph, graph_version: int) -> GraphQueryService:
+    """Return the GraphQueryService for G, the Graph of graph_version, building it
+    only once per Graph Version"""
+    with _service_cache_lock:
+        cached = _service_cache.get(graph_version)
+        if cached is not None:
+            return cached
+
+    service = GraphQueryService(G, get_sparse_graph(G, graph_version))
+    with _service_cache_lock:
+        _service_cache.clear()
+        _service_cache[graph_version] = service
+    logger.info(f"Built Graph Query Service with {len(service.edge_type_ids)} Edge Types")
+    return service
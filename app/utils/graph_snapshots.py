@@ -0,0 +1,342 @@
+# utils/graph_snapshots.py
+
+"""Content-addressed Graph Snapshots, delta encoded, and diffs between any two of them"""
+
+# Import Libraries
+import hashlib
+import json
+import logging
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from models.model import Model
+from pkg.config import SNAPSHOT_CONFIG
+
+logger = logging.getLogger('TracerApp')
+
+CURRENT = "current"
+PAYLOAD_FORMAT = 1
+
+# Fields of a record, in the order they are stored before its Property (name, value) pairs
+FIELDS = {
+    'nodes': ('identifier', 'name', 'type'),
+    'edges': ('identifier', 'name', 'type', 'source', 'target'),
+}
+
+
+class GraphState:
+    """The Nodes and Edges of a Snapshot as id -> tuple of strings.
+
+    A tuple holds the record's fields followed by its Property names and values,
+    sorted by name, so two records are equal exactly when their tuples are.
+    """
+
+    def __init__(self, nodes: Dict[str, tuple], edges: Dict[str, tuple], strings: Optional[List[str]] = None):
+        self.nodes = nodes
+        self.edges = edges
+        # String table the state was decoded with, which a delta against it extends
+        self.strings = strings
+        self._content_id: Optional[str] = None
+
+    @classmethod
+    def from_records(cls, records: Dict[str, Dict[str, Dict[str, Any]]]) -> "GraphState":
+        def encode(record, fields):
+            values = [record[field] for field in fields]
+            for name in sorted(record['properties']):
+                values.extend((name, record['properties'][name]))
+            return tuple(None if value is None else str(value) for value in values)
+
+        return cls(*(
+            {item_id: encode(record, FIELDS[section]) for item_id, record in records[section].items()}
+            for section in ('nodes', 'edges')
+        ))
+
+    @property
+    def content_id(self) -> str:
+        """SHA-256 of the canonical (id-sorted) records"""
+        if self._content_id is None:
+            canonical = json.dumps(
+                [sorted(self.nodes.items()), sorted(self.edges.items())],
+                ensure_ascii=False, separators=(',', ':'),
+            )
+            self._content_id = hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+        return self._content_id
+
+    def record(self, section: str, item_id: str) -> Dict[str, Any]:
+        values = getattr(self, section)[item_id]
+        fields = FIELDS[section]
+        record = dict(zip(fields, values))
+        rest = values[len(fields):]
+        record['properties'] = dict(zip(rest[::2], rest[1::2]))
+        return record
+
+
+# ==================== Encoding ====================
+
+
+def _encode_payload(data: Dict[str, Any]) -> bytes:
+    return zlib.compress(json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8'), 6)
+
+
+def encode_snapshot(state: GraphState, base: Optional[GraphState] = None) -> Dict[str, Any]:
+    """Payload of a Snapshot: a string table and rows of string indices (-1 for
+    None), complete or, against a base, only the rows that differ and the
+    strings the base does not already have"""
+    strings = list(base.strings) if base is not None else []
+    index = {string: i for i, string in enumerate(strings)}
+    first_new = len(strings)
+
+    def intern(value):
+        if value is None:
+            return -1
+        i = index.get(value)
+        if i is None:
+            i = index[value] = len(strings)
+            strings.append(value)
+        return i
+
+    data: Dict[str, Any] = {'format': PAYLOAD_FORMAT}
+    for section in ('nodes', 'edges'):
+        items = getattr(state, section)
+        previous = getattr(base, section) if base is not None else {}
+        data[section] = [
+            [intern(item_id), *map(intern, values)]
+            for item_id, values in items.items()
+            if previous.get(item_id) != values
+        ]
+        if base is not None:
+            data[f'removed_{section}'] = [intern(item_id) for item_id in previous if item_id not in items]
+    data['strings'] = strings[first_new:]
+
+    state.strings = strings
+    return {
+        'payload': _encode_payload(data),
+        'node_count': len(state.nodes),
+        'edge_count': len(state.edges),
+    }
+
+
+def decode_snapshot(payload: bytes, base: Optional[GraphState] = None) -> GraphState:
+    data = json.loads(zlib.decompress(payload).decode('utf-8'))
+    if data.get('format') != PAYLOAD_FORMAT:
+        raise ValueError(f"Unsupported Snapshot format '{data.get('format')}'")
+    strings = (list(base.strings) if base is not None else []) + data['strings']
+
+    sections = []
+    for section in ('nodes', 'edges'):
+        items = dict(getattr(base, section)) if base is not None else {}
+        for i in data.get(f'removed_{section}', []):
+            items.pop(strings[i], None)
+        for row in data[section]:
+            items[strings[row[0]]] = tuple(strings[i] if i >= 0 else None for i in row[1:])
+        sections.append(items)
+    return GraphState(*sections, strings=strings)
+
+
+# ==================== Snapshot Store ====================
+
+_states: "OrderedDict[str, GraphState]" = OrderedDict()
+_current: Optional[Tuple[int, GraphState]] = None
+_states_lock = threading.Lock()
+
+
+def _remember_state(content_id: str, state: GraphState) -> None:
+    with _states_lock:
+        _states[content_id] = state
+        _states.move_to_end(content_id)
+        while len(_states) > SNAPSHOT_CONFIG['cache_size']:
+            _states.popitem(last=False)
+
+
+def load_snapshot_state(content_id: str, model: Optional[Model] = None) -> GraphState:
+    """Decode a Snapshot's content, applying its delta chain from the nearest
+    complete (or already decoded) ancestor"""
+    model = model or Model()
+    chain = []
+    state = None
+    next_id: Optional[str] = content_id
+    while next_id is not None:
+        with _states_lock:
+            state = _states.get(next_id)
+        if state is not None:
+            break
+        content = model.get_snapshot_content(next_id)
+        if content is None:
+            raise KeyError(f"Snapshot Content '{next_id}' does not exist")
+        chain.append(content)
+        next_id = content['base_id']
+
+    for content in reversed(chain):
+        state = decode_snapshot(content['payload'], state)
+        state._content_id = content['content_id']
+    _remember_state(content_id, state)
+    return state
+
+
+def get_current_state(model: Optional[Model] = None) -> Tuple[int, GraphState]:
+    """The Graph as it is now, read once per Graph Version"""
+    global _current
+    model = model or Model()
+    graph_version = model.get_graph_version()
+    with _states_lock:
+        if _current is not None and _current[0] == graph_version:
+            return _current
+    records = model.get_graph_records()
+    current = (records['graph_version'], GraphState.from_records(records))
+    with _states_lock:
+        _current = current
+    return current
+
+
+def take_graph_snapshot(label: str, model: Optional[Model] = None) -> Dict[str, Any]:
+    """Store the current Graph as a labelled Snapshot, as a delta against the
+    latest Snapshot while its chain is short enough"""
+    model = model or Model()
+    graph_version, state = get_current_state(model)
+    content = None
+    if model.get_snapshot_content(state.content_id) is None:
+        latest = model.get_latest_snapshot_content()
+        base = None
+        if latest is not None and latest['depth'] < SNAPSHOT_CONFIG['max_delta_depth']:
+            base = load_snapshot_state(latest['content_id'], model)
+        content = encode_snapshot(state, base)
+        content['base_id'] = latest['content_id'] if base is not None else None
+        content['depth'] = latest['depth'] + 1 if base is not None else 0
+        logger.info(
+            f"Encoded Snapshot '{label}' in {len(content['payload'])} bytes"
+            + (f" as a delta against {content['base_id'][:12]}" if base is not None else "")
+        )
+        _remember_state(state.content_id, state)
+    return model.create_graph_snapshot(label, graph_version, state.content_id, content)
+
+
+def resolve_snapshot(ref: Union[int, str], model: Optional[Model] = None) -> Tuple[Dict[str, Any], GraphState]:
+    """A Snapshot (by id) or the current Graph ("current") with its state"""
+    model = model or Model()
+    if str(ref) == CURRENT:
+        graph_version, state = get_current_state(model)
+        return {'id': CURRENT, 'label': 'Current', 'graph_version': graph_version}, state
+    snapshot = model.get_graph_snapshot(int(ref))
+    if snapshot is None:
+        raise KeyError(f"Snapshot '{ref}' does not exist")
+    return snapshot, load_snapshot_state(snapshot['content_id'], model)
+
+
+# ==================== Diffs ====================
+
+
+def _field_changes(before: Dict[str, Any], after: Dict[str, Any]) -> List[Dict[str, Any]]:
+    changes = [
+        {'field': field, 'before': before.get(field), 'after': after.get(field)}
+        for field in before if field != 'properties' and before.get(field) != after.get(field)
+    ]
+    for name in sorted(before['properties'].keys() | after['properties'].keys()):
+        old, new = before['properties'].get(name), after['properties'].get(name)
+        if old != new:
+            changes.append({'field': f"Property '{name}'", 'before': old, 'after': new})
+    return changes
+
+
+def diff_states(old: GraphState, new: GraphState, limit: Optional[int] = None) -> Dict[str, Any]:
+    """Nodes and Edges added, removed and changed (with their field changes)
+    from one state to another; each list stops after limit items, while the
+    summary counts all of them"""
+    limit = SNAPSHOT_CONFIG['max_diff_items'] if limit is None else limit
+    diff: Dict[str, Any] = {'summary': {}}
+    for section in ('nodes', 'edges'):
+        before, after = getattr(old, section), getattr(new, section)
+        added = sorted(after.keys() - before.keys())
+        removed = sorted(before.keys() - after.keys())
+        changed = sorted(item_id for item_id in before.keys() & after.keys() if before[item_id] != after[item_id])
+
+        diff['summary'][section] = {'added': len(added), 'removed': len(removed), 'changed': len(changed)}
+        diff[section] = {
+            'added': [{'id': i, **new.record(section, i)} for i in added[:limit]],
+            'removed': [{'id': i, **old.record(section, i)} for i in removed[:limit]],
+            'changed': [
+                {'id': i, **new.record(section, i),
+                 'changes': _field_changes(old.record(section, i), new.record(section, i))}
+                for i in changed[:limit]
+            ],
+        }
+
+    # Moved Edges name their old and new endpoints rather than their ids
+    for item in diff['edges']['changed']:
+        for change in item['changes']:
+            if change['field'] in ('source', 'target'):
+                change['before'] = _node_name(old, change['before'])
+                change['after'] = _node_name(new, change['after'])
+    return diff
+
+
+def _node_name(state: GraphState, node_id: Optional[str]) -> Optional[str]:
+    values = state.nodes.get(node_id)
+    return (values[1] or values[0] or node_id) if values else node_id
+
+
+def diff_snapshots(from_ref: Union[int, str], to_ref: Union[int, str] = CURRENT,
+                   limit: Optional[int] = None) -> Dict[str, Any]:
+    model = Model()
+    from_snapshot, old = resolve_snapshot(from_ref, model)
+    to_snapshot, new = resolve_snapshot(to_ref, model)
+    return {'from': from_snapshot, 'to': to_snapshot, **diff_states(old, new, limit)}
+
+
+def diff_rows(diff: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """One table row per added, removed or changed field of a diff"""
+    rows = []
+    for section, entity in (('nodes', 'Node'), ('edges', 'Edge')):
+        for change, items in diff[section].items():
+            for item in items:
+                base = {
+                    'Entity': entity,
+                    'Change': change.title(),
+                    'Identifier': item.get('identifier') or '',
+                    'Name': item.get('name') or '',
+                }
+                if change != 'changed':
+                    rows.append({**base, 'Field': '', 'Before': '', 'After': ''})
+                for field_change in item.get('changes', []):
+                    rows.append({
+                        **base,
+                        'Field': field_change['field'].title() if field_change['field'].islower() else field_change['field'],
+                        'Before': field_change['before'] or '',
+                        'After': field_change['after'] or '',
+                    })
+    return rows
+
+
+def snapshot_options(model: Optional[Model] = None) -> List[Dict[str, Any]]:
+    """Dropdown Options for every Snapshot, newest first"""
+    return [
+        {
+            'label': f"{snapshot['label']} (Version {snapshot['graph_version']}, {snapshot['created_on']})",
+            'value': snapshot['id'],
+        }
+        for snapshot in (model or Model()).get_graph_snapshots()
+    ]
+
+
+def summarize_diff(diff: Dict[str, Any], removed_shown: int = 10) -> str:
+    """One line per section, naming the first Nodes removed (which cannot be drawn)"""
+    lines = [f"Changes from '{diff['from']['label']}' to '{diff['to']['label']}':"]
+    for section, entity in (('nodes', 'Nodes'), ('edges', 'Edges')):
+        counts = diff['summary'][section]
+        lines.append(f"{entity}: {counts['added']} added, {counts['changed']} changed, {counts['removed']} removed.")
+    removed = [item.get('name') or item.get('identifier') or item['id'] for item in diff['nodes']['removed']]
+    if removed:
+        more = diff['summary']['nodes']['removed'] - removed_shown
+        lines.append(
+            "Removed Nodes: " + ", ".join(removed[:removed_shown]) + (f" and {more} more" if more > 0 else "")
+        )
+    return " ".join(lines)
+
+
+def diff_element_ids(diff: Dict[str, Any]) -> Dict[str, Dict[str, List[str]]]:
+    """Ids of the added and changed Nodes and Edges, as drawn on the Graphs page"""
+    return {
+        section: {change: [item['id'] for item in diff[section][change]] for change in ('added', 'changed')}
+        for section in ('nodes', 'edges')
+    }
@@ -0,0 +1,36 @@
+# utils/id_interning.py
+
+"""Interning of Node UUIDs against integer surrogate keys.
+
+The Database stores UUIDs, and the Graph, the pages and the API use them as
+the public ids. Each Node also has an integer node_key, and each Edge stores
+the keys of its Nodes (see SURROGATE_KEY_TRIGGERS in models/model.py), so
+Model.get_graph_rows reads and matches rows on ints. An IdTable maps each
+key back to one canonical UUID string, so every Edge that refers to a Node
+shares that Node's string and NetworkX's dict lookups match on identity
+before comparing 36 characters.
+"""
+
+# Import Libraries
+from typing import Dict, Optional
+
+
+class IdTable:
+    """node key -> canonical UUID for one read of the Database"""
+
+    def __init__(self):
+        self._uuids: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._uuids)
+
+    def add(self, key: int, uuid: str) -> str:
+        """Record a row's key and UUID, returning the canonical UUID string"""
+        return self._uuids.setdefault(key, uuid)
+
+    def get(self, key: Optional[int]) -> Optional[str]:
+        """The UUID for a key, or None when no Node was read with it"""
+        return self._uuids.get(key)
+
+    def uuid(self, key: int) -> str:
+        return self._uuids[key]
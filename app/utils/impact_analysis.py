@@ -0,0 +1,227 @@
+# utils/impact_analysis.py
+
+"""Change Impact Analysis along Edge-Type propagation rules, kept current from the GraphChange log"""
+
+# Import Libraries
+import logging
+import threading
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+import networkx as nx
+import numpy as np
+from scipy import sparse
+
+from models.model import Model
+from pkg.config import GRAPH_CHANGE_CONFIG, IMPACT_CONFIG
+from utils.graph_queries import frontier_hops
+from utils.sparse_metrics import SparseGraph, get_sparse_graph
+
+logger = logging.getLogger('TracerApp')
+
+PROPAGATIONS = ('downstream', 'upstream', 'both', 'none')
+
+
+class ImpactAnalyzer:
+    """Propagation Graph of one Graph Version with the impact sets computed on it.
+
+    Each Edge propagates a change according to the rule for its Edge Type:
+    'downstream' from source to target, 'upstream' from target to source,
+    'both' or 'none'. The downstream set of a Node is everything a change to
+    it flags; its upstream set is everything whose change would flag it.
+    """
+
+    def __init__(self, G: nx.MultiDiGraph, S: SparseGraph, graph_version: Optional[int] = None,
+                 rules: Optional[Dict[str, str]] = None, default: Optional[str] = None):
+        self.graph_version = graph_version
+        self.sparse = S
+        self.rules = dict(IMPACT_CONFIG['edge_type_rules'] if rules is None else rules)
+        self.default = default or IMPACT_CONFIG['default_propagation']
+        for propagation in [self.default, *self.rules.values()]:
+            if propagation not in PROPAGATIONS:
+                raise ValueError(f"Unknown propagation '{propagation}'")
+
+        # Edge id -> (source, target), to locate Edges a later change log refers to
+        self.edge_endpoints: Dict[str, Tuple[Any, Any]] = {}
+        # The same for Edges deleted since earlier Versions
+        self.removed_edge_endpoints: Dict[str, Tuple[Any, Any]] = {}
+        propagations = []
+        for u, v, key, data in G.edges(keys=True, data=True):
+            self.edge_endpoints[str(data.get('edge_id', key))] = (u, v)
+            propagations.append(self.propagation_for(data))
+        propagations = np.array(propagations, dtype=object)
+
+        forward = (propagations == 'downstream') | (propagations == 'both')
+        backward = (propagations == 'upstream') | (propagations == 'both')
+        sources = np.concatenate([S.sources[forward], S.targets[backward]])
+        targets = np.concatenate([S.targets[forward], S.sources[backward]])
+        n = S.number_of_nodes
+        # propagation[u, v] set means a change to u flags v
+        self.propagation = sparse.csr_matrix(
+            (np.ones(len(sources), dtype=np.int8), (sources, targets)), shape=(n, n)
+        )
+        self._reverse = self.propagation.transpose().tocsr()
+
+        self._impact: Dict[Any, Dict[str, FrozenSet]] = {}
+        self._lock = threading.Lock()
+
+    def propagation_for(self, edge_data: Dict[str, Any]) -> str:
+        """Rule for an Edge, matched on its Edge Type name, then its Edge Type id"""
+        for key in (edge_data.get('relationship_type'), edge_data.get('edge_type_id')):
+            if key is not None and str(key) in self.rules:
+                return self.rules[str(key)]
+        return self.default
+
+    def _indices(self, node_ids: Iterable[Any]) -> List[int]:
+        index = self.sparse.index
+        return [index[node_id] for node_id in node_ids if node_id in index]
+
+    # ==================== Queries ====================
+
+    def impact_of(self, node_id: Any) -> Dict[str, FrozenSet]:
+        """Downstream and upstream impact sets of a single Node (cached)"""
+        with self._lock:
+            cached = self._impact.get(node_id)
+        if cached is not None:
+            return cached
+
+        starts = self._indices([node_id])
+        if not starts:
+            return {'downstream': frozenset(), 'upstream': frozenset()}
+        node_ids = self.sparse.node_ids
+        impact = {
+            'downstream': frozenset(node_ids[i] for i in np.flatnonzero(frontier_hops(self.propagation, starts) > 0)),
+            'upstream': frozenset(node_ids[i] for i in np.flatnonzero(frontier_hops(self._reverse, starts) > 0)),
+        }
+        with self._lock:
+            self._impact[node_id] = impact
+        return impact
+
+    def batch_impact(self, node_ids: Iterable[Any], direction: str = 'downstream',
+                     max_depth: Optional[int] = None) -> Dict[str, Any]:
+        """Impact of a set of changed Nodes in one multi-source traversal.
+
+        Impacted Nodes exclude the changed ones and are ordered by their hop
+        distance from the nearest changed Node.
+        """
+        if direction not in ('downstream', 'upstream'):
+            raise ValueError(f"Unknown direction '{direction}'")
+        starts = self._indices(node_ids)
+        adjacency = self.propagation if direction == 'downstream' else self._reverse
+        hops = frontier_hops(adjacency, starts, max_depth)
+
+        impacted = np.flatnonzero(hops > 0)
+        impacted = impacted[np.argsort(hops[impacted], kind='stable')]
+        ids = self.sparse.node_ids
+        return {
+            'changed': [ids[i] for i in sorted(set(starts))],
+            'impacted': [ids[i] for i in impacted],
+            'hops': hops[impacted].tolist(),
+        }
+
+    # ==================== Incremental Updates ====================
+
+    def touched_nodes(self, changes: List[Dict[str, Any]], previous: Optional["ImpactAnalyzer"] = None
+                      ) -> Optional[Set[Any]]:
+        """Nodes whose propagation Edges a change log touches, or None when any
+        Edge Type changed (its rule may now differ) and nothing can be kept"""
+        touched: Set[Any] = set()
+        for change in changes:
+            entity, entity_id = change['Entity'], change['Entity ID']
+            if entity == 'EdgeType':
+                return None
+            if entity == 'Edge':
+                for analyzer in (previous, self):
+                    if analyzer is not None and entity_id in analyzer.edge_endpoints:
+                        touched.update(analyzer.edge_endpoints[entity_id])
+            elif entity == 'Node' and change['Operation'] == 'DELETE':
+                touched.add(entity_id)
+        return touched
+
+    def carry_over(self, previous: "ImpactAnalyzer", changes: Optional[List[Dict[str, Any]]]) -> int:
+        """Keep the impact sets of an earlier Version that the changes since cannot affect.
+
+        Adding or removing an Edge u -> v only alters the sets that contain
+        (or belong to) u or v, so every other set is still exact. changes is
+        None when the log since that Version is not known in full, and then
+        no set is kept.
+        """
+        self.removed_edge_endpoints = {
+            edge_id: ends
+            for edge_id, ends in {**previous.removed_edge_endpoints, **previous.edge_endpoints}.items()
+            if edge_id not in self.edge_endpoints
+        }
+
+        touched = self.touched_nodes(changes, previous) if changes is not None else None
+        if touched is None or previous.rules != self.rules or previous.default != self.default:
+            return 0
+
+        with previous._lock:
+            entries = list(previous._impact.items())
+        kept = {
+            node_id: impact for node_id, impact in entries
+            if node_id not in touched
+            and node_id in self.sparse.index
+            and touched.isdisjoint(impact['downstream'])
+            and touched.isdisjoint(impact['upstream'])
+        }
+        with self._lock:
+            self._impact.update(kept)
+        return len(kept)
+
+
+# ==================== Per-Version Cache ====================
+
+_analyzer: Optional[ImpactAnalyzer] = None
+_analyzer_key: Optional[Tuple] = None
+_analyzer_lock = threading.Lock()
+
+
+def get_impact_analyzer(G: nx.MultiDiGraph, graph_version: Optional[int] = None) -> ImpactAnalyzer:
+    """Return the ImpactAnalyzer for G, carrying the still-valid impact sets of
+    the previous Version forward using the GraphChange log"""
+    global _analyzer, _analyzer_key
+    key = (graph_version, id(G), G.number_of_nodes(), G.number_of_edges())
+    with _analyzer_lock:
+        if _analyzer is not None and _analyzer_key == key:
+            return _analyzer
+        previous = _analyzer
+
+    analyzer = ImpactAnalyzer(G, get_sparse_graph(G, graph_version), graph_version)
+    kept = 0
+    if previous is not None and previous.graph_version is not None and graph_version is not None:
+        if previous.graph_version == graph_version:
+            kept = analyzer.carry_over(previous, [])
+        elif previous.graph_version < graph_version:
+            kept = analyzer.carry_over(previous, _changes_between(previous.graph_version, graph_version))
+
+    with _analyzer_lock:
+        _analyzer, _analyzer_key = analyzer, key
+    logger.info(f"Built Impact Analyzer for Graph Version {graph_version}, keeping {kept} cached impact sets")
+    return analyzer
+
+
+def _changes_between(since: int, until: int) -> Optional[List[Dict[str, Any]]]:
+    """The logged changes after since up to until, or None when the log was
+    compacted past since or holds more than a page of them"""
+    model = Model()
+    if model.get_graph_change_horizon() > since:
+        return None
+    page_size = GRAPH_CHANGE_CONFIG['page_size']
+    changes = model.get_graph_changes_since(since, until=until, limit=page_size + 1)
+    return changes if len(changes) <= page_size else None
+
+
+def changed_nodes_since(graph_version: int, changes: List[Dict[str, Any]], analyzer: ImpactAnalyzer) -> List[Any]:
+    """Nodes created or modified after a Graph Version, or at either end of an
+    Edge created, modified or deleted since, that still exist"""
+    changed = []
+    for change in changes:
+        if change['Version'] <= graph_version:
+            continue
+        if change['Entity'] == 'Node' and change['Operation'] != 'DELETE':
+            changed.append(change['Entity ID'])
+        elif change['Entity'] == 'Edge':
+            ends = analyzer.edge_endpoints.get(change['Entity ID']) or analyzer.removed_edge_endpoints.get(change['Entity ID'])
+            changed.extend(ends or ())
+    index = analyzer.sparse.index
+    return list(dict.fromkeys(node_id for node_id in changed if node_id in index))
@@ -0,0 +1,288 @@
+# utils/instrumentation.py
+
+"""Latency, Payload Size and Database Query instrumentation for Dash Callbacks
+and Flask Routes, exposed in the Prometheus text format"""
+
+# Import Libraries
+import bisect
+import json
+import logging
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from flask import g, request
+from pkg.config import COMPRESSION_CONFIG, INSTRUMENTATION_CONFIG, LOG_DIR
+from utils.query_profiler import (
+    QueryStats,
+    install_query_listeners,
+    record_request_queries,
+    start_query_stats,
+    stop_query_stats,
+)
+
+logger = logging.getLogger('TracerApp')
+slow_logger = logging.getLogger('TracerApp.slow')
+
+DASH_UPDATE_PATH = "/_dash-update-component"
+
+
+# ==================== Metrics ====================
+
+
+class Histogram:
+    """Cumulative bucket counts, sum and count of one labelled series"""
+
+    __slots__ = ('buckets', 'counts', 'total', 'count')
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def exposition(self, name: str, labels: str) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f'{name}_sum{{{labels}}} {self.total:g}')
+        lines.append(f'{name}_count{{{labels}}} {self.count}')
+        return lines
+
+
+# (Metric name, help text, bucket config key) of every Histogram recorded per request
+HISTOGRAMS = (
+    ('tracer_request_duration_seconds', 'Time to handle a Dash Callback or Flask Route', 'duration_buckets'),
+    ('tracer_request_size_bytes', 'Request body size', 'size_buckets'),
+    ('tracer_response_size_bytes', 'Response body size as sent, after any compression', 'size_buckets'),
+    ('tracer_request_db_queries', 'Database queries per request', 'query_buckets'),
+    ('tracer_request_db_seconds', 'Time spent in Database queries per request', 'duration_buckets'),
+    ('tracer_response_uncompressed_size_bytes', 'Response body size before compression', 'size_buckets'),
+)
+
+
+class RequestMetrics:
+    """Per (kind, name) Histograms and counters, shared by every request thread"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str, str], Histogram] = {}
+        self._responses: Dict[Tuple[str, str, int], int] = {}
+        self._slow: Dict[Tuple[str, str], int] = {}
+        self._over_budget: Dict[Tuple[str, str], int] = {}
+
+    def _histogram(self, metric: str, bucket_key: str, kind: str, name: str) -> Histogram:
+        key = (metric, kind, name)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = Histogram(INSTRUMENTATION_CONFIG[bucket_key])
+        return histogram
+
+    def observe(self, kind: str, name: str, status: int, values: Sequence[Optional[float]],
+                slow: bool = False, over_budget: bool = False) -> None:
+        """Record one request; values follow the order of HISTOGRAMS and None is skipped"""
+        with self._lock:
+            for (metric, _, bucket_key), value in zip(HISTOGRAMS, values):
+                if value is not None:
+                    self._histogram(metric, bucket_key, kind, name).observe(value)
+            self._responses[(kind, name, status)] = self._responses.get((kind, name, status), 0) + 1
+            if slow:
+                self._slow[(kind, name)] = self._slow.get((kind, name), 0) + 1
+            if over_budget:
+                self._over_budget[(kind, name)] = self._over_budget.get((kind, name), 0) + 1
+
+    def exposition(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            lines = []
+            for metric, help_text, _ in HISTOGRAMS:
+                lines.append(f'# HELP {metric} {help_text}')
+                lines.append(f'# TYPE {metric} histogram')
+                for (series, kind, name), histogram in sorted(self._histograms.items()):
+                    if series == metric:
+                        lines.extend(histogram.exposition(metric, _labels(kind, name)))
+
+            lines.append('# HELP tracer_requests_total Requests handled by status code')
+            lines.append('# TYPE tracer_requests_total counter')
+            for (kind, name, status), count in sorted(self._responses.items()):
+                lines.append(f'tracer_requests_total{{{_labels(kind, name)},status="{status}"}} {count}')
+
+            lines.append('# HELP tracer_slow_requests_total Requests above the slow request threshold')
+            lines.append('# TYPE tracer_slow_requests_total counter')
+            for (kind, name), count in sorted(self._slow.items()):
+                lines.append(f'tracer_slow_requests_total{{{_labels(kind, name)}}} {count}')
+
+            lines.append('# HELP tracer_payload_budget_exceeded_total Callback responses above the payload budget')
+            lines.append('# TYPE tracer_payload_budget_exceeded_total counter')
+            for (kind, name), count in sorted(self._over_budget.items()):
+                lines.append(f'tracer_payload_budget_exceeded_total{{{_labels(kind, name)}}} {count}')
+
+            return '\n'.join(lines) + '\n'
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._responses.clear()
+            self._slow.clear()
+            self._over_budget.clear()
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(kind: str, name: str) -> str:
+    return f'kind="{kind}",name="{_escape(name)}"'
+
+
+request_metrics = RequestMetrics()
+
+
+# ==================== Middleware ====================
+
+
+# The Output ids of the registered Dash Callbacks
+_callback_map: Dict[str, Any] = {}
+
+
+def _request_name() -> Tuple[str, str]:
+    """The (kind, name) a request is recorded under: Dash Callbacks by their
+    Output id, Flask Routes by their URL rule"""
+    if request.path.endswith(DASH_UPDATE_PATH):
+        body = request.get_json(silent=True) or {}
+        output = body.get('output')
+        # Unregistered Outputs share one series, so clients cannot add labels
+        return 'callback', output if output in _callback_map else 'unknown'
+    if request.url_rule is not None:
+        return 'route', request.url_rule.rule
+    return 'route', 'unmatched'
+
+
+def _response_size(response) -> Optional[int]:
+    if response.content_length is not None:
+        return response.content_length
+    if response.is_streamed or response.direct_passthrough:
+        return None
+    return len(response.get_data())
+
+
+def _truncate(value: Any) -> Any:
+    text = json.dumps(value, default=str)
+    limit = INSTRUMENTATION_CONFIG['max_context_chars']
+    return value if len(text) <= limit else text[:limit] + '...'
+
+
+def _slow_request_context(kind: str, name: str, status: int, duration: float,
+                          stats: QueryStats, values: Sequence[Optional[float]]) -> Dict[str, Any]:
+    context = {
+        'kind': kind,
+        'name': name,
+        'method': request.method,
+        'path': request.full_path.rstrip('?'),
+        'status': status,
+        'duration_ms': round(duration * 1000, 2),
+        'request_bytes': values[1],
+        'response_bytes': values[2],
+        'db_queries': stats.count,
+        'db_ms': round(stats.seconds * 1000, 2),
+        'slowest_queries': [
+            {'ms': round(seconds * 1000, 2), 'statement': ' '.join(statement.split())}
+            for seconds, statement in sorted(stats.slowest, reverse=True)
+        ],
+        'user_agent': request.headers.get('User-Agent'),
+    }
+    if kind == 'callback':
+        body = request.get_json(silent=True) or {}
+        context['changed_props'] = body.get('changedPropIds')
+        context['inputs'] = _truncate(body.get('inputs'))
+        context['state'] = _truncate(body.get('state'))
+    return context
+
+
+def _start_request():
+    g.tracer_request_start = time.perf_counter()
+    g.tracer_query_token = start_query_stats()
+
+
+def _finish_request(response):
+    start = g.pop('tracer_request_start', None)
+    token = g.pop('tracer_query_token', None)
+    if start is None or token is None:
+        return response
+
+    duration = time.perf_counter() - start
+    stats = stop_query_stats(token)
+    try:
+        kind, name = _request_name()
+        sent = _response_size(response)
+        # Set by the compression hook, which runs before this one
+        uncompressed = g.pop('tracer_uncompressed_bytes', None) or sent
+        values = (duration, request.content_length, sent, stats.count, stats.seconds, uncompressed)
+        slow = duration * 1000 >= INSTRUMENTATION_CONFIG['slow_threshold_ms']
+        budget = COMPRESSION_CONFIG['payload_budget_bytes']
+        over_budget = kind == 'callback' and uncompressed is not None and uncompressed > budget
+        request_metrics.observe(kind, name, response.status_code, values, slow, over_budget)
+        record_request_queries(kind, name, stats)
+
+        if over_budget:
+            logger.warning(
+                f"Callback {name} returned {uncompressed} bytes ({sent} sent), "
+                f"over the payload budget of {budget} bytes"
+            )
+
+        if slow:
+            context = _slow_request_context(kind, name, response.status_code, duration, stats, values)
+            logger.warning(
+                f"Slow {kind} {name}: {context['duration_ms']}ms with {stats.count} queries "
+                f"({context['db_ms']}ms)"
+            )
+            slow_logger.warning(json.dumps(context, default=str))
+    except Exception as e:
+        logger.error(f"Error recording request metrics: {e}")
+    return response
+
+
+def _teardown_request(_exception):
+    # after_request is skipped when a request fails before producing a response
+    token = g.pop('tracer_query_token', None)
+    if token is not None:
+        stop_query_stats(token)
+
+
+def _setup_slow_logger() -> None:
+    if slow_logger.handlers:
+        return
+    handler = RotatingFileHandler(str(LOG_DIR / "slow_requests.log"), maxBytes=10 * 1024 * 1024, backupCount=5)
+    handler.setFormatter(logging.Formatter("%(asctime)s %(message)s", datefmt="%Y-%m-%d %H:%M:%S"))
+    slow_logger.addHandler(handler)
+    slow_logger.setLevel(logging.WARNING)
+    # The summary line goes to the App log; the full context only to its own file
+    slow_logger.propagate = False
+
+
+def install_instrumentation(app) -> None:
+    """Time every request the Dash App's Server handles. Dash Callbacks all
+    arrive on /_dash-update-component, so one Flask hook covers both the
+    registered Callbacks and the Routes."""
+    global _callback_map
+    if not INSTRUMENTATION_CONFIG['enabled']:
+        logger.info("Request instrumentation is disabled")
+        return
+
+    install_query_listeners()
+    # Pages register their Callbacks after this, so keep the live mapping
+    _callback_map = app.callback_map
+    server = app.server
+    _setup_slow_logger()
+    server.before_request(_start_request)
+    server.after_request(_finish_request)
+    server.teardown_request(_teardown_request)
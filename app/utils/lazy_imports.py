@@ -0,0 +1,55 @@
+# utils/lazy_imports.py
+
+"""Modules imported on first use rather than at startup.
+
+pandas, plotly.graph_objects and reportlab are only needed for exports and
+figures, so every worker would otherwise pay for them at startup even when
+nobody opens the pages that use them.
+"""
+
+# Import Libraries
+import importlib
+import logging
+import sys
+import threading
+import time
+import types
+from typing import Dict
+
+logger = logging.getLogger('TracerApp')
+
+_lock = threading.Lock()
+
+# Module name -> seconds its first use spent importing it
+import_times: Dict[str, float] = {}
+
+
+class LazyModule(types.ModuleType):
+    """Stands in for a module and imports it when an attribute is first read"""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._module = None
+
+    def _load(self) -> types.ModuleType:
+        if self._module is None:
+            with _lock:
+                if self._module is None:
+                    loaded = self.__name__ in sys.modules
+                    start = time.perf_counter()
+                    module = importlib.import_module(self.__name__)
+                    if not loaded:
+                        import_times[self.__name__] = time.perf_counter() - start
+                        logger.info(f"Imported {self.__name__} on first use in {import_times[self.__name__]:.3f}s")
+                    self._module = module
+        return self._module
+
+    def __getattr__(self, attribute: str):
+        return getattr(self._load(), attribute)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name: str) -> LazyModule:
+    return LazyModule(name)
@@ -0,0 +1,152 @@
+# utils/metric_engine.py
+
+"""Background Metrics Engine with Results cached per Graph Version"""
+
+# Import Libraries
+import atexit
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from models.model import Model
+from pkg.config import METRICS_CONFIG
+from utils.metric_scheduler import METRIC_FAMILIES, MetricScheduler, get_metric_scheduler, snapshot_path
+
+logger = logging.getLogger('TracerApp')
+
+# ==================== Metrics Engine ====================
+
+
+@dataclass
+class _Failure:
+    """The last failure of a Family for a Graph Version, and when to retry it"""
+
+    error: str
+    attempts: int
+    retry_at: float
+
+
+class MetricsEngine:
+    """Serves stored Metric Results immediately and recomputes them in Worker
+    Processes only when the Graph Version changes"""
+
+    def __init__(self, model: Optional[Model] = None, scheduler: Optional[MetricScheduler] = None):
+        self.model = model or Model()
+        self.scheduler = scheduler or get_metric_scheduler()
+        self._pending: Dict[Tuple[str, int], Future] = {}
+        self._failed: Dict[Tuple[str, int], _Failure] = {}
+        self._lock = threading.Lock()
+
+    def get_metrics(self, family: str) -> Dict[str, Any]:
+        """Return the latest Result for a Metric Family with its Status.
+
+        Status is 'current' when the Result matches the Graph Version, 'stale'
+        while a newer Version is being computed, 'pending' when there is no
+        Result yet, and 'error' when the computation failed for this Version
+        and is waiting to be retried.
+        """
+        if family not in METRIC_FAMILIES:
+            raise ValueError(f"Unknown Metric Family '{family}'")
+
+        graph_version = self.model.get_graph_version()
+        result = self.model.get_latest_metric_result(family)
+
+        if result and result['graph_version'] == graph_version:
+            result['status'] = 'current'
+            return result
+
+        key = (family, graph_version)
+        with self._lock:
+            # Failures for older Versions will never be retried
+            for stale_key in [k for k in self._failed if k[1] < graph_version]:
+                del self._failed[stale_key]
+            failure = self._failed.get(key)
+
+        if failure is not None and time.monotonic() < failure.retry_at:
+            status = 'error'
+        else:
+            self._submit(family, graph_version)
+            status = 'stale' if result else 'pending'
+
+        if result is None:
+            result = {
+                'family': family,
+                'graph_version': None,
+                'metrics': {},
+                'duration_seconds': None,
+                'computed_on': None,
+            }
+        result['status'] = status
+        result['error'] = failure.error if failure is not None else None
+        return result
+
+    def get_all_metrics(self) -> Dict[str, Dict[str, Any]]:
+        return {family: self.get_metrics(family) for family in METRIC_FAMILIES}
+
+    def is_computing(self) -> bool:
+        with self._lock:
+            return any(not future.done() for future in self._pending.values())
+
+    def _submit(self, family: str, graph_version: int) -> None:
+        key = (family, graph_version)
+        with self._lock:
+            if key in self._pending:
+                return
+
+            logger.info(f"Computing {family} Metrics for Graph Version {graph_version}")
+            # All Families for a Version share the Snapshot written by the first Worker
+            future = self.scheduler.submit(family, snapshot_path(graph_version), graph_version)
+            self._pending[key] = future
+
+        future.add_done_callback(lambda f: self._on_complete(key, f))
+
+    def _on_complete(self, key: Tuple[str, int], future: Future) -> None:
+        """Save the Result, or record the failure with its backoff; the Scheduler
+        fails a Family that runs past its timeout with MetricTimeoutError"""
+        family, graph_version = key
+        error = None
+        try:
+            metrics, duration = future.result()
+            self.model.save_metric_result(family, graph_version, metrics, duration)
+            self.model.record_metric_values(family, graph_version, metrics)
+            logger.info(
+                f"Computed {family} Metrics for Graph Version {graph_version} in {duration:.3f}s"
+            )
+        except Exception as e:
+            error = str(e)
+        finally:
+            with self._lock:
+                if error is None:
+                    self._failed.pop(key, None)
+                else:
+                    previous = self._failed.get(key)
+                    attempts = previous.attempts + 1 if previous else 1
+                    backoff = min(
+                        METRICS_CONFIG["retry_backoff_seconds"] * 2 ** (attempts - 1),
+                        METRICS_CONFIG["retry_backoff_max_seconds"],
+                    )
+                    self._failed[key] = _Failure(error, attempts, time.monotonic() + backoff)
+                    logger.error(
+                        f"Error computing {family} Metrics for Graph Version {graph_version} "
+                        f"(attempt {attempts}, retrying in {backoff:g}s): {error}"
+                    )
+                pending = self._pending.get(key)
+                if pending is future:
+                    del self._pending[key]
+
+    def shutdown(self) -> None:
+        self.scheduler.shutdown()
+
+
+_metrics_engine: Optional[MetricsEngine] = None
+
+
+def get_metrics_engine() -> MetricsEngine:
+    global _metrics_engine
+    if _metrics_engine is None:
+        _metrics_engine = MetricsEngine()
+        atexit.register(_metrics_engine.shutdown)
+    return _metrics_engine
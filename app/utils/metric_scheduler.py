@@ -0,0 +1,375 @@
+# utils/metric_scheduler.py
+
+"""Fan Metric Families out to Worker Processes sharing one Graph Snapshot"""
+
+# Import Libraries
+import atexit
+import hashlib
+import logging
+import os
+import pickle
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import Future, wait
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from pkg.config import BASE_DIR, DB_PATH, METRICS_CONFIG
+
+logger = logging.getLogger('TracerApp')
+
+METRIC_FAMILIES = ('completeness', 'efficiency', 'robustness', 'resilience', 'cycles')
+
+# How long a Worker waits for another Worker to finish writing a Snapshot; a lock
+# older than this is taken to belong to a hung build and is broken
+SNAPSHOT_LOCK_TIMEOUT = 600
+# A lock file without an owner pid is broken once it is this old (its owner died
+# between creating the file and writing its pid)
+SNAPSHOT_LOCK_GRACE = 5
+# How long a terminated Worker Process has to exit before it is killed
+PROCESS_STOP_TIMEOUT = 5
+
+# ==================== Graph Snapshots ====================
+
+
+def snapshot_path(snapshot_key: Any) -> Path:
+    """Snapshot file for a Graph Version (or ad-hoc key) of the configured Database"""
+    database = hashlib.sha1(str(DB_PATH).encode()).hexdigest()[:12]
+    return METRICS_CONFIG['snapshot_dir'] / database / f"graph-{snapshot_key}.pickle"
+
+
+def write_graph_snapshot(G, snapshot_key: Any, build_time: Optional[float] = None,
+                         memory_used: Optional[float] = None,
+                         graph_version: Optional[int] = None) -> Path:
+    """Serialize the Graph once so Workers load it from disk instead of
+    receiving a pickled copy with every task"""
+    path = snapshot_path(snapshot_key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Write then rename, so a Worker never reads a partial Snapshot
+    temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(temp_path, 'wb') as f:
+        pickle.dump(
+            {'graph': G, 'build_time': build_time, 'memory_used': memory_used, 'graph_version': graph_version},
+            f,
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+    os.replace(temp_path, path)
+    return path
+
+
+def load_graph_snapshot(path: Path) -> Dict[str, Any]:
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def prune_graph_snapshots(graph_version: int) -> None:
+    """Remove the Snapshots of older Graph Versions"""
+    for path in snapshot_path(graph_version).parent.glob('graph-*.pickle'):
+        version = path.stem.split('-', 1)[1]
+        if version.isdigit() and int(version) < graph_version:
+            path.unlink(missing_ok=True)
+
+
+def _pid_running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Running, under another user
+        return True
+    return True
+
+
+def _snapshot_lock_is_stale(lock_path: Path) -> bool:
+    """Whether the process that took the lock has died, or has held it so long
+    that its build must have hung"""
+    try:
+        age = time.time() - lock_path.stat().st_mtime
+        owner = lock_path.read_text().strip()
+    except FileNotFoundError:
+        return False
+    if age > SNAPSHOT_LOCK_TIMEOUT:
+        return True
+    if not owner.isdigit():
+        return age > SNAPSHOT_LOCK_GRACE
+    return not _pid_running(int(owner))
+
+
+def _acquire_snapshot_lock(lock_path: Path, path: Path) -> Optional[int]:
+    """Take the lock file for building a Snapshot, breaking stale locks.
+
+    Returns the lock's file descriptor, or None once the Snapshot has been
+    written by the lock holder or the wait has timed out.
+    """
+    deadline = time.monotonic() + SNAPSHOT_LOCK_TIMEOUT
+    while True:
+        try:
+            lock = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            os.write(lock, str(os.getpid()).encode())
+            return lock
+        except FileExistsError:
+            pass
+
+        if path.exists() or time.monotonic() >= deadline:
+            return None
+        if _snapshot_lock_is_stale(lock_path):
+            # Two Workers breaking the same lock at once may both build the
+            # Graph; the Snapshot is written by rename, so either copy is whole
+            logger.warning(f"Breaking the stale Graph Snapshot lock {lock_path.name}")
+            lock_path.unlink(missing_ok=True)
+            continue
+        time.sleep(0.05)
+
+
+def _build_graph_snapshot(path: Path, graph_version: int) -> Dict[str, Any]:
+    """Build the Snapshot for a Graph Version from the Database exactly once.
+
+    The first Worker to need a Version takes a lock file holding its pid and
+    builds the Graph; the others wait for the Snapshot it writes, breaking the
+    lock if its owner dies or hangs. The Snapshot is labelled with the Version
+    its rows were read at, which is newer than graph_version when the Database
+    changed in between.
+    """
+    lock_path = path.with_suffix('.lock')
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    lock = _acquire_snapshot_lock(lock_path, path)
+    if lock is None and path.exists():
+        return load_graph_snapshot(path)
+    # Without the lock (the wait timed out) the Graph is built here without sharing it
+
+    try:
+        from utils.network_utils import build_networkx_from_database
+
+        start = time.perf_counter()
+        # A failed build raises, so an empty Graph here is an empty Database
+        G = build_networkx_from_database(raise_errors=True)
+        build_time = time.perf_counter() - start
+
+        built_version = G.graph['graph_version']
+        if built_version != graph_version:
+            logger.info(f"Graph Version {graph_version} was superseded by {built_version} before it was read")
+        if lock is not None:
+            write_graph_snapshot(G, built_version, build_time, graph_version=built_version)
+            prune_graph_snapshots(built_version)
+        return {'graph': G, 'build_time': build_time, 'memory_used': None, 'graph_version': built_version}
+    finally:
+        if lock is not None:
+            os.close(lock)
+            lock_path.unlink(missing_ok=True)
+
+
+# ==================== Worker Process ====================
+
+
+def _get_worker_snapshot(path: str, graph_version: Optional[int] = None) -> Dict[str, Any]:
+    if os.path.exists(path):
+        return load_graph_snapshot(Path(path))
+    if graph_version is not None:
+        return _build_graph_snapshot(Path(path), graph_version)
+    raise FileNotFoundError(f"Graph Snapshot '{path}' does not exist")
+
+
+def compute_metric_family(family: str, path: str,
+                          graph_version: Optional[int] = None) -> Tuple[Dict[str, Any], float]:
+    """Compute a single Metric Family in a Worker Process"""
+    from utils import metric_utils
+
+    snapshot = _get_worker_snapshot(path, graph_version)
+    G = snapshot['graph']
+    snapshot_version = snapshot.get('graph_version')
+    if graph_version is not None and snapshot_version is not None and snapshot_version != graph_version:
+        # The Result would be stored against a Version it was not computed for
+        raise RuntimeError(f"Graph Version {graph_version} was superseded by {snapshot_version} before it was read")
+    start = time.perf_counter()
+
+    if family == 'completeness':
+        metrics = metric_utils.calculate_completeness_metrics(G, graph_version=graph_version)
+    elif family == 'efficiency':
+        metrics = metric_utils.calculate_efficiency_metrics(
+            G, build_time=snapshot['build_time'], memory_used=snapshot['memory_used']
+        )
+    elif family == 'robustness':
+        metrics = metric_utils.calculate_robustness_metrics(G, graph_version)
+    elif family == 'resilience':
+        metrics = metric_utils.calculate_resilience_metrics(G)
+    elif family == 'cycles':
+        metrics = metric_utils.calculate_cycle_metrics(G, graph_version)
+    else:
+        raise ValueError(f"Unknown Metric Family '{family}'")
+
+    return metrics, time.perf_counter() - start
+
+
+def _stop_process(process: subprocess.Popen) -> None:
+    if process.poll() is None:
+        process.terminate()
+        try:
+            process.wait(PROCESS_STOP_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    process.wait()
+
+
+# ==================== Metric Scheduler ====================
+
+
+class MetricTimeoutError(Exception):
+    """A Metric Family ran past its timeout, and its Worker Process was terminated"""
+
+
+class MetricScheduler:
+    """Runs Metric Families concurrently, so the wall-clock time is that of the
+    slowest Family rather than the sum of all of them.
+
+    Each Family runs in a Worker Process of its own, at most max_workers at a
+    time, so one that runs past its timeout is terminated without holding up
+    the Families queued behind it.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, timeouts: Optional[Dict[str, float]] = None):
+        self.max_workers = max_workers or METRICS_CONFIG['max_workers']
+        self.timeouts = dict(METRICS_CONFIG['family_timeouts'])
+        self.timeouts.update(timeouts or {})
+        self._slots = threading.BoundedSemaphore(self.max_workers)
+        self._processes: Set[subprocess.Popen] = set()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def timeout_for(self, family: str) -> float:
+        return self.timeouts.get(family, max(self.timeouts.values()))
+
+    def submit(self, family: str, path: Path, graph_version: Optional[int] = None) -> Future:
+        """Submit a Family for a Snapshot; with a Graph Version the Snapshot is
+        built from the Database if it does not exist yet.
+
+        The Future fails with MetricTimeoutError when the Family runs past its timeout.
+        """
+        if family not in METRIC_FAMILIES:
+            raise ValueError(f"Unknown Metric Family '{family}'")
+        future: Future = Future()
+        threading.Thread(
+            target=self._run_family,
+            args=(future, family, str(path), graph_version),
+            name=f"metric-{family}",
+            daemon=True,
+        ).start()
+        return future
+
+    def _run_family(self, future: Future, family: str, path: str, graph_version: Optional[int]) -> None:
+        """Wait for a free slot, then run the Family in a new Worker Process and
+        terminate it if it has not finished by its timeout.
+
+        The Worker is `python -m utils.metric_worker` rather than a
+        multiprocessing.Process, which under spawn (Windows) would re-run the
+        App's script, and with it the whole App setup, in every Worker.
+        """
+        with self._slots:
+            if not future.set_running_or_notify_cancel():
+                return
+            with self._lock:
+                if self._closed:
+                    future.set_exception(RuntimeError("The Metric Scheduler has been shut down"))
+                    return
+                process = subprocess.Popen(
+                    [sys.executable, '-m', 'utils.metric_worker'],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    cwd=BASE_DIR,
+                )
+                self._processes.add(process)
+
+            timeout = self.timeout_for(family)
+            outcome = None
+            try:
+                output, _ = process.communicate(pickle.dumps((family, path, graph_version)), timeout=timeout)
+                if output:
+                    outcome = pickle.loads(output)
+                else:
+                    outcome = ('error', f"Worker Process for {family} Metrics exited without a Result")
+            except subprocess.TimeoutExpired:
+                pass
+            except (OSError, EOFError, pickle.UnpicklingError) as e:
+                outcome = ('error', f"Worker Process for {family} Metrics failed: {e}")
+            finally:
+                _stop_process(process)
+                with self._lock:
+                    self._processes.discard(process)
+                for stream in (process.stdin, process.stdout):
+                    if stream is not None and not stream.closed:
+                        stream.close()
+
+        if outcome is None:
+            logger.warning(f"{family} Metrics timed out after {timeout}s; terminated its Worker Process")
+            future.set_exception(MetricTimeoutError(f"Timed out after {timeout}s"))
+        elif outcome[0] == 'result':
+            future.set_result(outcome[1])
+        else:
+            future.set_exception(RuntimeError(outcome[1]))
+
+    def run(self, G, families: Iterable[str] = METRIC_FAMILIES, build_time: Optional[float] = None,
+            memory_used: Optional[float] = None,
+            graph_version: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """Compute the Families for G (of graph_version, when it has one) in parallel.
+
+        Each result has a status of 'current', 'timeout' or 'error'. A Family
+        that runs past its timeout has its Worker Process terminated.
+        """
+        path = write_graph_snapshot(G, f"run-{uuid.uuid4().hex}", build_time, memory_used, graph_version)
+        futures: Dict[str, Future] = {}
+        try:
+            start = time.perf_counter()
+            futures = {family: self.submit(family, path, graph_version) for family in families}
+
+            results = {}
+            for family, future in futures.items():
+                # Every Family ends by its timeout once it has a Worker Process
+                try:
+                    metrics, duration = future.result()
+                    results[family] = _result(family, 'current', metrics, duration)
+                except MetricTimeoutError as e:
+                    results[family] = _result(family, 'timeout', error=str(e))
+                except Exception as e:
+                    logger.error(f"Error computing {family} Metrics: {e}")
+                    results[family] = _result(family, 'error', error=str(e))
+
+            logger.info(f"Computed {len(results)} Metric Families in {time.perf_counter() - start:.3f}s")
+            return results
+        finally:
+            # Queued Families load the Snapshot when they start, so it is kept until all have ended
+            wait(futures.values())
+            path.unlink(missing_ok=True)
+
+    def shutdown(self) -> None:
+        """Terminate the running Families; queued ones fail without starting"""
+        with self._lock:
+            self._closed = True
+            processes = list(self._processes)
+        for process in processes:
+            process.terminate()
+
+
+def _result(family: str, status: str, metrics: Optional[Dict[str, Any]] = None,
+            duration: Optional[float] = None, error: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        'family': family,
+        'status': status,
+        'metrics': metrics or {},
+        'duration_seconds': duration,
+        'error': error,
+    }
+
+
+_metric_scheduler: Optional[MetricScheduler] = None
+
+
+def get_metric_scheduler() -> MetricScheduler:
+    global _metric_scheduler
+    if _metric_scheduler is None:
+        _metric_scheduler = MetricScheduler()
+        atexit.register(_metric_scheduler.shutdown)
+    return _metric_scheduler
@@ -2,19 +2,22 @@
 
 # Import Libraries
 import logging
-from memory_profiler import memory_usage
 import networkx as nx
 from networkx.algorithms import average_clustering, degree_assortativity_coefficient
 import time
 
 from models.model import Model, Node, Edge
+from pkg.config import METRICS_CONFIG
+from utils import approx_metrics
+from utils.metric_scheduler import get_metric_scheduler
+from utils.sparse_metrics import calculate_cycle_structure, calculate_structural_metrics, get_sparse_graph
 
 logger = logging.getLogger('TracerApp')
 
 # Completeness Metrics
 
-def calculate_completeness_metrics(G, session=None):
-    """Calculate completeness metrics for the graph"""
+def calculate_completeness_metrics(G, session=None, graph_version=None):
+    """Calculate completeness metrics for the graph (of graph_version, when it has one)"""
     if session is None:
         model = Model()
         session = model._get_session()
@@ -26,16 +29,15 @@ def calculate_completeness_metrics(G, session=None):
         db_node_count = session.query(Node).count()
         db_edge_count = session.query(Edge).count()
         
+        structure = calculate_structural_metrics(get_sparse_graph(G, graph_version))
+
         metrics = {
             'node_coverage': round(G.number_of_nodes() / db_node_count * 100, 2) if db_node_count > 0 else 0,
             'edge_coverage': round(G.number_of_edges() / db_edge_count * 100, 2) if db_edge_count > 0 else 0,
-            'orphaned_nodes': sum(1 for n in G.nodes() if G.degree(n) == 0),
-            'nodes_with_names': sum(1 for _, data in G.nodes(data=True) if data.get('name')),
-            'nodes_with_descriptions': sum(1 for _, data in G.nodes(data=True) if data.get('description')),
-            'attribute_completeness': round(
-                sum(1 for _, data in G.nodes(data=True) if data.get('name') and data.get('description')) 
-                / G.number_of_nodes() * 100, 2
-            ) if G.number_of_nodes() > 0 else 0
+            'orphaned_nodes': structure['isolated_nodes'],
+            'nodes_with_names': structure['nodes_with_names'],
+            'nodes_with_descriptions': structure['nodes_with_descriptions'],
+            'attribute_completeness': structure['attribute_completeness'],
         }
 
         logger.info(f"Completeness Metrics: {metrics}")
@@ -68,19 +70,39 @@ def calculate_efficiency_metrics(G, build_time=None, memory_used=None):
 
 # Robustness Metrics
 
-def calculate_robustness_metrics(G):
-    """Calculate robustness metrics for the graph"""
+def _to_undirected_simple(G):
+    """Collapse a directed multigraph into a simple undirected graph for connectivity metrics"""
+    U = nx.Graph()
+    U.add_nodes_from(G.nodes())
+    U.add_edges_from((u, v) for u, v in G.edges() if u != v)
+    return U
+
+def _is_connected(G):
+    if G.number_of_nodes() == 0:
+        return False
+    if G.is_directed():
+        return nx.is_weakly_connected(G)
+    return nx.is_connected(G)
+
+def _number_of_components(G):
+    if G.is_directed():
+        return nx.number_weakly_connected_components(G)
+    return nx.number_connected_components(G)
+
+def calculate_robustness_metrics(G, graph_version=None):
+    """Calculate robustness metrics for the graph (of graph_version, when it has one)"""
+    structure = calculate_structural_metrics(get_sparse_graph(G, graph_version))
     metrics = {
-        'self_loops': nx.number_of_selfloops(G),
-        'isolated_nodes': len(list(nx.isolates(G))),
-        'is_connected': nx.is_connected(G),
-        'number_of_components': nx.number_connected_components(G),
+        'self_loops': structure['self_loops'],
+        'isolated_nodes': structure['isolated_nodes'],
+        'is_connected': structure['weakly_connected_components'] == 1,
+        'number_of_components': structure['weakly_connected_components'],
         'invalid_edges': count_invalid_edges(G),
     }
     
     # Only calculate clustering for graphs with nodes
     if G.number_of_nodes() > 0:
-        metrics['average_clustering'] = round(average_clustering(G), 4)
+        metrics['average_clustering'] = round(average_clustering(_to_undirected_simple(G)), 4)
     
     # Only calculate assortativity for graphs with edges
     if G.number_of_edges() > 0:
@@ -102,32 +124,120 @@ def count_invalid_edges(G):
 
 # Resilience Metrics
 
-def calculate_resilience_metrics(G):
-    """Calculate resilience metrics for the graph"""
+def _resolve_resilience_mode(G, mode=None):
+    mode = (mode or METRICS_CONFIG['resilience_mode']).lower()
+    if mode == 'auto':
+        threshold = METRICS_CONFIG['approximation_node_threshold']
+        return 'approximate' if G.number_of_nodes() > threshold else 'exact'
+    if mode not in ('exact', 'approximate'):
+        raise ValueError(f"Unknown resilience mode '{mode}'")
+    return mode
+
+def calculate_resilience_metrics(G, mode=None, time_budget=None):
+    """Calculate resilience metrics for the graph.
+
+    Connectivity and path metrics use the undirected view of the graph and are
+    computed over its largest connected component. In 'approximate' mode they
+    are sampled within the time budget (per metric) and 'error_bounds' holds
+    the [lower, upper] interval for each of them.
+    """
+    U = _to_undirected_simple(G)
+    n = U.number_of_nodes()
+    mode = _resolve_resilience_mode(G, mode)
+    time_budget = time_budget if time_budget is not None else METRICS_CONFIG['time_budget_seconds']
+    seed = METRICS_CONFIG['seed']
+
+    articulation_points = len(list(nx.articulation_points(U))) if n > 0 else 0
+
     metrics = {
-        'is_connected': nx.is_connected(G),
-        'number_of_components': nx.number_connected_components(G),
+        'is_connected': _is_connected(G),
+        'number_of_components': _number_of_components(G),
         'average_degree': round(sum(dict(G.degree()).values()) / G.number_of_nodes(), 2) if G.number_of_nodes() > 0 else 0,
         'density': round(nx.density(G), 4),
-        'articulation_points': len(list(nx.articulation_points(G))),
+        'articulation_points': articulation_points,
+        'mode': mode,
     }
     
-    # Only calculate for connected graphs
-    if nx.is_connected(G) and G.number_of_nodes() > 1:
-        try:
-            metrics['node_connectivity'] = nx.node_connectivity(G)
-            metrics['edge_connectivity'] = nx.edge_connectivity(G)
-            metrics['average_shortest_path'] = round(nx.average_shortest_path_length(G), 2)
-            metrics['diameter'] = nx.diameter(G)
-        except:
-            logger.warning("Could not calculate some resilience metrics")
+    if n < 2:
+        logger.info(f"Resilience Metrics: {metrics}")
+        return metrics
+
+    largest = U.subgraph(max(nx.connected_components(U), key=len)).copy()
+    metrics['largest_component_nodes'] = largest.number_of_nodes()
+    if largest.number_of_nodes() < 2:
+        logger.info(f"Resilience Metrics: {metrics}")
+        return metrics
+
+    if largest.number_of_nodes() < n:
+        # Articulation points of the whole graph are not those of its largest component
+        component_articulation_points = None
+    else:
+        component_articulation_points = articulation_points
+
+    try:
+        if mode == 'exact':
+            metrics['node_connectivity'] = nx.node_connectivity(largest)
+            metrics['edge_connectivity'] = nx.edge_connectivity(largest)
+            metrics['average_shortest_path'] = round(nx.average_shortest_path_length(largest), 2)
+            metrics['diameter'] = nx.diameter(largest)
+        else:
+            estimates = {
+                'node_connectivity': approx_metrics.estimate_node_connectivity(
+                    largest, component_articulation_points,
+                    pairs=METRICS_CONFIG['connectivity_pairs'], time_budget=time_budget, seed=seed),
+                'edge_connectivity': approx_metrics.estimate_edge_connectivity(
+                    largest, trials=METRICS_CONFIG['min_cut_trials'], time_budget=time_budget, seed=seed),
+                'average_shortest_path': approx_metrics.estimate_average_shortest_path(
+                    largest, max_samples=METRICS_CONFIG['path_samples'],
+                    relative_error=METRICS_CONFIG['path_relative_error'], time_budget=time_budget, seed=seed),
+                'diameter': approx_metrics.estimate_diameter(
+                    largest, sweeps=METRICS_CONFIG['diameter_sweeps'], time_budget=time_budget, seed=seed),
+            }
+            metrics['node_connectivity'] = estimates['node_connectivity']['value']
+            metrics['edge_connectivity'] = estimates['edge_connectivity']['value']
+            metrics['average_shortest_path'] = round(estimates['average_shortest_path']['value'], 2)
+            metrics['diameter'] = estimates['diameter']['value']
+            metrics['error_bounds'] = {
+                name: [round(e['lower'], 2), round(e['upper'], 2)] for name, e in estimates.items()
+            }
+            metrics['samples'] = {name: e['samples'] for name, e in estimates.items()}
+    except Exception as e:
+        logger.warning(f"Could not calculate some resilience metrics: {e}")
     
     logger.info(f"Resilience Metrics: {metrics}")
     return metrics
 
-def comprehensive_metrics_report(G, session=None, build_time=None, memory_used=None):
-    """Generate a comprehensive metrics report"""
-    
+# Cycle Metrics
+
+def calculate_cycle_metrics(G, graph_version=None):
+    """Calculate cycle metrics for the graph from its Strongly Connected Components.
+
+    Every cycle lies within one Component of two or more Nodes (or is a
+    self-loop), so the Graph is a DAG exactly when there are none of either.
+    """
+    S = get_sparse_graph(G, graph_version)
+    structure = calculate_cycle_structure(S)
+    metrics = {key: value for key, value in structure.items() if key != 'components'}
+    metrics['largest_components'] = [
+        [S.node_ids[i] for i in component] for component in structure['components']
+    ]
+
+    logger.info(f"Cycle Metrics: { {k: v for k, v in metrics.items() if k != 'largest_components'} }")
+    return metrics
+
+def comprehensive_metrics_report(G, session=None, build_time=None, memory_used=None, parallel=False,
+                                 graph_version=None):
+    """Generate a comprehensive metrics report
+
+    With parallel=True the Families run concurrently in the Metric Scheduler's
+    Worker Processes and a Family that fails or times out reports an empty dict.
+    """
+    if parallel:
+        results = get_metric_scheduler().run(
+            G, build_time=build_time, memory_used=memory_used, graph_version=graph_version
+        )
+        return {family: result['metrics'] for family, result in results.items()}
+
     if session is None:
         model = Model()
         session = model._get_session()
@@ -137,10 +247,11 @@ def comprehensive_metrics_report(G, session=None, build_time=None, memory_used=N
     
     try:
         report = {
-            'completeness': calculate_completeness_metrics(G, session),
+            'completeness': calculate_completeness_metrics(G, session, graph_version),
             'efficiency': calculate_efficiency_metrics(G, build_time, memory_used),
-            'robustness': calculate_robustness_metrics(G),
-            'resilience': calculate_resilience_metrics(G)
+            'robustness': calculate_robustness_metrics(G, graph_version),
+            'resilience': calculate_resilience_metrics(G),
+            'cycles': calculate_cycle_metrics(G, graph_version)
         }
         
         return report
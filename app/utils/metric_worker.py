@@ -0,0 +1,33 @@
+# utils/metric_worker.py
+
+"""Entry point of a Metric Worker Process, started by the Metric Scheduler as
+`python -m utils.metric_worker`.
+
+The Worker imports only what its Metric Family needs, never the App. It reads
+the pickled request (family, snapshot path, graph version) from stdin and
+writes the pickled outcome, ('result', (metrics, duration)) or ('error',
+message), to stdout.
+"""
+
+# Import Libraries
+import pickle
+import sys
+
+
+def main() -> None:
+    family, path, graph_version = pickle.load(sys.stdin.buffer)
+    # Anything printed while computing goes to stderr, so it cannot corrupt the outcome
+    output = sys.stdout.buffer
+    sys.stdout = sys.stderr
+    try:
+        from utils.metric_scheduler import compute_metric_family
+
+        outcome = ('result', compute_metric_family(family, path, graph_version))
+    except Exception as e:
+        outcome = ('error', str(e))
+    pickle.dump(outcome, output, protocol=pickle.HIGHEST_PROTOCOL)
+    output.flush()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,86 +1,83 @@
 # utils/network_utils.py
 import logging
 from typing import List, Dict, Any, Optional, Set
-from sqlalchemy.orm import joinedload
 import networkx as nx   
 
-from models.model import Model, Edge, Node
-from utils.cache_utils import invalidate_network_cache, get_network, update_network_cache
+from models.model import Model
+from utils.id_interning import IdTable
+from utils.reachability import get_reachability_index
 
 logger = logging.getLogger('TracerApp')
 
-def build_networkx_from_database():
-    """Build a NetworkX directed multigraph from database Nodes and Edges"""
-    
-    cached_graph = get_network()
-    if cached_graph:
-        logger.info("Clearing cached Graph")
-        invalidate_network_cache()
+def build_networkx_from_database(raise_errors: bool = False):
+    """Build a NetworkX directed multigraph from database Nodes and Edges.
+
+    A failed build returns an empty Graph, or with raise_errors re-raises, so
+    that an empty Graph can be told apart from an empty Database. A built
+    Graph has the Graph Version its rows were read at in G.graph['graph_version'].
+    Use utils.cache_utils.get_network() for the shared, cached Graph.
+    """
     
     logger.info("Building the NetworkX Graph from the Database")
     
     model = Model()
-    
+
     try:
-        session = model._get_session()
-        
-        try:
-            nodes = session.query(Node).all()
-            edges = (
-                session.query(Edge)
-                .options(
-                    joinedload(Edge.edge_type),
-                    joinedload(Edge.source_node),
-                    joinedload(Edge.target_node),
-                )
-                .all()
+        edge_types = {str(edge_type.id): edge_type for edge_type in model.get_edge_types()}
+        rows = model.get_graph_rows()
+        logger.info(f"Loaded {len(rows['edges'])} Edges and {len(rows['nodes'])} Nodes from the Database")
+
+        # FIXED: Use MultiDiGraph for directed graph with multiple edges between nodes
+        G = nx.MultiDiGraph(graph_version=rows['graph_version'])
+        ids = IdTable()
+        # One string per Type id, not one per row read
+        node_type_ids: Dict[str, str] = {}
+
+        # Add the Nodes
+        for key, node_id, node_type_id, identifier, name, description in rows['nodes']:
+            G.add_node(
+                ids.add(key, node_id),
+                node_type_id=node_type_ids.setdefault(node_type_id, node_type_id),
+                identifier=identifier or "",
+                name=name or "",
+                description=description or "",
             )
 
-            logger.info(f"Loaded {len(edges)} Edges and {len(nodes)} Nodes from the Database")
+        # Add the Edges; their Nodes are found by key, and share the Nodes' UUID strings
+        for edge_id, source_key, target_key, edge_type_id, identifier, description in rows['edges']:
+            source = ids.get(source_key)
+            target = ids.get(target_key)
+            if source is None or target is None:
+                logger.warning(f"Skipping Edge {edge_id}: its Source or Target Node is missing")
+                continue
+            edge_type = edge_types.get(edge_type_id)
+            label = edge_type.name if edge_type else "connects to"
+            G.add_edge(
+                source,
+                target,
+                key=edge_id,  # MultiDiGraph uses keys for multiple edges
+                edge_id=edge_id,
+                edge_type_id=edge_type.id if edge_type else edge_type_id,
+                identifier=identifier or "",
+                label=label,
+                weight=1,  # Edge.weight is fixed at 1
+                relationship_type=label,
+                description=description or "",
+            )
+
+        logger.info(f"Built NetworkX graph with {G.number_of_nodes()} nodes and {G.number_of_edges()} edges")
+
+        return G
 
-            # FIXED: Use MultiDiGraph for directed graph with multiple edges between nodes
-            G = nx.MultiDiGraph()
-            
-            # Add the Nodes
-            for node in nodes:
-                G.add_node(
-                    node.id,
-                    identifier=node.identifier or "",
-                    name=node.name or "",
-                    description=node.description or "",
-                )
-            
-            # Add the Edges
-            for edge in edges:
-                if G.has_node(edge.source_node_id) and G.has_node(edge.target_node_id):
-                    G.add_edge(
-                        edge.source_node_id,
-                        edge.target_node_id,
-                        key=edge.id,  # MultiDiGraph uses keys for multiple edges
-                        edge_id=edge.id,
-                        identifier=edge.identifier or "",
-                        label=(edge.edge_type.name if edge.edge_type else "connects to"),
-                        weight=getattr(edge, 'weight', 1),  # Add weight if it exists
-                        relationship_type=(
-                            edge.edge_type.name if edge.edge_type else "connects to"
-                        ),
-                        description=edge.description or "",
-                    )
-
-            logger.info(f"Built NetworkX graph with {G.number_of_nodes()} nodes and {G.number_of_edges()} edges")
-            
-            update_network_cache(G)
-            
-            return G
-            
-        finally:
-            session.close()
-            
     except Exception as e:
         logger.error(f"Error building NetworkX Graph {e}")
+        if raise_errors:
+            raise
         import traceback
         traceback.print_exc()
         return nx.MultiDiGraph()  # Return empty directed graph
+    finally:
+        model.close()
 
 def get_graph_roots(G: nx.MultiDiGraph) -> List[Any]:
     """Find root nodes (nodes with no incoming edges but have outgoing edges)"""
@@ -98,8 +95,14 @@ def get_graph_roots(G: nx.MultiDiGraph) -> List[Any]:
     logger.info(f"Identified {len(roots)} Root Nodes")
     return roots
 
-def build_breakdown_from_graph(G: nx.MultiDiGraph, root_node: Optional[Any] = None) -> List[Dict[str, Any]]:
-    """Build hierarchical breakdown for Tabulator table"""
+def _cycle_guard(index, root: Any) -> Optional[Set[Any]]:
+    """An empty visited set when a cycle is reachable from the Root, otherwise None"""
+    return None if index.is_acyclic(index.descendant_bits(root)) else set()
+
+def build_breakdown_from_graph(
+    G: nx.MultiDiGraph, graph_version: int, root_node: Optional[Any] = None
+) -> List[Dict[str, Any]]:
+    """Build hierarchical breakdown for Tabulator table from G, the Graph of graph_version"""
     if G is None or G.number_of_nodes() == 0:
         return []
     
@@ -107,16 +110,20 @@ def build_breakdown_from_graph(G: nx.MultiDiGraph, root_node: Optional[Any] = No
         logger.error("Graph must be directed to build hierarchy")
         return []
     
+    index = get_reachability_index(G, graph_version)
+
     def build_hierarchy(node: Any, visited: Optional[Set[Any]] = None) -> List[Dict[str, Any]]:
-        """Recursively build hierarchy from a node"""
-        if visited is None:
-            visited = set()
-        
-        # Prevent cycles
-        if node in visited:
-            return []
-        
-        visited.add(node)
+        """Recursively build hierarchy from a node.
+
+        visited is None when the Reachability Index shows that no cycle is
+        reachable from the Root, so the per-path cycle check can be skipped.
+        """
+        if visited is not None:
+            # Prevent cycles
+            if node in visited:
+                return []
+
+            visited.add(node)
         
         # Get node attributes
         node_data = G.nodes.get(node, {})
@@ -125,10 +132,11 @@ def build_breakdown_from_graph(G: nx.MultiDiGraph, root_node: Optional[Any] = No
         children_data = []
         out_edges = G.out_edges(node, data=True, keys=True)  # type: ignore
         for _, target, key, edge_data in out_edges:
-            child_hierarchy = build_hierarchy(target, visited.copy())
+            child_hierarchy = build_hierarchy(target, visited.copy() if visited is not None else None)
             
             child_item = {
                 'id': target,
+                'edge_id': str(edge_data.get('edge_id', key)),
                 'identifier': G.nodes[target].get('identifier', ''),
                 'name': G.nodes[target].get('name', ''),
                 'description': G.nodes[target].get('description', ''),
@@ -172,7 +180,7 @@ def build_breakdown_from_graph(G: nx.MultiDiGraph, root_node: Optional[Any] = No
             'identifier': node_data.get('identifier', ''),
             'name': node_data.get('name', ''),
             'description': node_data.get('description', ''),
-            '_children': build_hierarchy(root_node)
+            '_children': build_hierarchy(root_node, _cycle_guard(index, root_node))
         }]
     
     # Otherwise, build from all roots
@@ -186,8 +194,57 @@ def build_breakdown_from_graph(G: nx.MultiDiGraph, root_node: Optional[Any] = No
             'identifier': node_data.get('identifier', ''),
             'name': node_data.get('name', ''),
             'description': node_data.get('description', ''),
-            '_children': build_hierarchy(root)
+            '_children': build_hierarchy(root, _cycle_guard(index, root))
         }
         breakdown.append(root_item)
     
-    return breakdown
\ No newline at end of file
+    return breakdown
+
+def networkx_to_cytoscape(G: nx.Graph) -> dict:
+    """Convert a NetworkX Graph into Cytoscape Elements"""
+    elements = []
+
+    # Add nodes from NetworkX graph
+    for node_id, node_data in G.nodes(data=True):
+        # Create label: "Identifier - Name" if identifier exists, otherwise just "Name"
+        identifier = node_data.get("identifier", "")
+        name = node_data.get("name", "")
+        if identifier and name:
+            label = f"{identifier} - {name}"
+        elif name:
+            label = name
+        elif identifier:
+            label = identifier
+        else:
+            label = "Unnamed"
+
+        elements.append(
+            {
+                "group": "nodes",
+                "data": {
+                    "id": str(node_id),
+                    "label": label,
+                    "name": name,
+                    "identifier": identifier,
+                    "description": node_data.get("description", ""),
+                },
+            }
+        )
+
+    # Add edges from NetworkX graph
+    for source, target, edge_data in G.edges(data=True):
+        elements.append(
+            {
+                "group": "edges",
+                "data": {
+                    "id": str(edge_data.get("edge_id", f"{source}-{target}")),
+                    "identifier": edge_data.get("identifier", ""),
+                    "source": str(source),
+                    "label": edge_data.get("relationship_type", "connects to"),
+                    "target": str(target),
+                    "description": edge_data.get("description", ""),
+                },
+            }
+        )
+
+    return {"elements": elements}
@@ -4,12 +4,16 @@ import io
 import base64
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Union 
-import pandas as pd
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A3, A4, landscape
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from utils.lazy_imports import lazy_import
+
+# pandas and reportlab are imported on the first export rather than at startup
+pd = lazy_import('pandas')
+colors = lazy_import('reportlab.lib.colors')
+pagesizes = lazy_import('reportlab.lib.pagesizes')
+platypus = lazy_import('reportlab.platypus')
+pdfmetrics = lazy_import('reportlab.pdfbase.pdfmetrics')
+reportlab_styles = lazy_import('reportlab.lib.styles')
 
 class NumberedCanvas:
     def __init__(self):
@@ -18,7 +22,7 @@ class NumberedCanvas:
 def _header_footer(canvas, doc, title: str, filename: str, page_tracker):
     canvas.saveState()
 
-    width, height = landscape(A3)
+    width, height = pagesizes.landscape(pagesizes.A3)
 
     canvas.setFont('Helvetica-Bold', 10)
     canvas.drawString(30, height - 30, title)
@@ -39,7 +43,7 @@ def _header_footer(canvas, doc, title: str, filename: str, page_tracker):
 def _final_header_footer(canvas, doc, title: str, filename: str, total_pages: int):
     canvas.saveState()
 
-    width, height = landscape(A3)
+    width, height = pagesizes.landscape(pagesizes.A3)
 
     canvas.setFont('Helvetica-Bold', 10)
     canvas.drawString(30, height - 30, title)
@@ -73,9 +77,9 @@ def _calculate_col_widths(table_data: List[List[Any]], available_width: float, n
             if col_idx < len(row):
                 text = str(row[col_idx])
                 if table_data.index(row) == 0:
-                    text_width = stringWidth(text, 'Helvetica-Bold', 10)
+                    text_width = pdfmetrics.stringWidth(text, 'Helvetica-Bold', 10)
                 else:
-                    text_width = stringWidth(text, 'Helvetica', 10)
+                    text_width = pdfmetrics.stringWidth(text, 'Helvetica', 10)
                 max_width = max(max_width, text_width)
         
         col_widths.append(max_width + cell_padding)
@@ -105,14 +109,14 @@ def generate_table_pdf(data: List[Dict[str, Any]], title: str, columns_to_exclud
     timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
     filename = f"{timestamp}_{filename}.pdf"
 
-    page_width, page_height = landscape(A3)
+    page_width, page_height = pagesizes.landscape(pagesizes.A3)
     available_width = page_width - 60
     
     # Create PDF in Memory
     buffer = io.BytesIO()
-    doc = SimpleDocTemplate(
+    doc = platypus.SimpleDocTemplate(
         buffer,
-        pagesize=landscape(A3),
+        pagesize=pagesizes.landscape(pagesizes.A3),
         rightMargin=30,
         leftMargin=30,
         topMargin=50,
@@ -123,10 +127,10 @@ def generate_table_pdf(data: List[Dict[str, Any]], title: str, columns_to_exclud
     elements = []
     
     # Add the Title
-    styles = getSampleStyleSheet()
+    styles = reportlab_styles.getSampleStyleSheet()
     # title_para = Paragraph(f"<b>{title}</b>", styles['Title'])
     # elements.append(title_para)
-    elements.append(Spacer(1, 12))
+    elements.append(platypus.Spacer(1, 12))
 
     num_columns = len(df.columns) + 1
     
@@ -141,7 +145,7 @@ def generate_table_pdf(data: List[Dict[str, Any]], title: str, columns_to_exclud
     col_widths = _calculate_col_widths(table_data, available_width, num_columns)
 
     # Create Table
-    t = Table(table_data, colWidths=col_widths, repeatRows=1)
+    t = platypus.Table(table_data, colWidths=col_widths, repeatRows=1)
 
     header_blue = colors.HexColor("#0d6efd")
     alt_row_color = colors.HexColor('#D9E2F3')
@@ -177,9 +181,9 @@ def generate_table_pdf(data: List[Dict[str, Any]], title: str, columns_to_exclud
     )
     
     buffer = io.BytesIO()
-    doc = SimpleDocTemplate(
+    doc = platypus.SimpleDocTemplate(
         buffer,
-        pagesize=landscape(A3),
+        pagesize=pagesizes.landscape(pagesizes.A3),
         rightMargin=30,
         leftMargin=30,
         topMargin=50,
@@ -189,10 +193,10 @@ def generate_table_pdf(data: List[Dict[str, Any]], title: str, columns_to_exclud
     elements = []
     # title_para = Paragraph(f"<b>{title}</b>", styles['Title'])
     # elements.append(title_para)
-    elements.append(Spacer(1, 12))
+    elements.append(platypus.Spacer(1, 12))
 
-    t = Table(table_data, colWidths=col_widths, repeatRows=1)
-    t.setStyle(TableStyle(page_styles))
+    t = platypus.Table(table_data, colWidths=col_widths, repeatRows=1)
+    t.setStyle(platypus.TableStyle(page_styles))
     elements.append(t)
 
     total_pages = page_tracker.page_count
@@ -252,14 +256,14 @@ def generate_breakdown_pdf(
     timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
     filename = f"{timestamp}_{filename}.pdf"
 
-    page_width, page_height = landscape(A3)
+    page_width, page_height = pagesizes.landscape(pagesizes.A3)
     available_width = page_width - 60
     
     # Create PDF in Memory
     buffer = io.BytesIO()
-    doc = SimpleDocTemplate(
+    doc = platypus.SimpleDocTemplate(
         buffer,
-        pagesize=landscape(A3),
+        pagesize=pagesizes.landscape(pagesizes.A3),
         rightMargin=30,
         leftMargin=30,
         topMargin=50,
@@ -267,8 +271,8 @@ def generate_breakdown_pdf(
     )
     
     elements = []
-    styles = getSampleStyleSheet()
-    elements.append(Spacer(1, 12))
+    styles = reportlab_styles.getSampleStyleSheet()
+    elements.append(platypus.Spacer(1, 12))
 
     # Define columns (Element renamed to Item, no separate Item number column)
     columns = ['Item', 'Relation', 'Weight', 'Identifier', 'Name', 'Description']
@@ -310,9 +314,9 @@ def generate_breakdown_pdf(
             if col_idx < len(row):
                 text = str(row[col_idx])
                 if table_data.index(row) == 0:
-                    text_width = stringWidth(text, 'Helvetica-Bold', 10)
+                    text_width = pdfmetrics.stringWidth(text, 'Helvetica-Bold', 10)
                 else:
-                    text_width = stringWidth(text, 'Helvetica', 10)
+                    text_width = pdfmetrics.stringWidth(text, 'Helvetica', 10)
                 max_width = max(max_width, text_width)
         col_widths.append(max_width + cell_padding)
     
@@ -323,7 +327,7 @@ def generate_breakdown_pdf(
     col_widths.append(max(remaining_width * 0.6, 150.0))  # Description gets 60%
 
     # Create Table
-    t = Table(table_data, colWidths=col_widths, repeatRows=1)
+    t = platypus.Table(table_data, colWidths=col_widths, repeatRows=1)
 
     header_blue = colors.HexColor("#0d6efd")
     alt_row_color = colors.HexColor('#D9E2F3')
@@ -349,7 +353,7 @@ def generate_breakdown_pdf(
         ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, alt_row_color])
     ]
     
-    t.setStyle(TableStyle(table_style))
+    t.setStyle(platypus.TableStyle(table_style))
     elements.append(t)
 
     # Build PDF with page numbers
@@ -362,9 +366,9 @@ def generate_breakdown_pdf(
     
     # Rebuild with correct page count
     buffer = io.BytesIO()
-    doc = SimpleDocTemplate(
+    doc = platypus.SimpleDocTemplate(
         buffer,
-        pagesize=landscape(A3),
+        pagesize=pagesizes.landscape(pagesizes.A3),
         rightMargin=30,
         leftMargin=30,
         topMargin=50,
@@ -372,9 +376,9 @@ def generate_breakdown_pdf(
     )
 
     elements = []
-    elements.append(Spacer(1, 12))
-    t = Table(table_data, colWidths=col_widths, repeatRows=1)
-    t.setStyle(TableStyle(table_style))
+    elements.append(platypus.Spacer(1, 12))
+    t = platypus.Table(table_data, colWidths=col_widths, repeatRows=1)
+    t.setStyle(platypus.TableStyle(table_style))
     elements.append(t)
 
     total_pages = page_tracker.page_count
@@ -0,0 +1,204 @@
+# utils/query_profiler.py
+
+"""SQLAlchemy event-based Query profiler with N+1 detection.
+
+Statements are grouped by shape (the SQL with bound parameters and IN lists
+collapsed), so a lazy relationship or property loaded once per row shows up
+as one shape repeated many times within a single Callback or Route.
+"""
+
+# Import Libraries
+import contextvars
+import heapq
+import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from pkg.config import INSTRUMENTATION_CONFIG
+
+logger = logging.getLogger('TracerApp')
+
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """The statement with whitespace normalised and IN lists of any length collapsed"""
+    return _IN_LIST.sub("(?, ...)", _WHITESPACE.sub(" ", statement).strip())
+
+
+class QueryStats:
+    """The Database queries made while handling one request"""
+
+    __slots__ = ('count', 'seconds', 'slowest', 'shapes')
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        # Min-heap of (duration, statement) holding the slowest statements
+        self.slowest: List[Tuple[float, str]] = []
+        # Statement -> [executions, seconds]; folded into shapes by repeated_shapes()
+        self.shapes: Dict[str, List[float]] = {}
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.seconds += duration
+        entry = (duration, statement)
+        if len(self.slowest) < INSTRUMENTATION_CONFIG['slow_query_count']:
+            heapq.heappush(self.slowest, entry)
+        elif self.slowest and duration > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, entry)
+
+        totals = self.shapes.get(statement)
+        if totals is None:
+            self.shapes[statement] = [1, duration]
+        else:
+            totals[0] += 1
+            totals[1] += duration
+
+    def repeated_shapes(self, threshold: int) -> List[Tuple[str, int, float]]:
+        """(shape, executions, seconds) of every shape executed at least threshold times"""
+        folded: Dict[str, List[float]] = {}
+        for statement, (count, seconds) in self.shapes.items():
+            totals = folded.setdefault(statement_shape(statement), [0, 0.0])
+            totals[0] += count
+            totals[1] += seconds
+        return sorted(
+            ((shape, int(count), seconds) for shape, (count, seconds) in folded.items() if count >= threshold),
+            key=lambda item: -item[1],
+        )
+
+
+# Set while a request (or profile_queries block) runs; other queries are not counted
+_query_stats: contextvars.ContextVar[Optional[QueryStats]] = contextvars.ContextVar(
+    'tracer_query_stats', default=None
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _query_stats.get() is not None:
+        conn.info['tracer_query_start'] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _query_stats.get()
+    start = conn.info.pop('tracer_query_start', None)
+    if stats is not None and start is not None:
+        stats.record(statement, time.perf_counter() - start)
+
+
+def install_query_listeners() -> None:
+    """Listen on every Engine, including ones created later"""
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+def start_query_stats() -> contextvars.Token:
+    return _query_stats.set(QueryStats())
+
+
+def stop_query_stats(token: contextvars.Token) -> QueryStats:
+    stats = _query_stats.get() or QueryStats()
+    _query_stats.reset(token)
+    return stats
+
+
+@contextmanager
+def profile_queries() -> Iterator[QueryStats]:
+    """Count the queries made inside the block, e.g. for a benchmark or a shell session"""
+    install_query_listeners()
+    token = start_query_stats()
+    stats = _query_stats.get()
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+
+# ==================== N+1 Offenders ====================
+
+
+class QueryProfile:
+    """Statement totals per Callback or Route, and the shapes each one repeated"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._offenders: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+
+    def record(self, kind: str, name: str, stats: QueryStats) -> List[Tuple[str, int, float]]:
+        """Record a finished request and return its repeated shapes"""
+        repeated = stats.repeated_shapes(INSTRUMENTATION_CONFIG['n_plus_one_threshold']) if stats.count else []
+        now = datetime.now().isoformat(timespec='seconds')
+        with self._lock:
+            totals = self._requests.setdefault(
+                (kind, name), {'requests': 0, 'statements': 0, 'seconds': 0.0, 'max_statements': 0}
+            )
+            totals['requests'] += 1
+            totals['statements'] += stats.count
+            totals['seconds'] += stats.seconds
+            totals['max_statements'] = max(totals['max_statements'], stats.count)
+
+            for shape, count, seconds in repeated:
+                offender = self._offenders.setdefault(
+                    (kind, name, shape),
+                    {'requests': 0, 'executions': 0, 'max_executions': 0, 'seconds': 0.0},
+                )
+                offender['requests'] += 1
+                offender['executions'] += count
+                offender['max_executions'] = max(offender['max_executions'], count)
+                offender['seconds'] += seconds
+                offender['last_seen'] = now
+        return repeated
+
+    def top_offenders(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Repeated shapes ordered by the total time they cost"""
+        with self._lock:
+            offenders = [
+                {'kind': kind, 'name': name, 'shape': shape, **offender}
+                for (kind, name, shape), offender in self._offenders.items()
+            ]
+        offenders.sort(key=lambda offender: -offender['seconds'])
+        return offenders[:limit]
+
+    def request_totals(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Callbacks and Routes ordered by the statements they issue per request"""
+        with self._lock:
+            totals = [
+                {
+                    'kind': kind,
+                    'name': name,
+                    'requests': total['requests'],
+                    'statements': total['statements'],
+                    'mean_statements': round(total['statements'] / total['requests'], 2),
+                    'max_statements': total['max_statements'],
+                    'seconds': total['seconds'],
+                }
+                for (kind, name), total in self._requests.items()
+            ]
+        totals.sort(key=lambda total: -total['mean_statements'])
+        return totals[:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._requests.clear()
+            self._offenders.clear()
+
+
+query_profile = QueryProfile()
+
+
+def record_request_queries(kind: str, name: str, stats: QueryStats) -> None:
+    """Record a request's queries and warn about each shape it repeated"""
+    for shape, count, seconds in query_profile.record(kind, name, stats):
+        logger.warning(
+            f"Possible N+1 in {kind} {name}: {count} executions ({seconds * 1000:.1f}ms) of {shape[:300]}"
+        )
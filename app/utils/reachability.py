@@ -0,0 +1,158 @@
+# utils/reachability.py
+
+"""Reachability Index over interned Node ids, built once per Graph Version"""
+
+# Import Libraries
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+import networkx as nx
+import numpy as np
+from scipy.sparse.csgraph import breadth_first_order, connected_components
+
+from utils.sparse_metrics import SparseGraph, get_sparse_graph
+
+logger = logging.getLogger('TracerApp')
+
+# Descendant / Ancestor bitsets kept for Nodes that are not Roots
+MAX_CACHED_QUERIES = 1024
+
+
+def _mask_to_bits(mask: np.ndarray) -> int:
+    return int.from_bytes(np.packbits(mask, bitorder='little').tobytes(), 'little')
+
+
+class ReachabilityIndex:
+    """Descendant bitsets for every Root, with lazily cached bitsets for any
+    other Node, so subgraph filtering is a bitset test instead of a traversal.
+
+    Bit i of a bitset is the Node at index i of the underlying SparseGraph.
+    """
+
+    def __init__(self, S: SparseGraph):
+        self.sparse = S
+        n = S.number_of_nodes
+        self._reverse = S.adjacency.transpose().tocsr()
+
+        in_degree, out_degree = S.in_degree(), S.out_degree()
+        self.root_indices = np.flatnonzero((in_degree == 0) & (out_degree > 0))
+        self.roots = [S.node_ids[i] for i in self.root_indices]
+        self.root_bits: Dict[Any, int] = {
+            S.node_ids[i]: self._reach(S.adjacency, int(i)) for i in self.root_indices
+        }
+
+        # Nodes on a cycle (non-trivial Strong Component or self-loop)
+        if n:
+            _, labels = connected_components(S.adjacency, directed=True, connection='strong')
+            cyclic = np.bincount(labels, minlength=labels.max() + 1)[labels] > 1
+            cyclic[S.sources[S.sources == S.targets]] = True
+        else:
+            cyclic = np.zeros(0, dtype=bool)
+        self.cyclic_bits = _mask_to_bits(cyclic)
+
+        self._queries: "OrderedDict[Tuple[str, int], int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _reach(self, adjacency, i: int) -> int:
+        order = breadth_first_order(adjacency, i, directed=True, return_predecessors=False)
+        mask = np.zeros(self.sparse.number_of_nodes, dtype=bool)
+        mask[order] = True
+        return _mask_to_bits(mask)
+
+    def _cached_reach(self, direction: str, i: int) -> int:
+        key = (direction, i)
+        with self._lock:
+            if key in self._queries:
+                self._queries.move_to_end(key)
+                return self._queries[key]
+
+        adjacency = self.sparse.adjacency if direction == 'descendants' else self._reverse
+        bits = self._reach(adjacency, i)
+        with self._lock:
+            self._queries[key] = bits
+            while len(self._queries) > MAX_CACHED_QUERIES:
+                self._queries.popitem(last=False)
+        return bits
+
+    # ==================== Bitset Queries ====================
+
+    def descendant_bits(self, node_id: Any) -> int:
+        """Bitset of the Node and every Node reachable from it"""
+        if node_id in self.root_bits:
+            return self.root_bits[node_id]
+        i = self.sparse.index.get(node_id)
+        return 0 if i is None else self._cached_reach('descendants', i)
+
+    def ancestor_bits(self, node_id: Any) -> int:
+        """Bitset of the Node and every Node that reaches it"""
+        i = self.sparse.index.get(node_id)
+        return 0 if i is None else self._cached_reach('ancestors', i)
+
+    def node_mask(self, bits: int) -> np.ndarray:
+        n = self.sparse.number_of_nodes
+        packed = np.frombuffer(bits.to_bytes((n + 7) // 8, 'little'), dtype=np.uint8)
+        return np.unpackbits(packed, count=n, bitorder='little').astype(bool)
+
+    def node_indices(self, bits: int) -> np.ndarray:
+        return np.flatnonzero(self.node_mask(bits))
+
+    def edge_indices(self, bits: int) -> np.ndarray:
+        """Indices (in G.edges() order) of the Edges with both ends in the bitset"""
+        mask = self.node_mask(bits)
+        return np.flatnonzero(mask[self.sparse.sources] & mask[self.sparse.targets])
+
+    def nodes(self, bits: int) -> List[Any]:
+        return [self.sparse.node_ids[i] for i in self.node_indices(bits)]
+
+    # ==================== Node Queries ====================
+
+    def descendants(self, node_id: Any) -> List[Any]:
+        return [n for n in self.nodes(self.descendant_bits(node_id)) if n != node_id]
+
+    def ancestors(self, node_id: Any) -> List[Any]:
+        return [n for n in self.nodes(self.ancestor_bits(node_id)) if n != node_id]
+
+    def is_reachable(self, source: Any, target: Any) -> bool:
+        i = self.sparse.index.get(target)
+        return i is not None and bool(self.descendant_bits(source) >> i & 1)
+
+    def roots_containing(self, node_id: Any) -> List[Any]:
+        """Which Roots' subgraphs contain the Node"""
+        i = self.sparse.index.get(node_id)
+        if i is None:
+            return []
+        return [root for root, bits in self.root_bits.items() if bits >> i & 1]
+
+    def is_acyclic(self, bits: int) -> bool:
+        """Whether the Nodes in the bitset avoid every cycle of the Graph"""
+        return not bits & self.cyclic_bits
+
+    def subgraph(self, G: nx.Graph, root: Any) -> nx.Graph:
+        return G.subgraph(self.nodes(self.descendant_bits(root)))
+
+
+# ==================== Per-Version Cache ====================
+
+_index_cache: Dict[int, ReachabilityIndex] = {}
+_index_cache_lock = threading.Lock()
+
+
+def get_reachability_index(G: nx.Graph, graph_version: int) -> ReachabilityIndex:
+    """Return the ReachabilityIndex for G, building it only once per Graph Version.
+
+    G must be the Graph of that Version: the Version is the whole cache key, so
+    every caller shares the one entry however many Graph objects it is loaded into.
+    """
+    with _index_cache_lock:
+        cached = _index_cache.get(graph_version)
+        if cached is not None:
+            return cached
+
+    index = ReachabilityIndex(get_sparse_graph(G, graph_version))
+    with _index_cache_lock:
+        _index_cache.clear()
+        _index_cache[graph_version] = index
+    logger.info(f"Built Reachability Index for {len(index.roots)} Roots")
+    return index
@@ -0,0 +1,174 @@
+# utils/sparse_metrics.py
+
+"""Sparse Matrix (CSR) Metrics Backend built once per Graph Version"""
+
+# Import Libraries
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+import networkx as nx
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+logger = logging.getLogger('TracerApp')
+
+
+class SparseGraph:
+    """CSR Adjacency of a Graph with its Node IDs interned to contiguous ints"""
+
+    def __init__(
+        self,
+        node_ids: List[Any],
+        sources: np.ndarray,
+        targets: np.ndarray,
+        has_name: np.ndarray,
+        has_description: np.ndarray,
+    ):
+        self.node_ids = node_ids
+        self.index = {node_id: i for i, node_id in enumerate(node_ids)}
+        self.sources = sources
+        self.targets = targets
+        self.has_name = has_name
+        self.has_description = has_description
+
+        n = len(node_ids)
+        # Parallel Edges are summed, so the stored value is the Edge multiplicity
+        self.adjacency = sparse.csr_matrix(
+            (np.ones(len(sources), dtype=np.int32), (sources, targets)), shape=(n, n)
+        )
+        self.adjacency.sum_duplicates()
+
+    @property
+    def number_of_nodes(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def number_of_edges(self) -> int:
+        return len(self.sources)
+
+    @classmethod
+    def from_networkx(cls, G: nx.Graph) -> "SparseGraph":
+        node_ids = list(G.nodes())
+        index = {node_id: i for i, node_id in enumerate(node_ids)}
+        m = G.number_of_edges()
+
+        sources = np.fromiter((index[u] for u, _ in G.edges()), dtype=np.int64, count=m)
+        targets = np.fromiter((index[v] for _, v in G.edges()), dtype=np.int64, count=m)
+        has_name = np.fromiter((bool(d.get('name')) for _, d in G.nodes(data=True)), dtype=bool, count=len(node_ids))
+        has_description = np.fromiter(
+            (bool(d.get('description')) for _, d in G.nodes(data=True)), dtype=bool, count=len(node_ids)
+        )
+        return cls(node_ids, sources, targets, has_name, has_description)
+
+    def out_degree(self) -> np.ndarray:
+        return np.bincount(self.sources, minlength=self.number_of_nodes)
+
+    def in_degree(self) -> np.ndarray:
+        return np.bincount(self.targets, minlength=self.number_of_nodes)
+
+    def degree(self) -> np.ndarray:
+        return self.out_degree() + self.in_degree()
+
+
+# ==================== Per-Version Cache ====================
+
+_sparse_cache: Dict[int, SparseGraph] = {}
+_sparse_cache_lock = threading.Lock()
+
+
+def get_sparse_graph(G: nx.Graph, graph_version: Optional[int]) -> SparseGraph:
+    """Return the SparseGraph for G, building it only once per Graph Version.
+
+    G must be the Graph of that Version, which is the whole cache key. A Graph
+    with no Version (an ad-hoc Graph) is converted without touching the cache.
+    """
+    if graph_version is None:
+        return SparseGraph.from_networkx(G)
+
+    with _sparse_cache_lock:
+        cached = _sparse_cache.get(graph_version)
+        if cached is not None:
+            return cached
+
+    S = SparseGraph.from_networkx(G)
+    with _sparse_cache_lock:
+        # Only the latest Graph is kept
+        _sparse_cache.clear()
+        _sparse_cache[graph_version] = S
+    logger.info(f"Built CSR Adjacency with {S.number_of_nodes} Nodes and {S.number_of_edges} Edges")
+    return S
+
+
+# ==================== Vectorised Metrics ====================
+
+
+def calculate_structural_metrics(S: SparseGraph) -> Dict[str, Any]:
+    """Degree statistics, isolates, self-loops, components, density and
+    attribute completeness computed with vectorised operations"""
+    n, m = S.number_of_nodes, S.number_of_edges
+    degree = S.degree()
+
+    if n == 0:
+        return {
+            'total_nodes': 0, 'total_edges': 0, 'density': 0.0,
+            'average_degree': 0.0, 'min_degree': 0, 'max_degree': 0, 'median_degree': 0.0,
+            'isolated_nodes': 0, 'self_loops': 0,
+            'weakly_connected_components': 0, 'strongly_connected_components': 0,
+            'nodes_with_names': 0, 'nodes_with_descriptions': 0, 'attribute_completeness': 0,
+        }
+
+    weak_components, _ = connected_components(S.adjacency, directed=True, connection='weak')
+    strong_components, _ = connected_components(S.adjacency, directed=True, connection='strong')
+
+    return {
+        'total_nodes': n,
+        'total_edges': m,
+        'density': m / (n * (n - 1)) if n > 1 else 0.0,
+        'average_degree': float(degree.mean()),
+        'min_degree': int(degree.min()),
+        'max_degree': int(degree.max()),
+        'median_degree': float(np.median(degree)),
+        'isolated_nodes': int(np.count_nonzero(degree == 0)),
+        'self_loops': int(np.count_nonzero(S.sources == S.targets)),
+        'weakly_connected_components': int(weak_components),
+        'strongly_connected_components': int(strong_components),
+        'nodes_with_names': int(np.count_nonzero(S.has_name)),
+        'nodes_with_descriptions': int(np.count_nonzero(S.has_description)),
+        'attribute_completeness': round(
+            float(np.count_nonzero(S.has_name & S.has_description)) / n * 100, 2
+        ),
+    }
+
+
+def calculate_cycle_structure(S: SparseGraph, largest: int = 10) -> Dict[str, Any]:
+    """Cyclic Strongly Connected Components, with the Nodes of the largest
+    ones (as indices, largest first)"""
+    n = S.number_of_nodes
+    self_loops = S.sources == S.targets
+    if n == 0:
+        return {
+            'is_dag': True, 'cyclic_components': 0, 'largest_cycle_component': 0,
+            'nodes_in_cycles': 0, 'cyclic_edges': 0, 'self_loops': 0, 'components': [],
+        }
+
+    _, labels = connected_components(S.adjacency, directed=True, connection='strong')
+    sizes = np.bincount(labels)
+    # A Component is cyclic when it has two or more Nodes or one Node with a self-loop
+    cyclic = sizes > 1
+    cyclic[labels[S.sources[self_loops]]] = True
+    in_cycle = cyclic[labels]
+    cyclic_edges = (labels[S.sources] == labels[S.targets]) & in_cycle[S.sources]
+
+    order = np.flatnonzero(cyclic)
+    order = order[np.argsort(-sizes[order], kind='stable')][:largest]
+    return {
+        'is_dag': not bool(cyclic.any()),
+        'cyclic_components': int(np.count_nonzero(cyclic)),
+        'largest_cycle_component': int(sizes[cyclic].max()) if cyclic.any() else 0,
+        'nodes_in_cycles': int(np.count_nonzero(in_cycle)),
+        'cyclic_edges': int(np.count_nonzero(cyclic_edges)),
+        'self_loops': int(np.count_nonzero(self_loops)),
+        'components': [np.flatnonzero(labels == label).tolist() for label in order],
+    }
@@ -197,7 +197,16 @@ class BreakdownView:
                                             className="mb-0",
                                             style={"width": "100%"},
                                         ),
-                                        width=11,
+                                        width=7,
+                                    ),
+                                    dbc.Col(
+                                        dcc.Dropdown(
+                                            id="breakdowns-snapshot-select",
+                                            placeholder="Compare with a Snapshot...",
+                                            className="mb-0",
+                                            style={"width": "100%"},
+                                        ),
+                                        width=4,
                                     ),
                                     dbc.Col(
                                         dbc.Button(
@@ -224,6 +233,7 @@ class BreakdownView:
                     ],
                     style={"border": "none"},
                 ),
+                html.Div(id="breakdowns-diff-summary", className="text-muted small mt-2"),
             ],
             className="mb-4 mt-3",
         )
@@ -36,6 +36,8 @@ class DashboardView:
         return dbc.Container(
             [
                 self._make_toast(),
+                dcc.Store(id="metrics-results-store"),
+                dcc.Interval(id="metrics-poll-interval", interval=3000, disabled=False),
                 
                 # html.H1([html.I(className="bi bi-speedometer me-2"), "Dashboard"], className="my-4 text-primary"),
                 # html.P("Metrics for the Network", className="mb-4 text-muted"),
@@ -62,11 +64,57 @@ class DashboardView:
                     )], md=12),
                 ]),
 
+                html.P(id="metrics-computed-on", className="text-muted small mb-2"),
+
                 dbc.Accordion([
                     dbc.AccordionItem([dcc.Graph(id="completeness-metrics")], title="Completeness Metrics"),
                     dbc.AccordionItem([dcc.Graph(id="efficiency-metrics")], title="Efficiency Metrics"),
                     dbc.AccordionItem([dcc.Graph(id="robustness-metrics")], title="Robustness Metrics"),
                     dbc.AccordionItem([dcc.Graph(id="resilience-metrics")], title="Resilience Metrics"),
+                    dbc.AccordionItem([dcc.Graph(id="cycle-metrics")], title="Cycle Metrics"),
+                    dbc.AccordionItem([
+                        dcc.Dropdown(id="metrics-trend-key", placeholder="Select a Metric", clearable=False, className="mb-2"),
+                        dcc.Graph(id="metrics-trend-chart"),
+                        dash_table.DataTable(
+                            id="metrics-delta-table",
+                            page_size=15,
+                            sort_action="native",
+                            style_table={'overflowX': 'auto'},
+                            style_cell={
+                                'textAlign': 'left',
+                                'padding': '10px'
+                            },
+                            style_header={
+                                'backgroundColor': 'rgb(230, 230, 230)',
+                                'fontWeight': 'bold'
+                            }
+                        ),
+                    ], title="Metric Trends"),
+                    dbc.AccordionItem([
+                        dash_table.DataTable(
+                            id="coverage-table",
+                            page_size=15,
+                            sort_action="native",
+                            export_format="csv",
+                            style_table={'overflowX': 'auto'},
+                            style_cell={
+                                'textAlign': 'left',
+                                'padding': '10px'
+                            },
+                            style_header={
+                                'backgroundColor': 'rgb(230, 230, 230)',
+                                'fontWeight': 'bold'
+                            }
+                        ),
+                        dbc.Button(
+                            [html.I(className="bi bi-download me-1"), "Download Uncovered Nodes"],
+                            id="coverage-download-btn",
+                            color="secondary",
+                            size="sm",
+                            className="mt-2",
+                        ),
+                        dcc.Download(id="coverage-download"),
+                    ], title="Traceability Coverage"),
                     dbc.AccordionItem([dcc.Graph(id="burndown-chart")],title="Burndown Charts"),
                 ],
                     start_collapsed=True,
@@ -16,11 +16,12 @@ class NetworkView:
         pass
 
     @staticmethod
-    def create_layout(networks_data: Dict[str, Any]) -> dbc.Container:
+    def create_layout(networks_data: Dict[str, Any], poll_interval: int = 5000) -> dbc.Container:
         return dbc.Container(
             [
                 ToastFactory.create_toast(toast_id="networks-toast-message"),
                 dcc.Store(id="toast-store"),
+                dcc.Interval(id="network-poll-interval", interval=poll_interval, disabled=False),
                 html.Div(
                     id="cytoscape-data-div",
                     children=json.dumps(networks_data),
@@ -404,6 +405,62 @@ class NetworkView:
                             ],
                             item_id="export-accordion",
                         ),
+                        # Snapshots Accordion
+                        dbc.AccordionItem(
+                            [
+                                dbc.Row(
+                                    [
+                                        dbc.Col(
+                                            dbc.Input(
+                                                id="network-snapshot-label",
+                                                placeholder="Snapshot Label, e.g. Baseline 1.0",
+                                                size="md",
+                                            ),
+                                            width=12,
+                                            lg=4,
+                                        ),
+                                        dbc.Col(
+                                            dbc.Button(
+                                                [
+                                                    html.I(
+                                                        className="bi bi-camera2 me-1"
+                                                    ),
+                                                    "Take Snapshot",
+                                                ],
+                                                id="network-snapshot-create-btn",
+                                                outline=True,
+                                                color="primary",
+                                                size="md",
+                                                className="w-100",
+                                                title="Snapshot the Graph as it is now",
+                                            ),
+                                            width=12,
+                                            lg=2,
+                                        ),
+                                        dbc.Col(
+                                            dcc.Dropdown(
+                                                id="network-snapshot-select",
+                                                placeholder="Compare the Graph with a Snapshot...",
+                                                clearable=True,
+                                            ),
+                                            width=12,
+                                            lg=6,
+                                        ),
+                                    ],
+                                    className="align-items-center g-2",
+                                ),
+                                html.Div(
+                                    id="network-diff-summary",
+                                    className="text-muted small mt-2",
+                                ),
+                                dcc.Store(id="network-diff-store"),
+                            ],
+                            title=[
+                                html.I(className="bi bi-clock-history me-2"),
+                                "Snapshots & Changes",
+                            ],
+                            item_id="snapshots-accordion",
+                        ),
                     ],
                     start_collapsed=True,
                     className="mb-3 mt-3",